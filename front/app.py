@@ -1,99 +1,182 @@
+import os
+
 # Importar la clase principal de Flask y la función para renderizar plantillas
 from flask import Flask, render_template, request, redirect, url_for, session
 
-# Importar el Blueprint que contiene las rutas de productos
-from rutas.rutas_usuarios import rutas_usuario
-from rutas.rutas_tipo_responsable import rutas_tipo_responsable
-from rutas.rutas_tipo_proyecto import rutas_tipo_proyecto
-from rutas.rutas_estado import rutas_estado
-from rutas.rutas_tipo_producto import rutas_tipo_producto
-from rutas.rutas_entregable import rutas_entregable
-from rutas.rutas_variable_estrategica import rutas_variable_estrategica
-
-from rutas.rutas_actividad import rutas_actividad
-from rutas.rutas_archivo import rutas_archivo
-from rutas.rutas_archivo_entregable import rutas_archivo_entregable
-from rutas.rutas_distribucion_presupuesto import rutas_distribucion_presupuesto
-from rutas.rutas_ejecucion_presupuesto import rutas_ejecucion_presupuesto
-from rutas.rutas_estado_proyecto import rutas_estado_proyecto
-from rutas.rutas_meta_estrategica import rutas_meta_estrategica
-from rutas.rutas_meta_proyecto import rutas_meta_proyecto
-from rutas.rutas_objetivo_estrategico import rutas_objetivo_estrategico
-from rutas.rutas_presupuesto import rutas_presupuesto
-from rutas.rutas_proyecto import rutas_proyecto
-from rutas.rutas_responsable import rutas_responsable
-from rutas.rutas_producto import rutas_producto
-from rutas.rutas_proyecto_producto import rutas_proyecto_producto
-from rutas.rutas_producto_entregable import rutas_producto_entregable
-from rutas.rutas_responsable_entregable import rutas_responsable_entregable
-from rutas.rutas_login import rutas_login  # 🚪 Blueprint del login
-
-# Crear la instancia de la aplicación Flask
-aplicacion = Flask(__name__)
-aplicacion.secret_key = 'clave-super-secreta-123'  # 🔐 Necesaria para usar sesiones
-
-# ------------------- Registro de Blueprints -------------------
-# Registrar el Blueprint de productos en la aplicación principal
-aplicacion.register_blueprint(rutas_usuario)
-aplicacion.register_blueprint(rutas_tipo_responsable)
-aplicacion.register_blueprint(rutas_tipo_proyecto)
-aplicacion.register_blueprint(rutas_estado)
-aplicacion.register_blueprint(rutas_tipo_producto)
-aplicacion.register_blueprint(rutas_entregable)
-aplicacion.register_blueprint(rutas_variable_estrategica)
-
-aplicacion.register_blueprint(rutas_actividad)
-aplicacion.register_blueprint(rutas_archivo)
-aplicacion.register_blueprint(rutas_archivo_entregable)
-aplicacion.register_blueprint(rutas_distribucion_presupuesto)
-aplicacion.register_blueprint(rutas_ejecucion_presupuesto)
-aplicacion.register_blueprint(rutas_estado_proyecto)
-aplicacion.register_blueprint(rutas_meta_estrategica)
-aplicacion.register_blueprint(rutas_meta_proyecto)
-aplicacion.register_blueprint(rutas_objetivo_estrategico)
-aplicacion.register_blueprint(rutas_presupuesto)
-aplicacion.register_blueprint(rutas_proyecto)
-aplicacion.register_blueprint(rutas_responsable)
-aplicacion.register_blueprint(rutas_producto)
-aplicacion.register_blueprint(rutas_proyecto_producto)
-aplicacion.register_blueprint(rutas_producto_entregable)
-aplicacion.register_blueprint(rutas_responsable_entregable)
-aplicacion.register_blueprint(rutas_login)  # 🚪 Registro del Blueprint del login
-
-
-# ------------------- PROTECCIÓN GLOBAL DE RUTAS ---    ----------------
-@aplicacion.before_request
-def proteger_todo():
-    """Bloquea todo el sitio si no hay sesión activa (excepto login y archivos estáticos)."""
-    rutas_publicas = ['rutas_login.login', 'rutas_login.logout', 'static']
-    if not session.get('usuario') and request.endpoint not in rutas_publicas:
-        return redirect(url_for('rutas_login.login'))
-
-
-# ------------------- Rutas principales -------------------
-
-@aplicacion.route("/")
-def inicio():
+from servicios import almacen, blueprints, cache_fragmentos, cliente_api, exportaciones, informes, metricas, miniaturas, orden, parcial, trabajos, traza, validacion
+
+
+# ------------------- Registro de secciones (Blueprints) -------------------
+# (módulo, Blueprint, perezosa). Las secciones perezosas, de uso poco
+# frecuente, se importan en su primera petición si la app se crea con
+# carga_perezosa=True (ver servicios/blueprints.py).
+SECCIONES = [
+    ("rutas.rutas_usuarios", "rutas_usuario", False),
+    ("rutas.rutas_tipo_responsable", "rutas_tipo_responsable", True),
+    ("rutas.rutas_tipo_proyecto", "rutas_tipo_proyecto", True),
+    ("rutas.rutas_estado", "rutas_estado", True),
+    ("rutas.rutas_tipo_producto", "rutas_tipo_producto", True),
+    ("rutas.rutas_entregable", "rutas_entregable", False),
+    ("rutas.rutas_variable_estrategica", "rutas_variable_estrategica", True),
+
+    ("rutas.rutas_actividad", "rutas_actividad", False),
+    ("rutas.rutas_archivo", "rutas_archivo", False),
+    ("rutas.rutas_archivo_entregable", "rutas_archivo_entregable", True),
+    ("rutas.rutas_distribucion_presupuesto", "rutas_distribucion_presupuesto", True),
+    ("rutas.rutas_ejecucion_presupuesto", "rutas_ejecucion_presupuesto", True),
+    ("rutas.rutas_estado_proyecto", "rutas_estado_proyecto", True),
+    ("rutas.rutas_meta_estrategica", "rutas_meta_estrategica", True),
+    ("rutas.rutas_meta_proyecto", "rutas_meta_proyecto", True),
+    ("rutas.rutas_objetivo_estrategico", "rutas_objetivo_estrategico", True),
+    ("rutas.rutas_presupuesto", "rutas_presupuesto", False),
+    ("rutas.rutas_proyecto", "rutas_proyecto", False),
+    ("rutas.rutas_responsable", "rutas_responsable", False),
+    ("rutas.rutas_producto", "rutas_producto", False),
+    ("rutas.rutas_proyecto_producto", "rutas_proyecto_producto", True),
+    ("rutas.rutas_producto_entregable", "rutas_producto_entregable", True),
+    ("rutas.rutas_responsable_entregable", "rutas_responsable_entregable", True),
+    ("rutas.rutas_trabajos", "rutas_trabajos", True),
+    ("rutas.rutas_informes", "rutas_informes", True),
+    ("rutas.rutas_login", "rutas_login", False),  # 🚪 Blueprint del login
+]
+
+# Ajustes para producción: sin depuración (el depurador de Werkzeug permite
+# ejecutar código desde el navegador) y sin revisar en cada petición si las
+# plantillas cambiaron en disco.
+CONFIG_PRODUCCION = {
+    "DEBUG": False,
+    "TEMPLATES_AUTO_RELOAD": False,
+}
+
+
+def _clave_secreta(produccion, configuracion, desarrollo):
     """
-    Función asociada a la ruta principal (/).
-    Retorna la plantilla index.html.
+    SECRET_KEY de configuracion o del entorno. La clave fija del código solo
+    vale en desarrollo: en producción cualquiera que la lea podría falsificar
+    la cookie de sesión, así que sin SECRET_KEY no se arranca.
     """
-    return render_template("index.html")
+    clave = (configuracion or {}).get("SECRET_KEY") or os.environ.get("SECRET_KEY")
+    if clave:
+        return clave
+    if produccion:
+        raise RuntimeError("Falta la variable de entorno SECRET_KEY (obligatoria en producción)")
+    return desarrollo
 
 
-@aplicacion.route("/acerca")
-def acerca():
+def crear_aplicacion(produccion=False, configuracion=None, carga_perezosa=False):
     """
-    Función asociada a la ruta /acerca.
-    Retorna la plantilla acerca.html con información sobre el proyecto.
+    Crea y configura la aplicación Flask.
+
+    produccion=True aplica CONFIG_PRODUCCION; lo usa wsgi.py, el punto de
+    entrada para servidores WSGI (gunicorn, waitress). configuracion permite
+    sobrescribir cualquier valor de aplicacion.config. carga_perezosa=True
+    deja sin importar las secciones perezosas hasta su primera petición.
     """
-    return render_template("acerca.html")
+    # Crear la instancia de la aplicación Flask
+    aplicacion = Flask(__name__)
+    aplicacion.secret_key = _clave_secreta(produccion, configuracion, 'clave-super-secreta-123')  # 🔐 Necesaria para usar sesiones
+    if produccion:
+        aplicacion.config.update(CONFIG_PRODUCCION)
+        aplicacion.jinja_env.auto_reload = False
+    aplicacion.config.update(configuracion or {})
+
+    # ------------------- Archivos subidos -------------------
+    # Los archivos de los formularios multipart se escriben directamente en el
+    # almacén por contenido (ARCHIVOS_DIR), con un máximo de ARCHIVOS_MAX_MB
+    almacen.instalar(aplicacion)
+    # miniatura() en las plantillas; las vistas previas se generan en segundo plano
+    miniaturas.instalar(aplicacion)
+
+    # ------------------- Registro de Blueprints -------------------
+    blueprints.registrar(aplicacion, SECCIONES, carga_perezosa)
+
+    # ------------------- Caché de listados entre workers -------------------
+    # Antes de cada petición descarta los listados que otro proceso modificó
+    # (marcas en CACHE_ESCRITURAS_DIR); se instala antes de la validación de ETag
+    cliente_api.instalar(aplicacion)
+
+    # ------------------- Caché de tablas renderizadas -------------------
+    # Las plantillas de listados envuelven su <tbody> en cache_fragmento()
+    cache_fragmentos.instalar(aplicacion)
+
+    # ------------------- Orden de los listados por columna -------------------
+    # ordenar() y orden_columna() en las plantillas (?orden=campo&sentido=asc|desc)
+    orden.instalar(aplicacion)
+
+    # ------------------- Trabajos en segundo plano -------------------
+    # Cola en SQLite (TRABAJOS_DB); los hilos arrancan con la primera petición.
+    # Las tareas se registran al importar sus módulos (servicios/exportaciones.py,
+    # servicios/informes.py)
+    trabajos.instalar(aplicacion)
+
+    # ------------------- Métricas (/metrics) -------------------
+    # Se instala antes de la protección global para medir también las peticiones redirigidas
+    metricas.instalar(aplicacion)
+
+    # ------------------- Traza de llamadas a la API (diagnóstico) -------------------
+    # Se activa con la variable de entorno TRAZA_API=1
+    traza.instalar(aplicacion)
+
+    # ------------------- PROTECCIÓN GLOBAL DE RUTAS -------------------
+    @aplicacion.before_request
+    def proteger_todo():
+        """Bloquea todo el sitio si no hay sesión activa (excepto login y archivos estáticos)."""
+        rutas_publicas = ['rutas_login.login', 'rutas_login.logout', 'static']
+        if not session.get('usuario') and request.endpoint not in rutas_publicas:
+            # Prometheus lee /metrics sin sesión, con el token de METRICAS_TOKEN
+            if request.endpoint == 'metricas' and metricas.autorizado():
+                return None
+            return redirect(url_for('rutas_login.login'))
+
+    # ------------------- ETag / 304 en los listados -------------------
+    # Después de la protección: sin sesión se redirige al login, no se valida
+    validacion.instalar(aplicacion)
+
+    # ------------------- Respuestas parciales de las escrituras -------------------
+    # Con la cabecera X-Parcial (static/parcial.js) crear/actualizar/eliminar
+    # devuelven la fila o la tabla en lugar de redirigir al listado.
+    # Se instala al final: su after_request corre primero y las métricas ven
+    # la respuesta definitiva
+    parcial.instalar(aplicacion)
+
+    # ------------------- Rutas principales -------------------
+
+    @aplicacion.route("/")
+    def inicio():
+        """
+        Función asociada a la ruta principal (/).
+        Retorna la plantilla index.html.
+        """
+        return render_template("index.html")
+
+    @aplicacion.route("/acerca")
+    def acerca():
+        """
+        Función asociada a la ruta /acerca.
+        Retorna la plantilla acerca.html con información sobre el proyecto.
+        """
+        return render_template("acerca.html")
+
+    return aplicacion
 
 # ---------------------------------------------------------
 
+def __getattr__(nombre):
+    """
+    Aplicación para el servidor de desarrollo (python app.py) y para quien
+    haga "from app import aplicacion". Se crea al pedirla, así wsgi.py no
+    construye una segunda aplicación al importar crear_aplicacion.
+    """
+    if nombre == "aplicacion":
+        globals()["aplicacion"] = crear_aplicacion()
+        return globals()["aplicacion"]
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
 # Punto de entrada de la aplicación
 if __name__ == "__main__":
+    aplicacion = crear_aplicacion()
     # Ejecutar la aplicación en modo depuración, en el puerto 5000
     # host="0.0.0.0" permite que la app sea accesible desde la red local
     # debug=True permite reinicio automático ante cambios
+    # Para producción usar wsgi.py (ver readme)
     aplicacion.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,529 @@
+# =================== benchmarks/api_simulada.py ===================
+"""
+API simulada: sustituto local de la API en C# (webapicsharp) para medir el
+frontend sin SQL Server.
+
+Implementa el mismo contrato que EntidadesController sobre datos en memoria:
+- GET    /api/{tabla}?limite=N              -> {"datos": [...]} (1000 filas si no se indica)
+- GET    /api/{tabla}/{clave}/{valor}       -> {"datos": [...]} o 404
+- POST   /api/{tabla}                       -> crea un registro
+- PUT    /api/{tabla}/{clave}/{valor}       -> actualiza los registros que coinciden
+- DELETE /api/{tabla}/{clave}/{valor}       -> elimina los registros que coinciden
+
+y, de ConsultasController, solo la forma de consulta que genera el
+frontend (cliente_api.consulta_columnas) para pedir algunas columnas o
+filas de una tabla:
+- POST   /api/consultas/ejecutarconsultaparametrizada
+         {"consulta": "SELECT [TOP (@limite)] a, b FROM tabla [WHERE c = @filtro_c AND ...] [LIMIT @limite]",
+          "parametros": {"limite": N, "filtro_c": v}} -> {"resultados": [...]} o 404
+
+Los datos se generan de forma determinista para todas las tablas y vistas
+que usan las rutas, con la cantidad de filas que se indique (de 10 a
+1.000.000): las filas se calculan al pedirlas y solo se guardan las que se
+escriben. Se puede inyectar una demora con distintas distribuciones y una
+tasa de errores 500 o de conexiones cortadas para ver cómo escala y cómo
+se degrada el frontend.
+
+Uso:
+    python -m benchmarks.api_simulada --filas 1000000 --latencia lognormal:15:0.6 \\
+        --ms-por-fila 0.002 --tasa-errores 0.01
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import re
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Igual que el repositorio de SQL Server: sin ?limite= se devuelven como máximo 1000 filas
+LIMITE_POR_DEFECTO = 1000
+
+# Filas por cada parte de una respuesta enviada por partes (chunked)
+FILAS_POR_PARTE = 1000
+
+# Consultas de proyección que acepta /api/consultas (las que arma cliente_api.consulta_columnas)
+CONSULTA_COLUMNAS = re.compile(r"^SELECT (TOP \(@limite\) )?(?P<columnas>\*|\w+(, \w+)*) FROM (?P<tabla>\w+)"
+                               r"( WHERE (?P<filtros>\w+ = @\w+( AND \w+ = @\w+)*))?( LIMIT @limite)?$")
+
+# Campos de cada tabla (además de "id") según lo que envían y muestran las rutas
+TABLAS = {
+    "usuario": ["email", "contrasena", "ruta_avatar", "activo"],
+    "tipo_responsable": ["titulo", "descripcion"],
+    "tipo_proyecto": ["nombre", "descripcion"],
+    "tipo_producto": ["nombre", "descripcion"],
+    "estado": ["nombre", "descripcion"],
+    "variable_estrategica": ["titulo", "descripcion"],
+    "objetivo_estrategico": ["id_variable", "titulo", "descripcion"],
+    "meta_estrategica": ["id_objetivo", "titulo", "descripcion"],
+    "responsable": ["id_tipo_responsable", "id_usuario", "nombre"],
+    "proyecto": ["id_proyecto_padre", "id_responsable", "id_tipo_proyecto", "codigo", "titulo", "descripcion",
+                 "fecha_inicio", "fecha_fin_prevista", "fecha_modificacion", "fecha_finalizacion", "ruta_logo"],
+    "producto": ["id_tipo_producto", "codigo", "titulo", "descripcion", "fecha_inicio", "fecha_fin_prevista", "ruta_logo"],
+    "entregable": ["codigo", "titulo", "descripcion", "fecha_inicio", "fecha_fin_prevista",
+                   "fecha_modificacion", "fecha_finalizacion"],
+    "actividad": ["id_entregable", "titulo", "descripcion", "fecha_inicio", "fecha_fin_prevista",
+                  "fecha_modificacion", "fecha_finalizacion", "prioridad", "porcentaje_avance"],
+    "archivo": ["id_usuario", "ruta", "nombre", "tipo", "fecha"],
+    "presupuesto": ["id_proyecto", "estado", "monto_solicitado", "monto_aprobado", "periodo_anio",
+                    "fecha_solicitud", "fecha_aprobacion", "observaciones"],
+    "distribucion_presupuesto": ["presupuesto_padre_id", "proyecto_hijo_id", "monto_asignado"],
+    "ejecucion_presupuesto": ["presupuesto_id", "anio", "monto_planeado", "monto_ejecutado", "observaciones"],
+    "estado_proyecto": ["id_proyecto", "id_estado"],
+    "meta_proyecto": ["id_meta", "id_proyecto", "fecha_asociacion"],
+    "proyecto_producto": ["id_proyecto", "id_producto", "fecha_asociacion"],
+    "producto_entregable": ["id_producto", "id_entregable", "fecha_asociacion"],
+    "responsable_entregable": ["id_responsable", "id_entregable", "fecha_asociacion"],
+    "archivo_entregable": ["id_archivo", "id_entregable"],
+}
+
+# Vistas que combinan tablas (solo lectura)
+VISTAS = {
+    "view_archivo_entregable": ["id_archivo", "id_entregable", "nombre_archivo", "ruta_archivo", "tipo_archivo",
+                                "fecha_archivo", "codigo_entregable", "titulo_entregable", "fecha_inicio",
+                                "fecha_fin_prevista"],
+    "view_distribucion_presupuesto": ["id_distribucion", "id_presupuesto_padre", "id_proyecto_asociado",
+                                      "id_proyecto_hijo", "proyecto_hijo", "monto_asignado", "monto_aprobado",
+                                      "periodo_anio"],
+    "view_estado_proyecto": ["id_proyecto", "codigo_proyecto", "titulo_proyecto", "id_estado", "nombre_estado",
+                             "descripcion_estado"],
+    "view_meta_proyecto": ["id_meta", "id_proyecto", "id_objetivo", "id_variable", "codigo_proyecto",
+                           "titulo_proyecto", "titulo_meta", "descripcion_meta", "titulo_objetivo",
+                           "titulo_variable", "fecha_asociacion"],
+    "view_producto_entregable": ["id_producto", "id_entregable", "codigo_producto", "titulo_producto",
+                                 "codigo_entregable", "titulo_entregable", "fecha_asociacion"],
+    "view_proyecto_producto": ["id_proyecto", "id_producto", "codigo_proyecto", "titulo_proyecto",
+                               "codigo_producto", "titulo_producto", "tipo_producto", "fecha_asociacion"],
+    "view_responsable_entregable": ["id_responsable", "id_entregable", "nombre_responsable", "tipo_responsable",
+                                    "codigo_entregable", "titulo_entregable", "fecha_asociacion"],
+}
+
+
+def valor_campo(campo, n, filas):
+    """Valor determinista del campo para la fila n (1..filas)."""
+    if campo.startswith("id_") or campo in ("presupuesto_padre_id", "proyecto_hijo_id", "presupuesto_id"):
+        return (n * 7) % filas + 1
+    if campo.startswith("fecha"):
+        return f"2025-{n % 12 + 1:02d}-{n % 28 + 1:02d}T00:00:00"
+    if campo.startswith("monto"):
+        return round(1000 + (n * 37) % 100000 + 0.5, 2)
+    if campo in ("prioridad", "porcentaje_avance"):
+        return n % 100
+    if campo in ("anio", "periodo_anio"):
+        return 2020 + n % 6
+    if campo == "activo":
+        return n % 5 != 0
+    if campo == "email":
+        return f"usuario{n}@ejemplo.com"
+    if campo.startswith("codigo"):
+        return f"COD-{n:06d}"
+    if campo.startswith("ruta"):
+        return f"/archivos/{n}/documento_{n}.pdf"
+    if campo.startswith("tipo"):
+        return ("pdf", "png", "docx")[n % 3]
+    if campo in ("descripcion", "observaciones") or campo.startswith("descripcion"):
+        return f"Descripción de prueba número {n}. " * 3
+    return f"{campo.replace('_', ' ').capitalize()} {n}"
+
+
+def generar_fila(campos, n, filas):
+    return dict(id=n, **{c: valor_campo(c, n, filas) for c in campos})
+
+
+class TablaVirtual:
+    """
+    Tabla de filas generadas bajo demanda. Solo se guardan en memoria las
+    filas creadas, modificadas o eliminadas, así que una tabla de un millón
+    de filas ocupa lo mismo que una de diez hasta que se escribe en ella.
+    """
+
+    def __init__(self, campos, filas):
+        self.campos = campos
+        self.filas = filas
+        self.modificadas = {}      # id -> fila completa tras un PUT
+        self.eliminadas = set()    # ids de filas generadas que se borraron
+        self.nuevas = {}           # id -> fila creada con POST
+        self.siguiente_id = filas + 1
+        self._indices = {}         # campo -> {valor en texto: [ids]} de las filas generadas
+
+    def __len__(self):
+        return self.filas - len(self.eliminadas) + len(self.nuevas)
+
+    def fila(self, n):
+        """Fila con id n, o None si no existe."""
+        if n in self.nuevas:
+            return self.nuevas[n]
+        if n in self.eliminadas or not 1 <= n <= self.filas:
+            return None
+        return self.modificadas.get(n) or generar_fila(self.campos, n, self.filas)
+
+    def iterar(self):
+        """
+        Recorre las filas tal como están en este momento, como una consulta
+        SQL: lo que se escriba mientras se envía la respuesta no aparece.
+        """
+        return self._recorrer(dict(self.modificadas), set(self.eliminadas), list(self.nuevas.values()))
+
+    def _recorrer(self, modificadas, eliminadas, nuevas):
+        for n in range(1, self.filas + 1):
+            if n not in eliminadas:
+                yield modificadas.get(n) or generar_fila(self.campos, n, self.filas)
+        yield from nuevas
+
+    def _indice(self, campo):
+        """Índice valor -> ids del campo sobre las filas generadas (se crea en la primera búsqueda)."""
+        indice = self._indices.get(campo)
+        if indice is None:
+            indice = {}
+            for n in range(1, self.filas + 1):
+                indice.setdefault(str(valor_campo(campo, n, self.filas)), []).append(n)
+            self._indices[campo] = indice
+        return indice
+
+    def buscar(self, clave, valor):
+        if clave == "id":
+            fila = self.fila(int(valor)) if valor.isdigit() else None
+            return [fila] if fila else []
+        if clave not in self.campos:
+            return []
+        candidatos = set(self._indice(clave).get(valor, []))
+        # Las filas escritas pueden haber cambiado el valor del campo
+        candidatos.update(self.modificadas, self.nuevas)
+        filas = (self.fila(n) for n in sorted(candidatos))
+        return [f for f in filas if f is not None and str(f.get(clave)) == valor]
+
+
+class AlmacenMemoria:
+    """Tablas virtuales con las operaciones del controlador genérico."""
+
+    def __init__(self, filas=100):
+        self.filas = filas
+        self.tablas = {t: TablaVirtual(c, filas) for t, c in {**TABLAS, **VISTAS}.items()}
+        self.peticiones = 0
+        self._candado = threading.Lock()
+
+    def contar(self):
+        with self._candado:
+            self.peticiones += 1
+
+    def listar(self, tabla, limite):
+        """Devuelve (cantidad, iterador) de las primeras `limite` filas."""
+        t = self.tablas[tabla]
+        return min(len(t), limite), itertools.islice(t.iterar(), limite)
+
+    def buscar(self, tabla, clave, valor):
+        with self._candado:
+            return self.tablas[tabla].buscar(clave, valor)
+
+    def crear(self, tabla, datos):
+        with self._candado:
+            t = self.tablas[tabla]
+            nuevo = dict(datos, id=t.siguiente_id)
+            t.nuevas[t.siguiente_id] = nuevo
+            t.siguiente_id += 1
+        return nuevo
+
+    def actualizar(self, tabla, clave, valor, datos):
+        with self._candado:
+            t = self.tablas[tabla]
+            afectadas = t.buscar(clave, valor)
+            for fila in afectadas:
+                nueva = dict(fila, **{k: v for k, v in datos.items() if k != "id"})
+                if fila["id"] in t.nuevas:
+                    t.nuevas[fila["id"]] = nueva
+                else:
+                    t.modificadas[fila["id"]] = nueva
+        return len(afectadas)
+
+    def eliminar(self, tabla, clave, valor):
+        with self._candado:
+            t = self.tablas[tabla]
+            afectadas = t.buscar(clave, valor)
+            for fila in afectadas:
+                if t.nuevas.pop(fila["id"], None) is None:
+                    t.modificadas.pop(fila["id"], None)
+                    t.eliminadas.add(fila["id"])
+        return len(afectadas)
+
+
+# ------------------- LATENCIA Y ERRORES INYECTADOS -------------------
+class Latencia:
+    """
+    Distribución de la demora (en ms) que se añade a cada respuesta.
+
+    Se indica como "tipo:parametros", por ejemplo:
+    - "fija:20"            siempre 20 ms
+    - "uniforme:10:50"     entre 10 y 50 ms
+    - "normal:20:5"        media 20 ms, desviación 5 ms
+    - "lognormal:20:0.5"   mediana 20 ms, sigma 0.5 (cola larga, como una BD real)
+    - "exponencial:20"     media 20 ms
+    A la demora se suma ms_por_fila por cada fila devuelta.
+    """
+
+    TIPOS = {
+        "fija": lambda rnd, ms: ms,
+        "uniforme": lambda rnd, minimo, maximo: rnd.uniform(minimo, maximo),
+        "normal": lambda rnd, media, desviacion: rnd.gauss(media, desviacion),
+        "lognormal": lambda rnd, mediana, sigma: rnd.lognormvariate(math.log(mediana), sigma),
+        "exponencial": lambda rnd, media: rnd.expovariate(1 / media),
+    }
+
+    def __init__(self, especificacion="fija:0", ms_por_fila=0.0, semilla=None):
+        tipo, *parametros = especificacion.split(":")
+        if tipo not in self.TIPOS:
+            raise ValueError(f"Distribución de latencia desconocida: {tipo}")
+        self.especificacion = especificacion
+        self._muestra = self.TIPOS[tipo]
+        self._parametros = [float(p) for p in parametros]
+        self.ms_por_fila = ms_por_fila
+        self._aleatorio = random.Random(semilla)
+        self._candado = threading.Lock()
+
+    def segundos(self, filas=0):
+        with self._candado:
+            ms = self._muestra(self._aleatorio, *self._parametros)
+        return max(0.0, ms + self.ms_por_fila * filas) / 1000
+
+
+class Fallos:
+    """Probabilidad de responder 500 o de cortar la conexión sin responder."""
+
+    def __init__(self, tasa_errores=0.0, tasa_cortes=0.0, semilla=None):
+        self.tasa_errores = tasa_errores
+        self.tasa_cortes = tasa_cortes
+        self._aleatorio = random.Random(semilla)
+        self._candado = threading.Lock()
+
+    def sortear(self):
+        """Devuelve "corte", "error" o None."""
+        with self._candado:
+            suerte = self._aleatorio.random()
+        if suerte < self.tasa_cortes:
+            return "corte"
+        if suerte < self.tasa_cortes + self.tasa_errores:
+            return "error"
+        return None
+
+
+class ManejadorApi(BaseHTTPRequestHandler):
+    """Traduce las peticiones HTTP a operaciones del almacén."""
+
+    almacen = None
+    latencia = Latencia()
+    fallos = Fallos()
+    protocol_version = "HTTP/1.1"   # mantiene las conexiones abiertas (keep-alive)
+    disable_nagle_algorithm = True  # evita esperas de ~40 ms por ACK retardado
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder(self, codigo, cuerpo=None, filas=0):
+        time.sleep(self.latencia.segundos(filas))
+        contenido = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8") if cuerpo is not None else b""
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def _responder_lista(self, tabla, limite, cantidad, filas):
+        """
+        Envía un listado por partes (Transfer-Encoding: chunked) sin armar
+        todo el JSON en memoria, para poder servir cientos de miles de filas.
+        """
+        time.sleep(self.latencia.segundos(cantidad))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def parte(texto):
+            datos = texto.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(datos), datos))
+
+        parte(json.dumps({"tabla": tabla, "esquema": "por defecto", "limite": limite, "total": cantidad},
+                         ensure_ascii=False)[:-1] + ', "datos": [')
+        separador = ""
+        while True:
+            lote = [json.dumps(fila, ensure_ascii=False) for fila in itertools.islice(filas, FILAS_POR_PARTE)]
+            if not lote:
+                break
+            parte(separador + ",".join(lote))
+            separador = ","
+        parte("]}")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _fallo_inyectado(self, tabla):
+        """Aplica la tasa de errores configurada. Devuelve True si ya se respondió."""
+        fallo = self.fallos.sortear()
+        if fallo == "corte":
+            self.close_connection = True
+            return True
+        if fallo == "error":
+            self._responder(500, {"estado": 500, "mensaje": "Error interno del servidor.", "tabla": tabla,
+                                  "detalle": "Contacte al administrador del sistema.",
+                                  "timestamp": datetime.now(timezone.utc).isoformat()})
+            return True
+        return False
+
+    def _ruta(self):
+        partes = urlsplit(self.path)
+        # Como el enrutamiento de ASP.NET: los valores llegan decodificados (%40 -> @)
+        segmentos = [unquote(s) for s in partes.path.split("/") if s]
+        if len(segmentos) < 2 or segmentos[0] != "api" or segmentos[1] not in self.almacen.tablas:
+            return None, [], {}
+        return segmentos[1], segmentos[2:], parse_qs(partes.query)
+
+    def _leer_json(self):
+        largo = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(largo) or b"{}") if largo else {}
+
+    def do_GET(self):
+        self.almacen.contar()
+        tabla, resto, consulta = self._ruta()
+        if tabla is None:
+            return self._responder(404, {"estado": 404, "mensaje": "El recurso solicitado no fue encontrado."})
+        if self._fallo_inyectado(tabla):
+            return
+        if not resto:
+            limite = int(consulta["limite"][0]) if "limite" in consulta else None
+            if limite is not None and limite <= 0:
+                return self._responder(400, {"estado": 400, "mensaje": "Parámetros de entrada inválidos.",
+                                             "detalle": "El límite debe ser mayor que cero.", "tabla": tabla})
+            cantidad, filas = self.almacen.listar(tabla, limite or LIMITE_POR_DEFECTO)
+            if not cantidad:
+                return self._responder(204)
+            return self._responder_lista(tabla, limite, cantidad, filas)
+        if len(resto) == 2:
+            filas = self.almacen.buscar(tabla, resto[0], resto[1])
+            if not filas:
+                return self._responder(404, {"estado": 404, "mensaje": "No se encontraron registros"})
+            return self._responder(200, {"tabla": tabla, "total": len(filas), "datos": filas}, len(filas))
+        self._responder(404, {"estado": 404, "mensaje": "Recurso no encontrado."})
+
+    def _consulta(self):
+        """Proyección de columnas y filtros de igualdad sobre una tabla; el resto de SQL no se simula."""
+        cuerpo = self._leer_json()
+        consulta = CONSULTA_COLUMNAS.match(cuerpo.get("consulta") or "")
+        if not consulta:
+            return self._responder(400, {"error": "Consulta no soportada por la API simulada."})
+        tabla = consulta["tabla"]
+        if self._fallo_inyectado(tabla):
+            return
+        t = self.almacen.tablas.get(tabla)
+        columnas = (["id"] + (t.campos if t else [])) if consulta["columnas"] == "*" else consulta["columnas"].split(", ")
+        filtros = dict(f.split(" = @") for f in consulta["filtros"].split(" AND ")) if consulta["filtros"] else {}
+        desconocidas = [c for c in columnas + list(filtros) if t is None or (c != "id" and c not in t.campos)]
+        if desconocidas:
+            # Como SQL Server ante una tabla o columna inexistente
+            return self._responder(500, {"estado": 500, "mensaje": "Error interno del servidor.",
+                                         "detalle": f"Nombre de objeto o columna no válido: {desconocidas[0]}"})
+        parametros = cuerpo.get("parametros") or {}
+        limite = int(parametros.get("limite", LIMITE_POR_DEFECTO))
+        valores = {c: str(parametros.get(p)) for c, p in filtros.items()}
+        filas = (f for f in t.iterar() if all(str(f.get(c)) == v for c, v in valores.items()))
+        resultados = [{c: fila[c] for c in columnas} for fila in itertools.islice(filas, limite)]
+        cantidad = len(resultados)
+        if not resultados:
+            time.sleep(self.latencia.segundos())
+            contenido = "La consulta se ejecutó correctamente pero no devolvió resultados.".encode("utf-8")
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(contenido)))
+            self.end_headers()
+            return self.wfile.write(contenido)
+        self._responder(200, {"resultados": resultados, "total": cantidad, "advertencia": None}, cantidad)
+
+    def do_POST(self):
+        self.almacen.contar()
+        if urlsplit(self.path).path.rstrip("/") == "/api/consultas/ejecutarconsultaparametrizada":
+            return self._consulta()
+        tabla, resto, _ = self._ruta()
+        if tabla is None or resto:
+            return self._responder(404, {"estado": 404, "mensaje": "Recurso no encontrado."})
+        datos = self._leer_json()
+        if self._fallo_inyectado(tabla):
+            return
+        if not datos:
+            return self._responder(400, {"estado": 400, "mensaje": "Los datos de la entidad no pueden estar vacíos."})
+        self.almacen.crear(tabla, datos)
+        self._responder(200, {"estado": 200, "mensaje": "Registro creado exitosamente.", "tabla": tabla})
+
+    def do_PUT(self):
+        self.almacen.contar()
+        tabla, resto, _ = self._ruta()
+        if tabla is None or len(resto) != 2:
+            return self._responder(404, {"estado": 404, "mensaje": "Recurso no encontrado."})
+        datos = self._leer_json()
+        if self._fallo_inyectado(tabla):
+            return
+        afectadas = self.almacen.actualizar(tabla, resto[0], resto[1], datos)
+        if not afectadas:
+            return self._responder(404, {"estado": 404, "mensaje": "No se encontraron registros"})
+        self._responder(200, {"estado": 200, "mensaje": "Registro actualizado exitosamente.",
+                              "tabla": tabla, "filasAfectadas": afectadas})
+
+    def do_DELETE(self):
+        self.almacen.contar()
+        tabla, resto, _ = self._ruta()
+        if tabla is None or len(resto) != 2:
+            return self._responder(404, {"estado": 404, "mensaje": "Recurso no encontrado."})
+        if self._fallo_inyectado(tabla):
+            return
+        eliminadas = self.almacen.eliminar(tabla, resto[0], resto[1])
+        if not eliminadas:
+            return self._responder(404, {"estado": 404, "mensaje": "No se encontraron registros"})
+        self._responder(200, {"estado": 200, "mensaje": "Registro eliminado exitosamente.",
+                              "tabla": tabla, "filasEliminadas": eliminadas})
+
+
+class ServidorApi(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024   # el valor por defecto (5) corta conexiones con mucha concurrencia
+
+
+def iniciar(filas=100, host="127.0.0.1", puerto=5031, en_segundo_plano=True,
+            latencia="fija:0", ms_por_fila=0.0, tasa_errores=0.0, tasa_cortes=0.0, semilla=None):
+    """
+    Arranca la API simulada. Devuelve (servidor, almacen); con
+    en_segundo_plano=True el servidor atiende en un hilo demonio.
+    """
+    almacen = AlmacenMemoria(filas)
+    manejador = type("Manejador", (ManejadorApi,), {
+        "almacen": almacen,
+        "latencia": Latencia(latencia, ms_por_fila, semilla),
+        "fallos": Fallos(tasa_errores, tasa_cortes, semilla),
+    })
+    servidor = ServidorApi((host, puerto), manejador)
+    if en_segundo_plano:
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, almacen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API simulada para pruebas de carga del frontend")
+    parser.add_argument("--filas", type=int, default=100, help="filas por tabla (de 10 a 1000000)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=5031)
+    parser.add_argument("--latencia", default="fija:0",
+                        help='demora por respuesta en ms: "fija:20", "uniforme:10:50", "normal:20:5", '
+                             '"lognormal:20:0.5" o "exponencial:20"')
+    parser.add_argument("--ms-por-fila", type=float, default=0.0, help="demora extra por fila devuelta (ms)")
+    parser.add_argument("--tasa-errores", type=float, default=0.0, help="fracción de respuestas 500 (0 a 1)")
+    parser.add_argument("--tasa-cortes", type=float, default=0.0,
+                        help="fracción de conexiones cortadas sin respuesta (0 a 1)")
+    parser.add_argument("--semilla", type=int, help="semilla para repetir la misma secuencia de demoras y fallos")
+    opciones = parser.parse_args()
+
+    servidor, _ = iniciar(opciones.filas, opciones.host, opciones.puerto, False, opciones.latencia,
+                          opciones.ms_por_fila, opciones.tasa_errores, opciones.tasa_cortes, opciones.semilla)
+    print(f"API simulada en http://{opciones.host}:{opciones.puerto}/api ({opciones.filas} filas por tabla, "
+          f"latencia {opciones.latencia}, errores {opciones.tasa_errores:.1%}, cortes {opciones.tasa_cortes:.1%})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,60 @@
+# =================== benchmarks/bench_busqueda.py ===================
+"""
+Benchmark de la búsqueda de texto libre (servicios/busqueda.py).
+
+Genera un listado de proyectos con los mismos datos que la API simulada y
+mide:
+- la construcción del índice;
+- la latencia de búsquedas típicas (mediana y máximo de varias
+  repeticiones), desde una que coincide con un registro hasta una que
+  coincide con toda la tabla;
+- la puesta al día tras una escritura aplicada al listado en caché (un
+  registro cambia) y tras un refresco (mismos datos, objetos nuevos).
+
+Uso (desde la carpeta front/):
+    python -m benchmarks.bench_busqueda --filas 100000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.api_simulada import TABLAS, generar_fila
+from servicios import busqueda
+
+CONSULTAS = ["COD-004217", "titulo 4217", "numero 9999", "tit", "42", "descripcion prueba",
+             "Descripción de prueba número 5", "xyz"]
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la búsqueda de texto libre")
+    parser.add_argument("--filas", type=int, default=100000, help="filas del listado")
+    parser.add_argument("--repeticiones", type=int, default=20, help="repeticiones por consulta")
+    opciones = parser.parse_args()
+
+    datos = [generar_fila(TABLAS["proyecto"], n, opciones.filas) for n in range(1, opciones.filas + 1)]
+    indice = busqueda.IndiceTexto(tuple(busqueda.PESOS))
+    _, ms = cronometrar(lambda: indice.sincronizar(datos))
+    print(f"Índice de {opciones.filas} proyectos construido en {ms:.0f} ms")
+
+    for consulta in CONSULTAS:
+        indice.buscar(datos, consulta)  # primera vez: ordena las listas que use
+        tiempos = []
+        for _ in range(opciones.repeticiones):
+            resultados, ms = cronometrar(lambda: indice.buscar(datos, consulta))
+            tiempos.append(ms)
+        print(f"  {consulta!r:34} {len(resultados):5} resultados  "
+              f"p50 {statistics.median(tiempos):7.2f} ms  máx {max(tiempos):7.2f} ms")
+
+    escrito = list(datos)
+    escrito[10] = dict(datos[10], titulo="Proyecto renombrado")
+    resultados, ms = cronometrar(lambda: indice.buscar(escrito, "renombrado"))
+    print(f"Tras una escritura: {ms:.1f} ms ({len(resultados)} resultado)")
+    refrescado = [dict(fila) for fila in escrito]
+    _, ms = cronometrar(lambda: indice.buscar(refrescado, "renombrado"))
+    print(f"Tras un refresco sin cambios: {ms:.1f} ms")
@@ -0,0 +1,85 @@
+# =================== benchmarks/bench_json.py ===================
+"""
+Benchmark de la decodificación de listados grandes de la API.
+
+Contra la API simulada compara, para un mismo listado:
+- json de la biblioteca estándar (lo que hacía respuesta.json());
+- json_api.cargar (orjson si está instalado);
+- cliente_api.iterar_datos, registro a registro mientras llegan los bytes.
+Informa el tiempo por listado (descarga incluida) y el pico de memoria
+(tracemalloc, en una pasada aparte para no distorsionar los tiempos), y
+aparte el tiempo de solo decodificar el cuerpo ya descargado.
+
+Uso (desde la carpeta front/):
+    python -m benchmarks.bench_json --filas 100000 --repeticiones 5
+"""
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+import requests
+
+from benchmarks.api_simulada import iniciar
+from servicios import cliente_api, json_api
+
+
+def estandar(url):
+    return len(json.loads(requests.get(url).content).get("datos", []))
+
+
+def rapido(url):
+    return len(json_api.cargar(requests.get(url).content).get("datos", []))
+
+
+def incremental(url):
+    return sum(1 for _ in cliente_api.iterar_datos(url))
+
+
+def medir(funcion, url, repeticiones):
+    """Devuelve (filas, mediana en ms, pico de memoria en MB)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = funcion(url)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tracemalloc.start()
+    funcion(url)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return filas, statistics.median(tiempos), pico / 1024 / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de decodificación JSON de listados")
+    parser.add_argument("--filas", type=int, default=100000, help="filas del listado")
+    parser.add_argument("--repeticiones", type=int, default=5, help="descargas por decodificador")
+    parser.add_argument("--tabla", default="proyecto", help="tabla de la API simulada")
+    parser.add_argument("--puerto", type=int, default=5031, help="puerto de la API simulada")
+    opciones = parser.parse_args()
+
+    servidor, _ = iniciar(filas=opciones.filas, puerto=opciones.puerto)
+    url = f"http://127.0.0.1:{opciones.puerto}/api/{opciones.tabla}?limite={opciones.filas}"
+    try:
+        print(f"Listado /api/{opciones.tabla} con {opciones.filas} filas; decodificador rápido: {json_api.DECODIFICADOR}")
+        for nombre, funcion in (("json estándar", estandar), ("json_api.cargar", rapido),
+                                ("iterar_datos", incremental)):
+            filas, ms, mb = medir(funcion, url, opciones.repeticiones)
+            print(f"  {nombre:16} {filas:8} filas  {ms:9.1f} ms  pico {mb:8.1f} MB")
+
+        contenido = requests.get(url).content
+        trozos = [contenido[i:i + cliente_api.TROZO_LECTURA]
+                  for i in range(0, len(contenido), cliente_api.TROZO_LECTURA)]
+        print(f"Solo decodificación ({len(contenido) / 1024 / 1024:.1f} MB ya descargados):")
+        for nombre, funcion in (("json estándar", lambda: json.loads(contenido)),
+                                ("json_api.cargar", lambda: json_api.cargar(contenido)),
+                                ("iterar_datos", lambda: sum(1 for _ in json_api.iterar_datos(trozos)))):
+            tiempos = []
+            for _ in range(opciones.repeticiones):
+                inicio = time.perf_counter()
+                funcion()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            print(f"  {nombre:16} {statistics.median(tiempos):9.1f} ms")
+    finally:
+        servidor.shutdown()
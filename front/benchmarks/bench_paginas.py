@@ -0,0 +1,211 @@
+# =================== benchmarks/bench_paginas.py ===================
+"""
+Benchmark de rendimiento de las páginas del frontend contra la API simulada.
+
+Arranca la API simulada (benchmarks/api_simulada.py) con el tamaño de datos
+indicado y recorre con el cliente de pruebas de Flask todas las rutas de
+listado, búsqueda, creación, actualización y eliminación. Para cada una
+informa peticiones por segundo, latencias p50/p95/p99 y llamadas a la API
+por petición.
+
+Los resultados se guardan en JSON; con --comparar se contrastan con una
+ejecución anterior y se señalan las regresiones.
+
+Uso (desde la carpeta front/):
+    python -m benchmarks.bench_paginas --filas 1000 --iteraciones 50 --hilos 4 \\
+        --salida resultados.json --comparar base.json
+"""
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.api_simulada import TABLAS, iniciar, valor_campo
+
+# Campos con los que las páginas reciben el id a buscar
+CAMPOS_BUSQUEDA = ("codigo_buscar", "id_buscar", "id_responsable_buscar")
+
+# Una ruta se considera en regresión si su p95 empeora más que este porcentaje
+TOLERANCIA_REGRESION = 0.20
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) de una lista ya ordenada."""
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def formulario(tabla, n, filas):
+    """Datos de formulario válidos para crear/actualizar un registro de la tabla."""
+    datos = {"id": str(n)}
+    for campo in TABLAS.get(tabla, []):
+        valor = valor_campo(campo, n, filas)
+        datos[campo] = str(valor).lower() if isinstance(valor, bool) else str(valor)
+        if campo.startswith("fecha"):
+            datos[campo] = datos[campo][:10]
+    datos.update({campo: str(n) for campo in CAMPOS_BUSQUEDA})
+    return datos
+
+
+def escenarios(aplicacion, filas):
+    """
+    Construye la lista de escenarios (nombre, método, función url(i), función datos(i))
+    a partir de las reglas registradas en la aplicación.
+    """
+    listados, busquedas, mutaciones = [], [], []
+    for regla in aplicacion.url_map.iter_rules():
+        blueprint, _, funcion = regla.endpoint.partition(".")
+        if not blueprint.startswith("rutas_") or blueprint == "rutas_login":
+            continue
+        tabla = blueprint[len("rutas_"):]
+        if tabla not in TABLAS:
+            continue
+
+        if "GET" in regla.methods and not regla.arguments:
+            listados.append((regla.endpoint, "GET", lambda i, r=regla.rule: r, lambda i: None))
+        elif funcion.startswith("buscar_"):
+            busquedas.append((regla.endpoint, "POST", lambda i, r=regla.rule: r,
+                              lambda i, t=tabla: formulario(t, i % filas + 1, filas)))
+        elif funcion.startswith("crear_"):
+            mutaciones.append((0, regla.endpoint, "POST", lambda i, r=regla.rule: r,
+                               lambda i, t=tabla: formulario(t, i % filas + 1, filas)))
+        elif funcion.startswith("actualizar_"):
+            mutaciones.append((1, regla.endpoint, "POST", lambda i, r=regla.rule: r,
+                               lambda i, t=tabla: formulario(t, i % filas + 1, filas)))
+        elif funcion.startswith("eliminar_"):
+            # Cada iteración elimina un registro distinto, empezando por el final
+            plantilla = re.sub(r"<[^>]+>", "{}", regla.rule)
+            mutaciones.append((2, regla.endpoint, "POST",
+                               lambda i, p=plantilla: p.format(filas - i % filas), lambda i: None))
+
+    mutaciones = [m[1:] for m in sorted(mutaciones, key=lambda m: (m[0], m[1]))]
+    return ([("listar",) + e for e in sorted(listados)] +
+            [("buscar",) + e for e in sorted(busquedas)] +
+            [("mutar",) + e for e in mutaciones])
+
+
+def medir(aplicacion, almacen, escenario, iteraciones, hilos):
+    """Ejecuta un escenario y devuelve sus estadísticas."""
+    tipo, endpoint, metodo, url, datos = escenario
+
+    def una_peticion(i):
+        cliente = clientes[i % hilos]
+        inicio = time.perf_counter()
+        respuesta = cliente.open(url(i), method=metodo, data=datos(i))
+        duracion = time.perf_counter() - inicio
+        return duracion, respuesta.status_code
+
+    clientes = []
+    for _ in range(hilos):
+        cliente = aplicacion.test_client()
+        with cliente.session_transaction() as sesion:
+            sesion["usuario"] = {"id": 1, "email": "benchmark@ejemplo.com"}
+        clientes.append(cliente)
+
+    llamadas_antes = almacen.peticiones
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        resultados = list(ejecutor.map(una_peticion, range(iteraciones)))
+    total = time.perf_counter() - inicio
+
+    latencias = sorted(d * 1000 for d, _ in resultados)
+    errores = sum(1 for _, codigo in resultados if codigo >= 500)
+    return {
+        "tipo": tipo,
+        "endpoint": endpoint,
+        "peticiones": iteraciones,
+        "errores": errores,
+        "peticiones_por_segundo": round(iteraciones / total, 2) if total else 0.0,
+        "p50_ms": round(percentil(latencias, 50), 3),
+        "p95_ms": round(percentil(latencias, 95), 3),
+        "p99_ms": round(percentil(latencias, 99), 3),
+        "llamadas_api_por_peticion": round((almacen.peticiones - llamadas_antes) / iteraciones, 2),
+    }
+
+
+def comparar(actual, anterior):
+    """Devuelve la lista de regresiones de p95 respecto a una ejecución anterior."""
+    previos = {r["endpoint"]: r for r in anterior.get("resultados", [])}
+    regresiones = []
+    for r in actual["resultados"]:
+        previo = previos.get(r["endpoint"])
+        if not previo or not previo["p95_ms"]:
+            continue
+        cambio = (r["p95_ms"] - previo["p95_ms"]) / previo["p95_ms"]
+        if cambio > TOLERANCIA_REGRESION:
+            regresiones.append((r["endpoint"], previo["p95_ms"], r["p95_ms"], cambio))
+    return regresiones
+
+
+def ejecutar(filas=100, iteraciones=50, hilos=1, puerto=5031, sin_cache=False, filtro=None,
+             latencia="fija:0", tasa_errores=0.0):
+    """Corre el benchmark completo y devuelve el diccionario de resultados."""
+    servidor, almacen = iniciar(filas=filas, puerto=puerto, latencia=latencia, tasa_errores=tasa_errores)
+    try:
+        from app import aplicacion
+        from servicios import cliente_api
+
+        if sin_cache:
+            cliente_api.cache.ttl_suave = cliente_api.cache.ttl_duro = 0
+
+        resultados = []
+        for escenario in escenarios(aplicacion, filas):
+            if filtro and filtro not in escenario[1]:
+                continue
+            cliente_api.cache.invalidar()
+            r = medir(aplicacion, almacen, escenario, iteraciones, hilos)
+            resultados.append(r)
+            print(f"{r['tipo']:7} {r['endpoint']:58} {r['peticiones_por_segundo']:9.1f} pet/s  "
+                  f"p50 {r['p50_ms']:8.2f}  p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms  "
+                  f"api/pet {r['llamadas_api_por_peticion']:5.2f}"
+                  + (f"  errores {r['errores']}" if r["errores"] else ""))
+    finally:
+        servidor.shutdown()
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "parametros": {"filas": filas, "iteraciones": iteraciones, "hilos": hilos, "sin_cache": sin_cache,
+                       "latencia": latencia, "tasa_errores": tasa_errores},
+        "resultados": resultados,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de páginas del frontend contra la API simulada")
+    parser.add_argument("--filas", type=int, default=100, help="filas por tabla en la API simulada")
+    parser.add_argument("--iteraciones", type=int, default=50, help="peticiones por ruta")
+    parser.add_argument("--hilos", type=int, default=1, help="peticiones concurrentes")
+    parser.add_argument("--puerto", type=int, default=5031, help="puerto de la API simulada")
+    parser.add_argument("--latencia", default="fija:0",
+                        help='demora de la API simulada, p. ej. "lognormal:15:0.6" (ver api_simulada.py)')
+    parser.add_argument("--tasa-errores", type=float, default=0.0, help="fracción de respuestas 500 de la API")
+    parser.add_argument("--sin-cache", action="store_true", help="desactiva la caché de listados")
+    parser.add_argument("--filtro", help="solo endpoints que contengan este texto")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para detectar regresiones")
+    opciones = parser.parse_args()
+
+    informe = ejecutar(opciones.filas, opciones.iteraciones, opciones.hilos,
+                       opciones.puerto, opciones.sin_cache, opciones.filtro,
+                       opciones.latencia, opciones.tasa_errores)
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+        print("Resultados guardados en", opciones.salida)
+
+    if opciones.comparar:
+        with open(opciones.comparar, encoding="utf-8") as archivo:
+            regresiones = comparar(informe, json.load(archivo))
+        for endpoint, antes, ahora, cambio in regresiones:
+            print(f"REGRESIÓN {endpoint}: p95 {antes:.2f} -> {ahora:.2f} ms (+{cambio:.0%})")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto a", opciones.comparar)
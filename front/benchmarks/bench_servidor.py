@@ -0,0 +1,166 @@
+# =================== benchmarks/bench_servidor.py ===================
+"""
+Compara servidores para el frontend: el de desarrollo (python app.py,
+debug=True) contra los de producción de wsgi.py (waitress, gunicorn y sus
+variantes con gevent).
+
+Arranca la API simulada y el servidor elegido en procesos aparte y lanza
+peticiones HTTP reales con conexiones keep-alive a las páginas de listado
+durante unos segundos. Informa peticiones por segundo y latencias.
+
+Uso (desde la carpeta front/):
+    python -m benchmarks.bench_servidor --servidores desarrollo waitress gunicorn \\
+        --clientes 16 --segundos 10 --latencia lognormal:10:0.5
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from benchmarks.bench_paginas import percentil
+
+PUERTO_API = 5031
+PUERTO_WEB = 8000          # wsgi.py y gunicorn.conf.py (WEB_PUERTO)
+PUERTO_DESARROLLO = 5000   # fijo en app.py
+
+# Páginas que se recorren en cada prueba
+PAGINAS = ["/", "/proyecto", "/presupuesto", "/entregable", "/actividad", "/estado", "/usuario",
+           "/meta_proyecto", "/producto", "/responsable"]
+
+# Comando, puerto y variables de entorno extra de cada servidor
+GUNICORN = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:aplicacion"]
+SERVIDORES = {
+    "desarrollo": ([sys.executable, "app.py"], PUERTO_DESARROLLO, {}),   # debug=True con recargador
+    "waitress": ([sys.executable, "wsgi.py"], PUERTO_WEB, {}),
+    "gunicorn": (GUNICORN, PUERTO_WEB, {}),
+    "gevent": ([sys.executable, "wsgi.py"], PUERTO_WEB, {"WEB_MODO": "gevent"}),
+    "gunicorn-gevent": (GUNICORN, PUERTO_WEB, {"WEB_MODO": "gevent"}),
+}
+
+
+def esperar_puerto(puerto, segundos=20):
+    limite = time.time() + segundos
+    while time.time() < limite:
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nada escucha en el puerto {puerto}")
+
+
+def cookie_de_sesion():
+    """Cookie de sesión firmada con la clave de la app, para pasar el login."""
+    from app import crear_aplicacion
+
+    aplicacion = crear_aplicacion()
+    serializador = aplicacion.session_interface.get_signing_serializer(aplicacion)
+    return serializador.dumps({"usuario": {"id": 1, "email": "benchmark@ejemplo.com"}})
+
+
+def cargar(puerto, clientes, segundos, cookie):
+    """Lanza `clientes` hilos con su propia conexión keep-alive durante `segundos`."""
+    latencias, errores = [], [0]
+    candado = threading.Lock()
+    fin = time.time() + segundos
+
+    def cliente(numero):
+        sesion = requests.Session()
+        sesion.cookies.set("session", cookie)
+        propias, fallos, i = [], 0, numero
+        while time.time() < fin:
+            inicio = time.perf_counter()
+            try:
+                respuesta = sesion.get(f"http://127.0.0.1:{puerto}{PAGINAS[i % len(PAGINAS)]}", timeout=30)
+                if respuesta.status_code >= 400:
+                    fallos += 1
+            except requests.RequestException:
+                fallos += 1
+            propias.append((time.perf_counter() - inicio) * 1000)
+            i += 1
+        with candado:
+            latencias.extend(propias)
+            errores[0] += fallos
+
+    hilos = [threading.Thread(target=cliente, args=(n,)) for n in range(clientes)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "peticiones": len(latencias),
+        "errores": errores[0],
+        "peticiones_por_segundo": round(len(latencias) / total, 2),
+        "p50_ms": round(percentil(latencias, 50), 2),
+        "p95_ms": round(percentil(latencias, 95), 2),
+        "p99_ms": round(percentil(latencias, 99), 2),
+    }
+
+
+def medir_servidor(nombre, clientes, segundos, cookie, entorno):
+    comando, puerto, extra = SERVIDORES[nombre]
+    # Sesión propia: al terminar se detiene también el proceso hijo del recargador
+    proceso = subprocess.Popen(comando, env=dict(entorno, **extra), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    try:
+        esperar_puerto(puerto)
+        cargar(puerto, min(clientes, 4), 1, cookie)   # calentamiento: llena las cachés
+        resultado = cargar(puerto, clientes, segundos, cookie)
+    finally:
+        os.killpg(proceso.pid, signal.SIGTERM)
+        proceso.wait(10)
+    resultado["servidor"] = nombre
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de servidores de desarrollo y producción")
+    parser.add_argument("--servidores", nargs="+", default=["desarrollo", "waitress", "gunicorn"], choices=SERVIDORES)
+    parser.add_argument("--clientes", type=int, default=16, help="conexiones simultáneas")
+    parser.add_argument("--segundos", type=float, default=10, help="duración de cada prueba")
+    parser.add_argument("--filas", type=int, default=1000, help="filas por tabla en la API simulada")
+    parser.add_argument("--latencia", default="fija:0", help="demora de la API simulada (ver api_simulada.py)")
+    parser.add_argument("--procesos", type=int, help="WEB_PROCESOS para gunicorn")
+    parser.add_argument("--hilos", type=int, help="WEB_HILOS para waitress y gunicorn")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    opciones = parser.parse_args()
+
+    # Todos los servidores (y la cookie de sesión de cookie_de_sesion) usan la misma clave
+    os.environ.setdefault("SECRET_KEY", "bench-servidor")
+    entorno = dict(os.environ, WEB_HOST="127.0.0.1", WEB_PUERTO=str(PUERTO_WEB))
+    if opciones.procesos:
+        entorno["WEB_PROCESOS"] = str(opciones.procesos)
+    if opciones.hilos:
+        entorno["WEB_HILOS"] = str(opciones.hilos)
+
+    api = subprocess.Popen([sys.executable, "-m", "benchmarks.api_simulada", "--filas", str(opciones.filas),
+                            "--puerto", str(PUERTO_API), "--latencia", opciones.latencia],
+                           stdout=subprocess.DEVNULL)
+    resultados = []
+    try:
+        esperar_puerto(PUERTO_API)
+        cookie = cookie_de_sesion()
+        for nombre in opciones.servidores:
+            r = medir_servidor(nombre, opciones.clientes, opciones.segundos, cookie, entorno)
+            resultados.append(r)
+            print(f"{nombre:11} {r['peticiones_por_segundo']:9.1f} pet/s  p50 {r['p50_ms']:8.2f}  "
+                  f"p95 {r['p95_ms']:8.2f}  p99 {r['p99_ms']:8.2f} ms  errores {r['errores']}")
+    finally:
+        api.terminate()
+        api.wait(10)
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"parametros": vars(opciones), "resultados": resultados}, archivo, indent=2, ensure_ascii=False)
+        print("Resultados guardados en", opciones.salida)
@@ -0,0 +1,89 @@
+# =================== benchmarks/perfil_arranque.py ===================
+"""
+Perfil del arranque en frío del frontend.
+
+Lanza varias veces un proceso nuevo que importa wsgi.py (lo mismo que hace
+cada worker de gunicorn sin preload) y mide:
+- el tiempo desde que arranca el intérprete hasta tener la app lista;
+- el tiempo de importación de cada módulo (python -X importtime), propio y
+  acumulado, agrupado por paquete.
+Compara la carga normal con la carga perezosa de secciones
+(WEB_CARGA_PEREZOSA=1).
+
+Uso (desde la carpeta front/):
+    python -m benchmarks.perfil_arranque --repeticiones 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CODIGO = "import wsgi"
+
+
+def arrancar(perezosa, importtime=False):
+    """Arranca un proceso que importa wsgi.py. Devuelve (segundos, stderr)."""
+    entorno = dict(os.environ, WEB_CARGA_PEREZOSA="1" if perezosa else "0")
+    entorno.setdefault("SECRET_KEY", "perfil-arranque")
+    comando = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CODIGO]
+    inicio = time.perf_counter()
+    proceso = subprocess.run(comando, env=entorno, capture_output=True, text=True, check=True)
+    return time.perf_counter() - inicio, proceso.stderr
+
+
+def tiempos_de_importacion(salida):
+    """
+    Interpreta la salida de -X importtime. Devuelve {módulo: (propio_ms, acumulado_ms)}.
+    Formato de cada línea: "import time:  propio |  acumulado |   módulo" (en µs).
+    """
+    tiempos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        tiempos[modulo.strip()] = (int(propio) / 1000, int(acumulado) / 1000)
+    return tiempos
+
+
+def por_paquete(tiempos):
+    """Suma el tiempo propio por paquete: rutas.*, servicios.* y el primer nombre del resto."""
+    grupos = {}
+    for modulo, (propio, _) in tiempos.items():
+        raiz = modulo.split(".")[0]
+        grupos[raiz] = grupos.get(raiz, 0) + propio
+    return grupos
+
+
+def informe(nombre, perezosa, repeticiones, top):
+    arranques = sorted(arrancar(perezosa)[0] * 1000 for _ in range(repeticiones))
+    _, salida = arrancar(perezosa, importtime=True)
+    tiempos = tiempos_de_importacion(salida)
+
+    print(f"\n=== {nombre} ===")
+    print(f"Arranque hasta app lista: mediana {statistics.median(arranques):.1f} ms "
+          f"(mín {arranques[0]:.1f}, máx {arranques[-1]:.1f}, {repeticiones} procesos)")
+    print(f"Módulos importados: {len(tiempos)}; "
+          f"secciones de rutas: {sum(1 for m in tiempos if m.startswith('rutas.'))}")
+
+    print(f"\nPaquetes con más tiempo de importación propio (top {top}):")
+    for paquete, ms in sorted(por_paquete(tiempos).items(), key=lambda x: -x[1])[:top]:
+        print(f"  {ms:8.1f} ms  {paquete}")
+
+    print("\nMódulos del proyecto (propio / acumulado):")
+    for modulo, (propio, acumulado) in sorted(tiempos.items(), key=lambda x: -x[1][1]):
+        if modulo.split(".")[0] in ("app", "wsgi", "rutas", "servicios"):
+            print(f"  {propio:8.1f} / {acumulado:8.1f} ms  {modulo}")
+    return statistics.median(arranques)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil del arranque en frío del frontend")
+    parser.add_argument("--repeticiones", type=int, default=5, help="procesos a lanzar por modo")
+    parser.add_argument("--top", type=int, default=15, help="paquetes a mostrar")
+    opciones = parser.parse_args()
+
+    normal = informe("Carga normal", False, opciones.repeticiones, opciones.top)
+    perezosa = informe("Carga perezosa (WEB_CARGA_PEREZOSA=1)", True, opciones.repeticiones, opciones.top)
+    print(f"\nDiferencia: {normal - perezosa:.1f} ms ({(normal - perezosa) / normal:.0%}) por proceso")
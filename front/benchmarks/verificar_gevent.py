@@ -0,0 +1,145 @@
+# =================== benchmarks/verificar_gevent.py ===================
+"""
+Verificación del modo cooperativo con gevent (WEB_MODO=gevent).
+
+En un solo proceso parcheado arranca la API simulada con demora, sirve la
+aplicación con gevent.pywsgi y lanza cientos de peticiones simultáneas.
+Comprueba que:
+- el parche se aplicó antes de importar la app (concurrencia.verificar());
+- las páginas se atienden a la vez: el tiempo total se parece al de unas
+  pocas llamadas a la API, no a la suma de todas;
+- la agrupación de GET idénticos sigue funcionando (pocas llamadas reales);
+- cada petición ve su propia sesión aunque se intercalen;
+- tras escrituras simultáneas la caché no sirve listados viejos, ni
+  siquiera si había un listado de antes de la escritura aún en curso;
+- las métricas cuadran con las peticiones hechas y no quedan en curso.
+
+Uso (desde la carpeta front/):
+    python -m benchmarks.verificar_gevent --concurrentes 500 --latencia 50
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import argparse
+import sys
+import time
+
+import gevent
+import requests
+from flask import session
+
+from benchmarks.api_simulada import iniciar
+from servicios import cliente_api, concurrencia, metricas
+
+PUERTO_API = 5031
+PUERTO_WEB = 8100
+
+
+def sesion_http(aplicacion, numero):
+    """Sesión de requests con la cookie firmada de un usuario distinto por número."""
+    serializador = aplicacion.session_interface.get_signing_serializer(aplicacion)
+    sesion = requests.Session()
+    sesion.cookies.set("session", serializador.dumps({"usuario": {"id": numero, "email": f"u{numero}@ejemplo.com"}}))
+    return sesion
+
+
+def en_paralelo(cantidad, funcion):
+    """Ejecuta funcion(i) en `cantidad` greenlets a la vez; devuelve (resultados, segundos)."""
+    inicio = time.perf_counter()
+    greenlets = [gevent.spawn(funcion, i) for i in range(cantidad)]
+    gevent.joinall(greenlets, raise_error=True)
+    return [g.value for g in greenlets], time.perf_counter() - inicio
+
+
+def total_metrica(nombre):
+    """Suma de todas las series de una métrica en la salida de /metrics."""
+    return sum(float(linea.rsplit(" ", 1)[1]) for linea in metricas.registro.exportar().splitlines()
+               if linea.startswith(nombre + "{") or linea.startswith(nombre + " "))
+
+
+def main(concurrentes, latencia_ms):
+    from gevent.pywsgi import WSGIServer
+
+    from app import crear_aplicacion
+
+    aplicacion = crear_aplicacion(produccion=True, configuracion={"SECRET_KEY": "verificar-gevent"})
+
+    # Ruta auxiliar: cede el control a mitad de la petición y devuelve el usuario de la sesión
+    @aplicacion.route("/_verificar_sesion")
+    def verificar_sesion():
+        gevent.sleep(0.01)
+        return session["usuario"]["email"]
+
+    # Los listados tardan más que las escrituras (demora extra por fila)
+    servidor_api, almacen = iniciar(filas=20, puerto=PUERTO_API, latencia=f"fija:{latencia_ms}",
+                                    ms_por_fila=latencia_ms / 5)
+    servidor = WSGIServer(("127.0.0.1", PUERTO_WEB), aplicacion, log=None)
+    servidor.start()
+    url = f"http://127.0.0.1:{PUERTO_WEB}"
+    fallos = []
+
+    def comprobar(condicion, mensaje):
+        print(("OK    " if condicion else "FALLO ") + mensaje)
+        if not condicion:
+            fallos.append(mensaje)
+
+    try:
+        problemas = concurrencia.verificar()
+        comprobar(not problemas, "parche de gevent aplicado antes de importar la app " + "; ".join(problemas))
+
+        sesiones = [sesion_http(aplicacion, i) for i in range(concurrentes)]
+        respuestas_antes = total_metrica("flask_respuestas_total")
+
+        # 1) Páginas simultáneas con la caché vacía
+        cliente_api.cache.invalidar()
+        llamadas_antes = almacen.peticiones
+        codigos, segundos = en_paralelo(concurrentes, lambda i: sesiones[i].get(url + "/estado").status_code)
+        llamadas = almacen.peticiones - llamadas_antes
+        comprobar(all(c == 200 for c in codigos), f"{concurrentes} cargas de /estado respondieron 200")
+        # En serie serían concurrentes × latencia; a la vez, unas pocas latencias
+        comprobar(segundos < max(2.0, concurrentes * latencia_ms / 1000 / 10),
+                  f"{concurrentes} cargas en {segundos:.2f} s (en serie serían {concurrentes * latencia_ms / 1000:.1f} s)")
+        comprobar(llamadas <= 5, f"GET agrupados: {llamadas} llamadas a la API para {concurrentes} páginas")
+
+        # 2) Sesiones intercaladas
+        emails, _ = en_paralelo(concurrentes, lambda i: sesiones[i].get(url + "/_verificar_sesion").text)
+        comprobar(all(e == f"u{i}@ejemplo.com" for i, e in enumerate(emails)),
+                  "cada petición ve su propia sesión")
+
+        # 3) Escrituras simultáneas e invalidación de la caché
+        nuevos = min(concurrentes, 50)
+        en_paralelo(nuevos, lambda i: sesiones[i].post(url + "/estado/crear",
+                                                       data={"nombre": f"Nuevo {i}", "descripcion": "x"}))
+        pagina = sesiones[0].get(url + "/estado").text
+        faltan = [i for i in range(nuevos) if f"Nuevo {i}<" not in pagina]
+        comprobar(not faltan, f"tras {nuevos} creaciones simultáneas el listado las muestra todas (faltan {len(faltan)})")
+
+        # 4) Lectura después de escribir mientras un listado anterior sigue en curso
+        cliente_api.cache.invalidar()
+        lenta = gevent.spawn(sesiones[1].get, url + "/estado")
+        gevent.sleep(latencia_ms / 5000)
+        pagina = sesiones[2].post(url + "/estado/crear", data={"nombre": "Tardío", "descripcion": "x"}).text
+        lenta.join()
+        comprobar("Tardío<" in pagina, "un GET iniciado antes de una escritura no se reutiliza después de ella")
+
+        # 5) Métricas
+        # Cada POST redirige al listado y el cliente sigue la redirección
+        hechas = concurrentes * 2 + nuevos * 2 + 1 + 3
+        contadas = total_metrica("flask_respuestas_total") - respuestas_antes
+        comprobar(contadas == hechas, f"métricas: {contadas:.0f} respuestas contadas de {hechas}")
+        comprobar(total_metrica("flask_peticiones_en_curso") == 0, "métricas: ninguna petición queda en curso")
+    finally:
+        servidor.stop()
+        servidor_api.shutdown()
+
+    print("Modo gevent verificado" if not fallos else f"{len(fallos)} comprobaciones fallidas")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verificación del modo gevent")
+    parser.add_argument("--concurrentes", type=int, default=300, help="peticiones simultáneas")
+    parser.add_argument("--latencia", type=float, default=50, help="demora de la API simulada en ms")
+    opciones = parser.parse_args()
+    sys.exit(main(opciones.concurrentes, opciones.latencia))
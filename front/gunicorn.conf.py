@@ -0,0 +1,57 @@
+# =================== gunicorn.conf.py ===================
+# Configuración de gunicorn para producción (Linux):
+#     gunicorn -c gunicorn.conf.py wsgi:aplicacion
+# Los valores se pueden cambiar con las variables de entorno descritas en wsgi.py.
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('WEB_HOST', '0.0.0.0')}:{os.environ.get('WEB_PUERTO', '8000')}"
+
+modo = os.environ.get("WEB_MODO", "hilos")
+
+if modo == "gevent":
+    # Un proceso por núcleo; cada uno atiende WEB_CONEXIONES peticiones a la
+    # vez en greenlets que ceden el control mientras esperan a la API.
+    workers = int(os.environ.get("WEB_PROCESOS", multiprocessing.cpu_count()))
+    worker_class = "gevent"
+    worker_connections = int(os.environ.get("WEB_CONEXIONES", "1000"))
+else:
+    # Procesos: la regla habitual de 2 × núcleos + 1. Cada proceso tiene su
+    # propia caché de listados; las métricas se suman en METRICAS_DIR.
+    workers = int(os.environ.get("WEB_PROCESOS", multiprocessing.cpu_count() * 2 + 1))
+
+    # Hilos por proceso: las páginas pasan casi todo el tiempo esperando a la
+    # API, así que varios hilos por proceso aprovechan esa espera.
+    worker_class = "gthread"
+    threads = int(os.environ.get("WEB_HILOS", "8"))
+
+# Conexiones keep-alive: el navegador reutiliza la conexión para los estáticos
+keepalive = int(os.environ.get("WEB_KEEPALIVE", "5"))
+
+# Las llamadas a la API tienen su propio tiempo de espera (cliente_api.TIEMPO_ESPERA)
+timeout = 60
+graceful_timeout = 30
+
+# Reciclar procesos de vez en cuando limita el crecimiento de memoria
+max_requests = 5000
+max_requests_jitter = 500
+
+# Cargar la aplicación una sola vez antes de crear los procesos (arranque más
+# rápido). Con gevent no: cada proceso debe aplicar el parche antes de importarla.
+preload_app = modo != "gevent"
+
+accesslog = None
+errorlog = "-"
+
+# Cada proceso deja sus métricas en esta carpeta y /metrics devuelve la suma
+# de todos (servicios/metricas.py). Se define antes de cargar la aplicación.
+os.environ.setdefault("METRICAS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "metricas"))
+
+
+def on_starting(servidor):
+    """Al arrancar el servidor se descartan las métricas de la ejecución anterior."""
+    carpeta = os.environ["METRICAS_DIR"]
+    if os.path.isdir(carpeta):
+        for nombre in os.listdir(carpeta):
+            if nombre.endswith((".json", ".tmp")):
+                os.remove(os.path.join(carpeta, nombre))
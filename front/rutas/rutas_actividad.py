@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import busqueda, cliente_api
 
 # Crear el Blueprint de actividad
 rutas_actividad = Blueprint("rutas_actividad", __name__)
@@ -9,6 +9,9 @@ rutas_actividad = Blueprint("rutas_actividad", __name__)
 API_URL = "http://localhost:5031/api/actividad"
 API_ENTREGABLE = "http://localhost:5031/api/entregable"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_ENTREGABLE = ["id", "titulo"]
+
 def formatear_fecha(fecha_str):
     """
     Convierte una fecha a formato YYYY-MM-DD compatible con <input type="date">.
@@ -27,18 +30,24 @@ def formatear_fecha(fecha_str):
 @rutas_actividad.route("/actividad")
 def actividad():
     try:
-        actividades = requests.get(API_URL).json().get("datos", [])
-        entregable = requests.get(API_ENTREGABLE).json().get("datos", [])
+        actividades = cliente_api.obtener_datos(API_URL)
+        entregable = cliente_api.obtener_columnas(API_ENTREGABLE, COLUMNAS_ENTREGABLE)
     except Exception as e:
         actividades, entregable = [], []
         print("Error al conectar con la API:", e)
 
+    # Búsqueda de texto libre (?texto=)
+    texto = request.args.get("texto", "").strip()
+    if texto:
+        actividades = busqueda.buscar("actividad", actividades, texto)
+
     return render_template(
         "actividades.html",
         actividades=actividades,
         actividad=None,
         entregable=entregable,
-        modo="crear"
+        modo="crear",
+        texto=texto
     )
 
 # ------------------- BUSCAR actividad -------------------
@@ -48,28 +57,26 @@ def buscar_actividad():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    actividad = datos[0]
-                    actividad["fecha_inicio"] = formatear_fecha(datos[0].get("fecha_inicio"))
-                    actividad["fecha_fin_prevista"] = formatear_fecha(datos[0].get("fecha_fin_prevista"))
-                    actividad["fecha_modificacion"] = formatear_fecha(datos[0].get("fecha_modificacion"))
-                    actividad["fecha_finalizacion"] = formatear_fecha(datos[0].get("fecha_finalizacion"))
-                    actividades = requests.get(API_URL).json().get("datos", [])
-                    entregable = requests.get(API_ENTREGABLE).json().get("datos", [])
-                    return render_template(
-                        "actividades.html",
-                        actividades=actividades,
-                        actividad=actividad,
-                        entregable=entregable,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                actividad = dict(datos[0])
+                actividad["fecha_inicio"] = formatear_fecha(datos[0].get("fecha_inicio"))
+                actividad["fecha_fin_prevista"] = formatear_fecha(datos[0].get("fecha_fin_prevista"))
+                actividad["fecha_modificacion"] = formatear_fecha(datos[0].get("fecha_modificacion"))
+                actividad["fecha_finalizacion"] = formatear_fecha(datos[0].get("fecha_finalizacion"))
+                actividades = cliente_api.obtener_datos(API_URL)
+                entregable = cliente_api.obtener_columnas(API_ENTREGABLE, COLUMNAS_ENTREGABLE)
+                return render_template(
+                    "actividades.html",
+                    actividades=actividades,
+                    actividad=actividad,
+                    entregable=entregable,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    actividades = requests.get(API_URL).json().get("datos", [])
+    actividades = cliente_api.obtener_datos(API_URL)
     return render_template(
         "actividades.html",
         actividades=actividades,
@@ -94,7 +101,7 @@ def crear_actividad():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la actividad: {e}"
 
@@ -117,7 +124,7 @@ def actualizar_actividad():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar actividad: {e}"
 
@@ -127,7 +134,7 @@ def actualizar_actividad():
 @rutas_actividad.route("/actividad/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_actividad(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar actividad: {e}"
 
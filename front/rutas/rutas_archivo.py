@@ -1,6 +1,7 @@
-from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+import os
+from flask import Blueprint, render_template, request, redirect, url_for, session, abort, send_file, current_app
 from datetime import datetime
+from servicios import almacen, cliente_api, descargas, miniaturas
 
 # Crear el Blueprint de archivo
 rutas_archivo = Blueprint("rutas_archivo", __name__)
@@ -9,6 +10,9 @@ rutas_archivo = Blueprint("rutas_archivo", __name__)
 API_URL = "http://localhost:5031/api/archivo"
 API_USUARIO = "http://localhost:5031/api/usuario"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_USUARIO = ["id", "email"]
+
 def formatear_fecha(fecha_str):
     """
     Convierte una fecha a formato YYYY-MM-DD compatible con <input type="date">.
@@ -22,12 +26,34 @@ def formatear_fecha(fecha_str):
         except ValueError:
             pass
     return ""
+
+def datos_formulario():
+    """
+    Datos del archivo enviados en el formulario. Si se subió un archivo se
+    guarda en el almacén (servicios/almacen.py) y la ruta es la de su
+    objeto; el nombre y el tipo, si se dejaron vacíos, salen del archivo.
+    """
+    datos = {
+        "id_usuario": request.form.get("id_usuario"),
+        "ruta": request.form.get("ruta"),
+        "nombre": request.form.get("nombre"),
+        "tipo": request.form.get("tipo"),
+        "fecha": request.form.get("fecha")
+    }
+    subido = request.files.get("archivo")
+    objeto = almacen.guardar(subido)
+    if objeto is not None:
+        datos["ruta"] = objeto.ruta
+        datos["nombre"] = datos["nombre"] or subido.filename
+        datos["tipo"] = datos["tipo"] or subido.mimetype
+    return datos
+
 # ------------------- LISTAR archivo -------------------
 @rutas_archivo.route("/archivo")
 def archivo():
     try:
-        archivos = requests.get(API_URL).json().get("datos", [])
-        usuario = requests.get(API_USUARIO).json().get("datos", [])
+        archivos = cliente_api.obtener_datos(API_URL)
+        usuario = cliente_api.obtener_columnas(API_USUARIO, COLUMNAS_USUARIO)
     except Exception as e:
         archivos, usuario = [], []
         print("Error al conectar con la API:", e)
@@ -47,25 +73,23 @@ def buscar_archivo():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    datos[0]["fecha"] = formatear_fecha(datos[0].get("fecha"))
-                    archivo = datos[0]
-                    archivos = requests.get(API_URL).json().get("datos", [])
-                    usuario = requests.get(API_USUARIO).json().get("datos", [])
-                    return render_template(
-                        "archivos.html",
-                        archivos=archivos,
-                        archivo=archivo,
-                        usuario=usuario,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                archivo = dict(datos[0])
+                archivo["fecha"] = formatear_fecha(archivo.get("fecha"))
+                archivos = cliente_api.obtener_datos(API_URL)
+                usuario = cliente_api.obtener_columnas(API_USUARIO, COLUMNAS_USUARIO)
+                return render_template(
+                    "archivos.html",
+                    archivos=archivos,
+                    archivo=archivo,
+                    usuario=usuario,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    archivos = requests.get(API_URL).json().get("datos", [])
+    archivos = cliente_api.obtener_datos(API_URL)
     return render_template(
         "archivos.html",
         archivos=archivos,
@@ -77,16 +101,11 @@ def buscar_archivo():
 # ------------------- CREAR archivo -------------------
 @rutas_archivo.route("/archivo/crear", methods=["POST"])
 def crear_archivo():
-    datos = {
-        "id_usuario": request.form.get("id_usuario"),
-        "ruta": request.form.get("ruta"),
-        "nombre": request.form.get("nombre"),
-        "tipo": request.form.get("tipo"),
-        "fecha": request.form.get("fecha")
-    }
-
     try:
-        requests.post(API_URL, json=datos)
+        datos = datos_formulario()
+        if not datos["ruta"]:
+            return "Error al crear el archivo: no se subió ningún archivo"
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear el archivo: {e}"
 
@@ -96,26 +115,68 @@ def crear_archivo():
 @rutas_archivo.route("/archivo/actualizar", methods=["POST"])
 def actualizar_archivo():
     codigo = request.form.get("id")
-    datos = {
-        "id_usuario": request.form.get("id_usuario"),
-        "ruta": request.form.get("ruta"),
-        "nombre": request.form.get("nombre"),
-        "tipo": request.form.get("tipo"),
-        "fecha": request.form.get("fecha")
-    }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        # Sin archivo nuevo se conserva la ruta actual (campo oculto del formulario)
+        datos = datos_formulario()
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar archivo: {e}"
 
     return redirect(url_for("rutas_archivo.archivo"))
 
+# ------------------- DESCARGAR archivo -------------------
+@rutas_archivo.route("/archivo/descargar/<string:codigo>")
+def descargar_archivo(codigo):
+    """
+    Envía el contenido del archivo guardado en el almacén. Solo para una
+    sesión iniciada y archivos que existen en la API; las filas cuya ruta no
+    es del almacén (rutas escritas a mano) no tienen nada que descargar.
+    """
+    if not session.get("usuario"):
+        abort(403)
+    try:
+        datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+    except Exception as e:
+        return f"Error al buscar el archivo: {e}"
+    if not datos:
+        abort(404)
+
+    archivo = datos[0]
+    camino = almacen.ubicacion(archivo.get("ruta"))
+    if camino is None or not os.path.isfile(camino):
+        abort(404)
+    return descargas.enviar(camino, almacen.hash_de(archivo["ruta"]), archivo.get("nombre"), archivo.get("tipo"))
+
+# ------------------- MINIATURA de un archivo -------------------
+@rutas_archivo.route("/archivo/miniatura/<string:hash_contenido>")
+def miniatura_archivo(hash_contenido):
+    """
+    Vista previa de un objeto del almacén. Nunca la genera aquí: si no está
+    lista responde 202 con una imagen de espera (ver servicios/miniaturas.py).
+    """
+    if almacen.hash_de(almacen.ruta_de(hash_contenido)) is None:
+        abort(404)
+    estado, camino = miniaturas.miniatura(hash_contenido)
+    if estado == "lista":
+        # El contenido de un hash no cambia nunca: el navegador la guarda sin volver a validar
+        respuesta = send_file(camino, mimetype="image/jpeg", max_age=31536000, etag=hash_contenido)
+        respuesta.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+        return respuesta
+    if estado == "pendiente":
+        respuesta = current_app.response_class(miniaturas.PENDIENTE, status=202, mimetype="image/svg+xml")
+        respuesta.headers["Cache-Control"] = "no-store"
+        return respuesta
+    respuesta = current_app.response_class(miniaturas.SIN_VISTA, mimetype="image/svg+xml")
+    # Tras un fallo pasajero el navegador no guarda el ícono: se reintentará
+    respuesta.headers["Cache-Control"] = "no-store" if estado == "reintentar" else "private, max-age=3600"
+    return respuesta
+
 # ------------------- ELIMINAR archivo -------------------
 @rutas_archivo.route("/archivo/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_archivo(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar archivo: {e}"
 
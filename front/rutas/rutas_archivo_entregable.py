@@ -1,5 +1,6 @@
-from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from datetime import date
+from flask import Blueprint, render_template, request, redirect, url_for, session
+from servicios import almacen, cliente_api
 
 # Crear el Blueprint de archivo_entregable
 rutas_archivo_entregable = Blueprint("rutas_archivo_entregable", __name__)
@@ -10,14 +11,45 @@ API_ARCHIVO = "http://localhost:5031/api/archivo"
 API_ENTREGABLE = "http://localhost:5031/api/entregable"
 API_ARCHIVOS_ENTREGABLES = "http://localhost:5031/api/view_archivo_entregable"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_ARCHIVO = ["id", "nombre"]
+COLUMNAS_ENTREGABLE = ["id", "titulo"]
+
+def archivo_subido():
+    """
+    id del archivo subido en el formulario, o None si no se subió ninguno.
+
+    El contenido se guarda una sola vez en el almacén (servicios/almacen.py):
+    si ya hay una fila de archivo con ese mismo contenido se enlaza esa, y
+    solo si no existe se crea una nueva. La API no devuelve el id creado,
+    así que se lee filtrando por la ruta del objeto.
+    """
+    subido = request.files.get("archivo")
+    objeto = almacen.guardar(subido)
+    if objeto is None:
+        return None
+    existentes = cliente_api.filtrar(API_ARCHIVO, {"ruta": objeto.ruta}, COLUMNAS_ARCHIVO)
+    if not existentes:
+        cliente_api.crear(API_ARCHIVO, {
+            "id_usuario": (session.get("usuario") or {}).get("id"),
+            "ruta": objeto.ruta,
+            "nombre": subido.filename,
+            "tipo": subido.mimetype,
+            "fecha": date.today().isoformat()
+        })
+        existentes = cliente_api.filtrar(API_ARCHIVO, {"ruta": objeto.ruta}, COLUMNAS_ARCHIVO)
+    if not existentes:
+        raise ValueError(f"no se encontró el archivo creado con la ruta {objeto.ruta}")
+    return existentes[0]["id"]
+
 # ------------------- LISTAR archivo_entregable -------------------
 @rutas_archivo_entregable.route("/archivo_entregable")
 def archivo_entregable():
     try:
-        archivos_entregables = requests.get(API_URL).json().get("datos", [])
-        archivo = requests.get(API_ARCHIVO).json().get("datos", [])
-        entregable = requests.get(API_ENTREGABLE).json().get("datos", [])
-        archivos_vista = requests.get(API_ARCHIVOS_ENTREGABLES).json().get("datos", [])
+        archivos_entregables = cliente_api.obtener_datos(API_URL)
+        archivo = cliente_api.obtener_columnas(API_ARCHIVO, COLUMNAS_ARCHIVO)
+        entregable = cliente_api.obtener_columnas(API_ENTREGABLE, COLUMNAS_ENTREGABLE)
+        archivos_vista = cliente_api.obtener_datos(API_ARCHIVOS_ENTREGABLES)
     except Exception as e:
         archivos_entregables, archivo, entregable,  archivos_vista= [], [], [], []
         print("Error al conectar con la API:", e)
@@ -39,28 +71,26 @@ def buscar_archivo_entregable():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id_archivo/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    archivo_entregable = datos[0]
-                    archivos_entregables = requests.get(API_URL).json().get("datos", [])
-                    archivo = requests.get(API_ARCHIVO).json().get("datos", [])
-                    entregable = requests.get(API_ENTREGABLE).json().get("datos", [])
-                    archivos_vista = requests.get(API_ARCHIVOS_ENTREGABLES).json().get("datos", [])
-                    return render_template(
-                        "archivos_entregables.html",
-                        archivos_vista=archivos_vista,
-                        archivos_entregables=archivos_entregables,
-                        archivo_entregable=archivo_entregable,
-                        archivo=archivo,
-                        entregable=entregable,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id_archivo/{codigo}")
+            if datos:
+                archivo_entregable = datos[0]
+                archivos_entregables = cliente_api.obtener_datos(API_URL)
+                archivo = cliente_api.obtener_columnas(API_ARCHIVO, COLUMNAS_ARCHIVO)
+                entregable = cliente_api.obtener_columnas(API_ENTREGABLE, COLUMNAS_ENTREGABLE)
+                archivos_vista = cliente_api.obtener_datos(API_ARCHIVOS_ENTREGABLES)
+                return render_template(
+                    "archivos_entregables.html",
+                    archivos_vista=archivos_vista,
+                    archivos_entregables=archivos_entregables,
+                    archivo_entregable=archivo_entregable,
+                    archivo=archivo,
+                    entregable=entregable,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    archivos_entregables = requests.get(API_URL).json().get("datos", [])
+    archivos_entregables = cliente_api.obtener_datos(API_URL)
     return render_template(
         "archivos_entregables.html",
         archivos_entregables=archivos_entregables,
@@ -72,13 +102,16 @@ def buscar_archivo_entregable():
 # ------------------- CREAR archivo_entregable -------------------
 @rutas_archivo_entregable.route("/archivo_entregable/crear", methods=["POST"])
 def crear_archivo_entregable():
-    datos = {
-        "id_archivo": request.form.get("id_archivo"),
-        "id_entregable": request.form.get("id_entregable")
-    }
-
     try:
-        requests.post(API_URL, json=datos)
+        # Un archivo subido aquí mismo reemplaza al elegido en la lista
+        id_archivo = archivo_subido() or request.form.get("id_archivo")
+        if not id_archivo:
+            return "Error al crear la relación archivo-entregable: no se eligió ni se subió ningún archivo"
+        datos = {
+            "id_archivo": id_archivo,
+            "id_entregable": request.form.get("id_entregable")
+        }
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la relación archivo-entregable: {e}"
 
@@ -94,7 +127,7 @@ def actualizar_archivo_entregable():
     }
 
     try:
-        requests.put(f"{API_URL}/id_archivo/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id_archivo/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la relación archivo-entregable: {e}"
 
@@ -104,7 +137,7 @@ def actualizar_archivo_entregable():
 @rutas_archivo_entregable.route("/archivo_entregable/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_archivo_entregable(codigo):
     try:
-        requests.delete(f"{API_URL}/id_archivo/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id_archivo/{codigo}")
     except Exception as e:
         return f"Error al eliminar la relación archivo-entregable: {e}"
 
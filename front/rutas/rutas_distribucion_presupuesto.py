@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de distribucion_presupuesto
 rutas_distribucion_presupuesto = Blueprint("rutas_distribucion_presupuesto", __name__)
@@ -10,14 +10,18 @@ API_PRESUPUESTO = "http://localhost:5031/api/presupuesto"
 API_PROYECTO = "http://localhost:5031/api/proyecto"
 API_DISTRIBUCION = "http://localhost:5031/api/view_distribucion_presupuesto"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_PRESUPUESTO = ["id", "periodo_anio"]
+COLUMNAS_PROYECTO = ["id", "titulo"]
+
 # ------------------- LISTAR distribucion_presupuesto -------------------
 @rutas_distribucion_presupuesto.route("/distribucion_presupuesto")
 def distribucion_presupuesto():
     try:
-        distribuciones_presupuesto = requests.get(API_URL).json().get("datos", [])
-        presupuesto = requests.get(API_PRESUPUESTO).json().get("datos", [])
-        proyectos = requests.get(API_PROYECTO).json().get("datos", [])
-        distribucion = requests.get(API_DISTRIBUCION).json().get("datos", [])
+        distribuciones_presupuesto = cliente_api.obtener_datos(API_URL)
+        presupuesto = cliente_api.obtener_columnas(API_PRESUPUESTO, COLUMNAS_PRESUPUESTO)
+        proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+        distribucion = cliente_api.obtener_datos(API_DISTRIBUCION)
     except Exception as e:
         distribuciones_presupuesto, presupuesto, distribucion = [], [], []
         print("Error al conectar con la API:", e)
@@ -39,28 +43,26 @@ def buscar_distribucion_presupuesto():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    distribucion_presupuesto = datos[0]
-                    distribuciones_presupuesto = requests.get(API_URL).json().get("datos", [])
-                    presupuesto = requests.get(API_PRESUPUESTO).json().get("datos", [])
-                    proyectos = requests.get(API_PROYECTO).json().get("datos", [])
-                    distribucion = requests.get(API_DISTRIBUCION).json().get("datos", [])
-                    return render_template(
-                        "distribuciones_presupuesto.html",
-                        distribuciones_presupuesto=distribuciones_presupuesto,
-                        distribucion=distribucion,
-                        distribucion_presupuesto=distribucion_presupuesto,
-                        proyectos=proyectos,
-                        presupuesto=presupuesto,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                distribucion_presupuesto = datos[0]
+                distribuciones_presupuesto = cliente_api.obtener_datos(API_URL)
+                presupuesto = cliente_api.obtener_columnas(API_PRESUPUESTO, COLUMNAS_PRESUPUESTO)
+                proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+                distribucion = cliente_api.obtener_datos(API_DISTRIBUCION)
+                return render_template(
+                    "distribuciones_presupuesto.html",
+                    distribuciones_presupuesto=distribuciones_presupuesto,
+                    distribucion=distribucion,
+                    distribucion_presupuesto=distribucion_presupuesto,
+                    proyectos=proyectos,
+                    presupuesto=presupuesto,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    distribuciones_presupuesto = requests.get(API_URL).json().get("datos", [])
+    distribuciones_presupuesto = cliente_api.obtener_datos(API_URL)
     return render_template(
         "distribuciones_presupuesto.html",
         distribuciones_presupuesto=distribuciones_presupuesto,
@@ -79,7 +81,7 @@ def crear_distribucion_presupuesto():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la distribución de presupuesto: {e}"
 
@@ -96,7 +98,7 @@ def actualizar_distribucion_presupuesto():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la distribución de presupuesto: {e}"
 
@@ -106,7 +108,7 @@ def actualizar_distribucion_presupuesto():
 @rutas_distribucion_presupuesto.route("/distribucion_presupuesto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_distribucion_presupuesto(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar la distribución de presupuesto: {e}"
 
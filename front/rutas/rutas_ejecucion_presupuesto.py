@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 rutas_ejecucion_presupuesto = Blueprint("rutas_ejecucion_presupuesto", __name__)
 
@@ -7,12 +7,15 @@ rutas_ejecucion_presupuesto = Blueprint("rutas_ejecucion_presupuesto", __name__)
 API_URL = "http://localhost:5031/api/ejecucion_presupuesto"
 API_PRESUPUESTO = "http://localhost:5031/api/presupuesto"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_PRESUPUESTO = ["id", "periodo_anio"]
+
 # ------------------- LISTAR -------------------
 @rutas_ejecucion_presupuesto.route("/ejecucion_presupuesto")
 def ejecucion_presupuesto():
     try:
-        ejecuciones = requests.get(API_URL).json().get("datos", [])
-        presupuestos = requests.get(API_PRESUPUESTO).json().get("datos", [])
+        ejecuciones = cliente_api.obtener_datos(API_URL)
+        presupuestos = cliente_api.obtener_columnas(API_PRESUPUESTO, COLUMNAS_PRESUPUESTO)
     except Exception as e:
         ejecuciones, presupuestos = [], []
         print("Error al conectar con la API:", e)
@@ -29,27 +32,25 @@ def ejecucion_presupuesto():
 @rutas_ejecucion_presupuesto.route("/ejecucion_presupuesto/buscar", methods=["POST"])
 def buscar_ejecucion_presupuesto():
     codigo = request.form.get("codigo_buscar")
-    presupuestos = requests.get(API_PRESUPUESTO).json().get("datos", [])
+    presupuestos = cliente_api.obtener_columnas(API_PRESUPUESTO, COLUMNAS_PRESUPUESTO)
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    ejecucion = datos[0]
-                    ejecuciones = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "ejecuciones_presupuesto.html",
-                        ejecuciones_presupuesto=ejecuciones,
-                        ejecucion_presupuesto=ejecucion,
-                        presupuestos=presupuestos,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                ejecucion = datos[0]
+                ejecuciones = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "ejecuciones_presupuesto.html",
+                    ejecuciones_presupuesto=ejecuciones,
+                    ejecucion_presupuesto=ejecucion,
+                    presupuestos=presupuestos,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    ejecuciones = requests.get(API_URL).json().get("datos", [])
+    ejecuciones = cliente_api.obtener_datos(API_URL)
     return render_template(
         "ejecuciones_presupuesto.html",
         ejecuciones_presupuesto=ejecuciones,
@@ -71,7 +72,7 @@ def crear_ejecucion_presupuesto():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la ejecución: {e}"
 
@@ -90,7 +91,7 @@ def actualizar_ejecucion_presupuesto():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar: {e}"
 
@@ -100,7 +101,7 @@ def actualizar_ejecucion_presupuesto():
 @rutas_ejecucion_presupuesto.route("/ejecucion_presupuesto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_ejecucion_presupuesto(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar: {e}"
 
@@ -1,7 +1,7 @@
-# Importar módulos necesarios de Flask y la librería requests para conectarse a la API externa
+# Importar módulos necesarios de Flask y el cliente compartido para conectarse a la API externa
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import busqueda, cliente_api
 
 # Crear el Blueprint de entregables
 rutas_entregable = Blueprint("rutas_entregable", __name__)
@@ -27,17 +27,22 @@ def formatear_fecha(fecha_str):
 @rutas_entregable.route("/entregable")
 def entregable():
     try:
-        respuesta = requests.get(API_URL)
-        entregables = respuesta.json().get("datos", [])
+        entregables = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         entregables = []
         print("Error al conectar con la API:", e)
 
+    # Búsqueda de texto libre (?texto=)
+    texto = request.args.get("texto", "").strip()
+    if texto:
+        entregables = busqueda.buscar("entregable", entregables, texto)
+
     return render_template(
         "entregables.html",
         entregables=entregables,
         entregable=None,
-        modo="crear"
+        modo="crear",
+        texto=texto
     )
 
 
@@ -48,26 +53,24 @@ def buscar_entregable():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    entregable = datos[0]
-                    entregable["fecha_inicio"] = formatear_fecha(entregable.get("fecha_inicio"))
-                    entregable["fecha_fin_prevista"] = formatear_fecha(entregable.get("fecha_fin_prevista"))
-                    entregable["fecha_modificacion"] = formatear_fecha(entregable.get("fecha_modificacion"))
-                    entregable["fecha_finalizacion"] = formatear_fecha(entregable.get("fecha_finalizacion"))
-                    entregables = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "entregables.html",
-                        entregables=entregables,
-                        entregable=entregable,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                entregable = dict(datos[0])
+                entregable["fecha_inicio"] = formatear_fecha(entregable.get("fecha_inicio"))
+                entregable["fecha_fin_prevista"] = formatear_fecha(entregable.get("fecha_fin_prevista"))
+                entregable["fecha_modificacion"] = formatear_fecha(entregable.get("fecha_modificacion"))
+                entregable["fecha_finalizacion"] = formatear_fecha(entregable.get("fecha_finalizacion"))
+                entregables = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "entregables.html",
+                    entregables=entregables,
+                    entregable=entregable,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    entregables = requests.get(API_URL).json().get("datos", [])
+    entregables = cliente_api.obtener_datos(API_URL)
     return render_template(
         "entregables.html",
         entregables=entregables,
@@ -90,7 +93,7 @@ def crear_entregable():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear el entregable: {e}"
 
@@ -111,7 +114,7 @@ def actualizar_entregable():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar entregable: {e}"
 
@@ -121,7 +124,7 @@ def actualizar_entregable():
 @rutas_entregable.route("/entregable/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_entregable(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar entregable: {e}"
 
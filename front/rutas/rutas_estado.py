@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de estado
 rutas_estado = Blueprint("rutas_estado", __name__)
@@ -11,8 +11,7 @@ API_URL = "http://localhost:5031/api/estado"
 @rutas_estado.route("/estado")
 def estado():
     try:
-        respuesta = requests.get(API_URL)
-        estados = respuesta.json().get("datos", [])
+        estados = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         estados = []
         print("Error al conectar con la API:", e)
@@ -31,22 +30,20 @@ def buscar_estado():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    estado = datos[0]
-                    estados = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "estados.html",
-                        estados=estados,
-                        estado=estado,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                estado = datos[0]
+                estados = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "estados.html",
+                    estados=estados,
+                    estado=estado,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    estados = requests.get(API_URL).json().get("datos", [])
+    estados = cliente_api.obtener_datos(API_URL)
     return render_template(
         "estados.html",
         estados=estados,
@@ -64,7 +61,7 @@ def crear_estado():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear el estado: {e}"
 
@@ -80,7 +77,7 @@ def actualizar_estado():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar estado: {e}"
 
@@ -90,7 +87,7 @@ def actualizar_estado():
 @rutas_estado.route("/estado/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_estado(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar estado: {e}"
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de estado_proyecto
 rutas_estado_proyecto = Blueprint("rutas_estado_proyecto", __name__)
@@ -10,14 +10,18 @@ API_PROYECTO = "http://localhost:5031/api/proyecto"
 API_ESTADO = "http://localhost:5031/api/estado"
 API_ESTADO_PROYECTO = "http://localhost:5031/api/view_estado_proyecto"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_PROYECTO = ["id", "titulo"]
+COLUMNAS_ESTADO = ["id", "nombre"]
+
 # ------------------- LISTAR estado_proyecto -------------------
 @rutas_estado_proyecto.route("/estado_proyecto")
 def estado_proyecto():
     try:
-        estado_proyectos = requests.get(API_URL).json().get("datos", [])
-        proyectos = requests.get(API_PROYECTO).json().get("datos", [])
-        estado = requests.get(API_ESTADO).json().get("datos", [])
-        estado_view = requests.get(API_ESTADO_PROYECTO).json().get("datos", [])
+        estado_proyectos = cliente_api.obtener_datos(API_URL)
+        proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+        estado = cliente_api.obtener_columnas(API_ESTADO, COLUMNAS_ESTADO)
+        estado_view = cliente_api.obtener_datos(API_ESTADO_PROYECTO)
     except Exception as e:
         estado_proyectos, proyectos, estado, estado_view= [], [], [], []
         print("Error al conectar con la API:", e)
@@ -39,26 +43,24 @@ def buscar_estado_proyecto():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id_proyecto/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    estado_proyecto = datos[0]
-                    estado_proyectos = requests.get(API_URL).json().get("datos", [])
-                    proyectos = requests.get(API_PROYECTO).json().get("datos", [])
-                    estado = requests.get(API_ESTADO).json().get("datos", [])
-                    estado_view = requests.get(API_ESTADO_PROYECTO).json().get("datos", [])
-                    return render_template(
-                        "estado_proyecto.html",
-                        estado_view=estado_view,
-                        estado_proyecto=estado_proyecto,
-                        proyectos=proyectos,
-                        estado=estado,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id_proyecto/{codigo}")
+            if datos:
+                estado_proyecto = datos[0]
+                estado_proyectos = cliente_api.obtener_datos(API_URL)
+                proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+                estado = cliente_api.obtener_columnas(API_ESTADO, COLUMNAS_ESTADO)
+                estado_view = cliente_api.obtener_datos(API_ESTADO_PROYECTO)
+                return render_template(
+                    "estado_proyecto.html",
+                    estado_view=estado_view,
+                    estado_proyecto=estado_proyecto,
+                    proyectos=proyectos,
+                    estado=estado,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
-    estado_proyectos = requests.get(API_URL).json().get("datos", [])
+    estado_proyectos = cliente_api.obtener_datos(API_URL)
     return render_template(
         "estado_proyecto.html",
         estado_proyectos=estado_proyectos,
@@ -75,7 +77,7 @@ def crear_estado_proyecto():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la relación estado-proyecto: {e}"
 
@@ -91,7 +93,7 @@ def actualizar_estado_proyecto():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la relación estado-proyecto: {e}"
 
@@ -101,7 +103,7 @@ def actualizar_estado_proyecto():
 @rutas_estado_proyecto.route("/estado_proyecto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_estado_proyecto(codigo):
     try:
-        requests.delete(f"{API_URL}/id_proyecto/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id_proyecto/{codigo}")
     except Exception as e:
         return f"Error al eliminar la relación estado-proyecto: {e}"
 
@@ -0,0 +1,67 @@
+from flask import Blueprint, render_template, request, redirect, url_for, abort, send_file
+from servicios import cliente_api, informes, validacion
+
+# Crear el Blueprint de los informes de estado por proyecto
+rutas_informes = Blueprint("rutas_informes", __name__)
+
+API_PROYECTO = "http://localhost:5031/api/proyecto"
+
+# Columnas que usa la lista de proyectos
+COLUMNAS_PROYECTO = ["id", "codigo", "titulo"]
+
+# ------------------- LISTAR informes -------------------
+@rutas_informes.route("/informes")
+def informes_lista():
+    try:
+        proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+    except Exception as e:
+        proyectos = []
+        print("Error al conectar con la API:", e)
+
+    # El estado de cada informe sale de los archivos generados, no de la
+    # caché de listados: la página no lleva ETag
+    validacion.sin_validador()
+    ids = [p["id"] for p in proyectos]
+    return render_template(
+        "informes.html",
+        proyectos=proyectos,
+        estados=informes.estados(ids),
+        con_pdf=informes.con_pdf(ids),
+        mensaje=request.args.get("mensaje")
+    )
+
+# ------------------- VER informe de un proyecto -------------------
+@rutas_informes.route("/informes/proyecto/<int:id_proyecto>")
+def informe_proyecto(id_proyecto):
+    """
+    Sirve el informe ya generado. Si está desactualizado encola su
+    regeneración y mientras tanto sirve el anterior; si nunca se generó,
+    la encola y vuelve a la lista.
+    """
+    formato = "pdf" if request.args.get("formato") == "pdf" else "html"
+    estado = informes.estados([id_proyecto])[id_proyecto]
+    if estado != "vigente":
+        try:
+            id_trabajo = informes.solicitar(id_proyecto)
+        except Exception as e:
+            return f"Error al encolar el informe: {e}"
+        if estado == "sin_generar":
+            return redirect(url_for("rutas_informes.informes_lista",
+                                    mensaje=f"El informe del proyecto {id_proyecto} se está generando (trabajo {id_trabajo})"))
+
+    camino = informes.camino(id_proyecto, formato)
+    try:
+        return send_file(camino, as_attachment=formato == "pdf", download_name=f"informe-proyecto-{id_proyecto}.{formato}")
+    except FileNotFoundError:
+        abort(404)
+
+# ------------------- GENERAR informes -------------------
+@rutas_informes.route("/informes/generar", methods=["POST"])
+def generar_informes():
+    """Encola la generación de todos los informes (solo se renderizan los que cambiaron)."""
+    try:
+        id_trabajo = informes.solicitar()
+    except Exception as e:
+        return f"Error al encolar los informes: {e}"
+
+    return redirect(url_for("rutas_trabajos.trabajos_lista", nuevo=id_trabajo))
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for, session
-import requests
+from servicios import cliente_api, contrasenas, limites
 
 rutas_login = Blueprint("rutas_login", __name__)
 API_URL = "http://localhost:5031/api/usuario"
@@ -11,14 +11,29 @@ def login():
         email = request.form.get("email")
         contrasena = request.form.get("contrasena")
 
+        # Límite de intentos por IP y por email, antes de llamar a la API o verificar hashes
+        espera = limites.intento_login(request.remote_addr, email)
+        if espera:
+            error = f"Demasiados intentos de inicio de sesión. Intente de nuevo en {espera} segundos."
+            return render_template("login.html", error=error), 429, {"Retry-After": str(espera)}
+
+        # Solo los registros con ese email, leídos de la API y no de la caché
+        # de listados: un cambio de contraseña o un usuario eliminado cuentan
+        # desde ya, lo haya hecho este worker u otro
         try:
-            respuesta = requests.get(API_URL)
-            usuarios = respuesta.json().get("datos", [])
+            usuarios = cliente_api.filtrar(API_URL, {"email": email}) if email else []
         except Exception as e:
             return render_template("login.html", error=f"Error conectando con la API: {e}")
 
+        # La verificación del hash corre en el pool de contraseñas
         for user in usuarios:
-            if user["email"] == email and user["contrasena"] == contrasena:
+            if user["email"] != email:
+                continue
+            try:
+                correcta = contrasenas.verificar(user["contrasena"], contrasena)
+            except contrasenas.Saturado as e:
+                return render_template("login.html", error=str(e)), 503
+            if correcta:
                 session["usuario"] = user
                 return redirect(url_for("inicio"))
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de meta_estrategica
 rutas_meta_estrategica = Blueprint("rutas_meta_estrategica", __name__)
@@ -8,12 +8,15 @@ rutas_meta_estrategica = Blueprint("rutas_meta_estrategica", __name__)
 API_URL = "http://localhost:5031/api/meta_estrategica"
 API_OBJETIVO_ESTRATEGICO = "http://localhost:5031/api/objetivo_estrategico"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_OBJETIVO_ESTRATEGICO = ["id", "titulo"]
+
 # ------------------- LISTAR meta_estrategica -------------------
 @rutas_meta_estrategica.route("/meta_estrategica")
 def meta_estrategica():
     try:
-        metas_estrategicas = requests.get(API_URL).json().get("datos", [])
-        objetivo_estrategico = requests.get(API_OBJETIVO_ESTRATEGICO).json().get("datos", [])
+        metas_estrategicas = cliente_api.obtener_datos(API_URL)
+        objetivo_estrategico = cliente_api.obtener_columnas(API_OBJETIVO_ESTRATEGICO, COLUMNAS_OBJETIVO_ESTRATEGICO)
     except Exception as e:
         metas_estrategicas, objetivo_estrategico = [], []
         print("Error al conectar con la API:", e)
@@ -33,24 +36,22 @@ def buscar_meta_estrategica():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    meta_estrategica = datos[0]
-                    metas_estrategicas = requests.get(API_URL).json().get("datos", [])
-                    objetivo_estrategico = requests.get(API_OBJETIVO_ESTRATEGICO).json().get("datos", [])
-                    return render_template(
-                        "meta_estrategica.html",
-                        metas_estrategicas=metas_estrategicas,
-                        meta_estrategica=meta_estrategica,
-                        objetivo_estrategico=objetivo_estrategico,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                meta_estrategica = datos[0]
+                metas_estrategicas = cliente_api.obtener_datos(API_URL)
+                objetivo_estrategico = cliente_api.obtener_columnas(API_OBJETIVO_ESTRATEGICO, COLUMNAS_OBJETIVO_ESTRATEGICO)
+                return render_template(
+                    "meta_estrategica.html",
+                    metas_estrategicas=metas_estrategicas,
+                    meta_estrategica=meta_estrategica,
+                    objetivo_estrategico=objetivo_estrategico,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    metas_estrategicas = requests.get(API_URL).json().get("datos", [])
+    metas_estrategicas = cliente_api.obtener_datos(API_URL)
     return render_template(
         "meta_estrategica.html",
         metas_estrategicas=metas_estrategicas,
@@ -68,7 +69,7 @@ def crear_meta_estrategica():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la meta estratégica: {e}"
 
@@ -84,7 +85,7 @@ def actualizar_meta_estrategica():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la meta estratégica: {e}"
 
@@ -94,7 +95,7 @@ def actualizar_meta_estrategica():
 @rutas_meta_estrategica.route("/meta_estrategica/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_meta_estrategica(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar la meta estratégica: {e}"
 
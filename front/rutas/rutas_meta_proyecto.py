@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import cliente_api
 
 # Crear el Blueprint de meta_proyecto
 rutas_meta_proyecto = Blueprint("rutas_meta_proyecto", __name__)
@@ -11,6 +11,10 @@ API_META_ESTRATEGICA = "http://localhost:5031/api/meta_estrategica"
 API_PROYECTO = "http://localhost:5031/api/proyecto"
 API_METAPROYECTO_VIEW = "http://localhost:5031/api/view_meta_proyecto"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_META_ESTRATEGICA = ["id", "titulo"]
+COLUMNAS_PROYECTO = ["id", "titulo"]
+
 def formatear_fecha(fecha_str):
     """
     Convierte una fecha a formato YYYY-MM-DD compatible con <input type="date">.
@@ -29,10 +33,10 @@ def formatear_fecha(fecha_str):
 @rutas_meta_proyecto.route("/meta_proyecto")
 def meta_proyecto():
     try:
-        metas_proyecto = requests.get(API_URL).json().get("datos", [])
-        metas_estrategica = requests.get(API_META_ESTRATEGICA).json().get("datos", [])
-        proyectos = requests.get(API_PROYECTO).json().get("datos", [])
-        meta_proyecto_view = requests.get(API_METAPROYECTO_VIEW).json().get("datos", [])
+        metas_proyecto = cliente_api.obtener_datos(API_URL)
+        metas_estrategica = cliente_api.obtener_columnas(API_META_ESTRATEGICA, COLUMNAS_META_ESTRATEGICA)
+        proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+        meta_proyecto_view = cliente_api.obtener_datos(API_METAPROYECTO_VIEW)
     except Exception as e:
         metas_proyecto, metas_estrategica, proyectos, meta_proyecto_view= [], [], [], []
         print("Error al conectar con la API:", e)
@@ -54,29 +58,27 @@ def buscar_meta_proyecto():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id_meta/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    datos[0]["fecha_asociacion"] = formatear_fecha(datos[0].get("fecha_asociacion"))
-                    meta_proyecto = datos[0]
-                    metas_proyecto = requests.get(API_URL).json().get("datos", [])
-                    metas_estrategica = requests.get(API_META_ESTRATEGICA).json().get("datos", [])
-                    proyectos = requests.get(API_PROYECTO).json().get("datos", [])
-                    meta_proyecto_view = requests.get(API_METAPROYECTO_VIEW).json().get("datos", [])
-                    return render_template(
-                        "meta_proyecto.html",
-                        meta_proyecto_view=meta_proyecto_view,
-                        metas_proyecto=metas_proyecto,
-                        meta_proyecto=meta_proyecto,
-                        metas_estrategica=metas_estrategica,
-                        proyectos=proyectos,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id_meta/{codigo}")
+            if datos:
+                meta_proyecto = dict(datos[0])
+                meta_proyecto["fecha_asociacion"] = formatear_fecha(meta_proyecto.get("fecha_asociacion"))
+                metas_proyecto = cliente_api.obtener_datos(API_URL)
+                metas_estrategica = cliente_api.obtener_columnas(API_META_ESTRATEGICA, COLUMNAS_META_ESTRATEGICA)
+                proyectos = cliente_api.obtener_columnas(API_PROYECTO, COLUMNAS_PROYECTO)
+                meta_proyecto_view = cliente_api.obtener_datos(API_METAPROYECTO_VIEW)
+                return render_template(
+                    "meta_proyecto.html",
+                    meta_proyecto_view=meta_proyecto_view,
+                    metas_proyecto=metas_proyecto,
+                    meta_proyecto=meta_proyecto,
+                    metas_estrategica=metas_estrategica,
+                    proyectos=proyectos,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    metas_proyecto = requests.get(API_URL).json().get("datos", [])
+    metas_proyecto = cliente_api.obtener_datos(API_URL)
     return render_template(
         "meta_proyecto.html",
         metas_proyecto=metas_proyecto,
@@ -95,7 +97,7 @@ def crear_meta_proyecto():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la relación meta-proyecto: {e}"
 
@@ -112,7 +114,7 @@ def actualizar_meta_proyecto():
     }
 
     try:
-        requests.put(f"{API_URL}/id_meta/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id_meta/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la relación meta-proyecto: {e}"
 
@@ -122,7 +124,7 @@ def actualizar_meta_proyecto():
 @rutas_meta_proyecto.route("/meta_proyecto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_meta_proyecto(codigo):
     try:
-        requests.delete(f"{API_URL}/id_meta/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id_meta/{codigo}")
     except Exception as e:
         return f"Error al eliminar la relación meta-proyecto: {e}"
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint
 rutas_objetivo_estrategico = Blueprint("rutas_objetivo_estrategico", __name__)
@@ -11,8 +11,7 @@ API_URL = "http://localhost:5031/api/objetivo_estrategico"
 @rutas_objetivo_estrategico.route("/objetivo_estrategico")
 def objetivo_estrategico():
     try:
-        respuesta = requests.get(API_URL)
-        objetivos = respuesta.json().get("datos", [])
+        objetivos = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         objetivos = []
         print("Error al conectar con la API:", e)
@@ -31,24 +30,22 @@ def buscar_objetivo_estrategico():
 
     if id_buscar:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{id_buscar}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    objetivo = datos[0]
-                    objetivos = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "objetivo_estrategico.html",
-                        objetivos=objetivos,
-                        objetivo=objetivo,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{id_buscar}")
+            if datos:
+                objetivo = datos[0]
+                objetivos = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "objetivo_estrategico.html",
+                    objetivos=objetivos,
+                    objetivo=objetivo,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
     # Si no se encuentra
     try:
-        objetivos = requests.get(API_URL).json().get("datos", [])
+        objetivos = cliente_api.obtener_datos(API_URL)
     except Exception:
         objetivos = []
 
@@ -69,7 +66,7 @@ def crear_objetivo_estrategico():
     }
 
     try:
-        respuesta = requests.post(API_URL, json=datos)
+        respuesta = cliente_api.crear(API_URL, datos)
         if respuesta.status_code >= 400:
             print("Error al crear:", respuesta.text)
     except Exception as e:
@@ -88,7 +85,7 @@ def actualizar_objetivo_estrategico():
     }
 
     try:
-        respuesta = requests.put(f"{API_URL}/id/{id_objetivo}", json=datos)
+        respuesta = cliente_api.actualizar(f"{API_URL}/id/{id_objetivo}", datos)
         if respuesta.status_code != 200:
             print("Error al actualizar:", respuesta.text)
     except Exception as e:
@@ -100,7 +97,7 @@ def actualizar_objetivo_estrategico():
 @rutas_objetivo_estrategico.route("/objetivo_estrategico/eliminar/<string:id_objetivo>", methods=["POST"])
 def eliminar_objetivo_estrategico(id_objetivo):
     try:
-        respuesta = requests.delete(f"{API_URL}/id/{id_objetivo}")
+        respuesta = cliente_api.eliminar(f"{API_URL}/id/{id_objetivo}")
         if respuesta.status_code >= 400:
             print("Error al eliminar:", respuesta.text)
     except Exception as e:
@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import busqueda, cliente_api
 
 # Crear el Blueprint de presupuesto
 rutas_presupuesto = Blueprint("rutas_presupuesto", __name__)
@@ -10,6 +10,10 @@ API_PRESUPUESTO_URL = "http://localhost:5031/api/presupuesto"
 API_PROYECTO_URL = "http://localhost:5031/api/proyecto"
 API_ESTADO_URL = "http://localhost:5031/api/estado"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_PROYECTO = ["id", "titulo"]
+COLUMNAS_ESTADO = ["id", "nombre"]
+
 
 def formatear_fecha(fecha_str):
     """
@@ -29,33 +33,38 @@ def formatear_fecha(fecha_str):
 @rutas_presupuesto.route("/presupuesto")
 def presupuesto():
     try:
-        respuesta = requests.get(API_PRESUPUESTO_URL)
-        presupuestos = respuesta.json().get("datos", [])
+        presupuestos = cliente_api.obtener_datos(API_PRESUPUESTO_URL)
     except Exception as e:
         presupuestos = []
         print("Error al conectar con la API de presupuesto:", e)
 
     # Obtener lista de proyectos
     try:
-        proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
+        proyectos = cliente_api.obtener_columnas(API_PROYECTO_URL, COLUMNAS_PROYECTO)
     except Exception as e:
         proyectos = []
         print("Error al conectar con la API de proyectos:", e)
 
     # Obtener lista de estados
     try:
-        estados = requests.get(API_ESTADO_URL).json().get("datos", [])
+        estados = cliente_api.obtener_columnas(API_ESTADO_URL, COLUMNAS_ESTADO)
     except Exception as e:
         estados = []
         print("Error al conectar con la API de estados:", e)
 
+    # Búsqueda de texto libre (?texto=)
+    texto = request.args.get("texto", "").strip()
+    if texto:
+        presupuestos = busqueda.buscar("presupuesto", presupuestos, texto)
+
     return render_template(
         "presupuesto.html",
         presupuestos=presupuestos,
         presupuesto=None,
         proyectos=proyectos,
         estados=estados,
-        modo="crear"
+        modo="crear",
+        texto=texto
     )
 
 # ------------------- BUSCAR presupuesto -------------------
@@ -65,30 +74,28 @@ def buscar_presupuesto():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_PRESUPUESTO_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    presupuesto = datos[0]
-                    presupuestos = requests.get(API_PRESUPUESTO_URL).json().get("datos", [])
-                    proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
-                    estados = requests.get(API_ESTADO_URL).json().get("datos", [])
-                    presupuesto["fecha_solicitud"] = formatear_fecha(datos[0].get("fecha_solicitud"))
-                    presupuesto["fecha_aprobacion"] = formatear_fecha(datos[0].get("fecha_aprobacion"))
-                    return render_template(
-                        "presupuesto.html",
-                        presupuestos=presupuestos,
-                        presupuesto=presupuesto,
-                        proyectos=proyectos,
-                        estados=estados,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_PRESUPUESTO_URL}/id/{codigo}")
+            if datos:
+                presupuesto = dict(datos[0])
+                presupuestos = cliente_api.obtener_datos(API_PRESUPUESTO_URL)
+                proyectos = cliente_api.obtener_columnas(API_PROYECTO_URL, COLUMNAS_PROYECTO)
+                estados = cliente_api.obtener_columnas(API_ESTADO_URL, COLUMNAS_ESTADO)
+                presupuesto["fecha_solicitud"] = formatear_fecha(datos[0].get("fecha_solicitud"))
+                presupuesto["fecha_aprobacion"] = formatear_fecha(datos[0].get("fecha_aprobacion"))
+                return render_template(
+                    "presupuesto.html",
+                    presupuestos=presupuestos,
+                    presupuesto=presupuesto,
+                    proyectos=proyectos,
+                    estados=estados,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    presupuestos = requests.get(API_PRESUPUESTO_URL).json().get("datos", [])
-    proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
-    estados = requests.get(API_ESTADO_URL).json().get("datos", [])
+    presupuestos = cliente_api.obtener_datos(API_PRESUPUESTO_URL)
+    proyectos = cliente_api.obtener_columnas(API_PROYECTO_URL, COLUMNAS_PROYECTO)
+    estados = cliente_api.obtener_columnas(API_ESTADO_URL, COLUMNAS_ESTADO)
 
     return render_template(
         "presupuesto.html",
@@ -115,7 +122,7 @@ def crear_presupuesto():
     }
 
     try:
-        requests.post(API_PRESUPUESTO_URL, json=datos)
+        cliente_api.crear(API_PRESUPUESTO_URL, datos)
     except Exception as e:
         return f"Error al crear el presupuesto: {e}"
 
@@ -138,7 +145,7 @@ def actualizar_presupuesto():
     }
 
     try:
-        requests.put(f"{API_PRESUPUESTO_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_PRESUPUESTO_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar presupuesto: {e}"
 
@@ -148,7 +155,7 @@ def actualizar_presupuesto():
 @rutas_presupuesto.route("/presupuesto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_presupuesto(codigo):
     try:
-        requests.delete(f"{API_PRESUPUESTO_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_PRESUPUESTO_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar presupuesto: {e}"
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import busqueda, cliente_api
 
 # Crear el Blueprint
 rutas_producto = Blueprint("rutas_producto", __name__)
@@ -8,28 +8,37 @@ rutas_producto = Blueprint("rutas_producto", __name__)
 API_URL_PRODUCTO = "http://localhost:5031/api/producto"
 API_URL_TIPO_PRODUCTO = "http://localhost:5031/api/tipo_producto"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_TIPO_PRODUCTO = ["id", "nombre"]
+
 
 # ------------------- LISTAR PRODUCTOS -------------------
 @rutas_producto.route("/producto")
 def producto():
     try:
-        productos = requests.get(API_URL_PRODUCTO).json().get("datos", [])
+        productos = cliente_api.obtener_datos(API_URL_PRODUCTO)
     except Exception as e:
         productos = []
         print("Error al conectar con la API de productos:", e)
 
     try:
-        tipos = requests.get(API_URL_TIPO_PRODUCTO).json().get("datos", [])
+        tipos = cliente_api.obtener_columnas(API_URL_TIPO_PRODUCTO, COLUMNAS_TIPO_PRODUCTO)
     except Exception as e:
         tipos = []
         print("Error al conectar con la API de tipos de producto:", e)
 
+    # Búsqueda de texto libre (?texto=)
+    texto = request.args.get("texto", "").strip()
+    if texto:
+        productos = busqueda.buscar("producto", productos, texto)
+
     return render_template(
         "producto.html",
         productos=productos,
         producto=None,
         tipos=tipos,
-        modo="crear"
+        modo="crear",
+        texto=texto
     )
 
 
@@ -40,25 +49,23 @@ def buscar_producto():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL_PRODUCTO}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    producto = datos[0]
-                    productos = requests.get(API_URL_PRODUCTO).json().get("datos", [])
-                    tipos = requests.get(API_URL_TIPO_PRODUCTO).json().get("datos", [])
-                    return render_template(
-                        "producto.html",
-                        productos=productos,
-                        producto=producto,
-                        tipos=tipos,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL_PRODUCTO}/id/{codigo}")
+            if datos:
+                producto = datos[0]
+                productos = cliente_api.obtener_datos(API_URL_PRODUCTO)
+                tipos = cliente_api.obtener_columnas(API_URL_TIPO_PRODUCTO, COLUMNAS_TIPO_PRODUCTO)
+                return render_template(
+                    "producto.html",
+                    productos=productos,
+                    producto=producto,
+                    tipos=tipos,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    productos = requests.get(API_URL_PRODUCTO).json().get("datos", [])
-    tipos = requests.get(API_URL_TIPO_PRODUCTO).json().get("datos", [])
+    productos = cliente_api.obtener_datos(API_URL_PRODUCTO)
+    tipos = cliente_api.obtener_columnas(API_URL_TIPO_PRODUCTO, COLUMNAS_TIPO_PRODUCTO)
     return render_template(
         "producto.html",
         productos=productos,
@@ -83,7 +90,7 @@ def crear_producto():
     }
 
     try:
-        requests.post(API_URL_PRODUCTO, json=datos)
+        cliente_api.crear(API_URL_PRODUCTO, datos)
     except Exception as e:
         return f"Error al crear producto: {e}"
 
@@ -108,7 +115,7 @@ def actualizar_producto():
     }
 
     try:
-        requests.put(f"{API_URL_PRODUCTO}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL_PRODUCTO}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar producto: {e}"
 
@@ -119,7 +126,7 @@ def actualizar_producto():
 @rutas_producto.route("/producto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_producto(codigo):
     try:
-        requests.delete(f"{API_URL_PRODUCTO}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL_PRODUCTO}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar producto: {e}"
 
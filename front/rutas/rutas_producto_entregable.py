@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import cliente_api
 
 rutas_producto_entregable = Blueprint("rutas_producto_entregable", __name__)
 
@@ -10,6 +10,10 @@ API_PRODUCTO_URL = "http://localhost:5031/api/producto"
 API_ENTREGABLE_URL = "http://localhost:5031/api/entregable"
 API_PRODUCTO_VIEW = "http://localhost:5031/api/view_producto_entregable"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_PRODUCTO = ["id", "titulo"]
+COLUMNAS_ENTREGABLE = ["id", "titulo"]
+
 def formatear_fecha(fecha_str):
     """
     Convierte una fecha a formato YYYY-MM-DD compatible con <input type="date">.
@@ -27,10 +31,10 @@ def formatear_fecha(fecha_str):
 @rutas_producto_entregable.route("/producto_entregable")
 def producto_entregable():
     try:
-        asociaciones = requests.get(API_PRODUCTO_ENTREGABLE_URL).json().get("datos", [])
-        productos = requests.get(API_PRODUCTO_URL).json().get("datos", [])
-        entregables = requests.get(API_ENTREGABLE_URL).json().get("datos", [])
-        producto_view = requests.get(API_PRODUCTO_VIEW).json().get("datos", [])
+        asociaciones = cliente_api.obtener_datos(API_PRODUCTO_ENTREGABLE_URL)
+        productos = cliente_api.obtener_columnas(API_PRODUCTO_URL, COLUMNAS_PRODUCTO)
+        entregables = cliente_api.obtener_columnas(API_ENTREGABLE_URL, COLUMNAS_ENTREGABLE)
+        producto_view = cliente_api.obtener_datos(API_PRODUCTO_VIEW)
     except Exception as e:
         asociaciones, productos, entregables, producto_view= [], [], [], []
         print("Error al conectar con la API:", e)
@@ -52,25 +56,23 @@ def buscar_producto_entregable():
     id_buscar = request.form.get("codigo_buscar")
 
     try:
-        respuesta = requests.get(f"{API_PRODUCTO_ENTREGABLE_URL}/id_producto/{id_buscar}")
-        if respuesta.status_code == 200:
-            datos = respuesta.json().get("datos", [])
-            if datos:
-                asociacion = datos[0]
-                asociacion["fecha_asociacion"] = formatear_fecha(asociacion.get("fecha_asociacion"))
-                asociaciones = requests.get(API_PRODUCTO_ENTREGABLE_URL).json().get("datos", [])
-                productos = requests.get(API_PRODUCTO_URL).json().get("datos", [])
-                entregables = requests.get(API_ENTREGABLE_URL).json().get("datos", [])
-                producto_view = requests.get(API_PRODUCTO_VIEW).json().get("datos", [])
-                return render_template(
-                    "producto_entregable.html",
-                    producto_view=producto_view,
-                    asociaciones=asociaciones,
-                    asociacion=asociacion,
-                    productos=productos,
-                    entregables=entregables,
-                    modo="actualizar"
-                )
+        datos = cliente_api.obtener_datos(f"{API_PRODUCTO_ENTREGABLE_URL}/id_producto/{id_buscar}")
+        if datos:
+            asociacion = dict(datos[0])
+            asociacion["fecha_asociacion"] = formatear_fecha(asociacion.get("fecha_asociacion"))
+            asociaciones = cliente_api.obtener_datos(API_PRODUCTO_ENTREGABLE_URL)
+            productos = cliente_api.obtener_columnas(API_PRODUCTO_URL, COLUMNAS_PRODUCTO)
+            entregables = cliente_api.obtener_columnas(API_ENTREGABLE_URL, COLUMNAS_ENTREGABLE)
+            producto_view = cliente_api.obtener_datos(API_PRODUCTO_VIEW)
+            return render_template(
+                "producto_entregable.html",
+                producto_view=producto_view,
+                asociaciones=asociaciones,
+                asociacion=asociacion,
+                productos=productos,
+                entregables=entregables,
+                modo="actualizar"
+            )
     except Exception as e:
         print("Error al buscar asociación:", e)
 
@@ -87,7 +89,7 @@ def crear_producto_entregable():
     }
 
     try:
-        requests.post(API_PRODUCTO_ENTREGABLE_URL, json=datos)
+        cliente_api.crear(API_PRODUCTO_ENTREGABLE_URL, datos)
     except Exception as e:
         print("Error al crear asociación:", e)
 
@@ -105,7 +107,7 @@ def actualizar_producto_entregable():
     }
 
     try:
-        requests.put(f"{API_PRODUCTO_ENTREGABLE_URL}/id_producto/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_PRODUCTO_ENTREGABLE_URL}/id_producto/{codigo}", datos)
     except Exception as e:
         print("Error al actualizar asociación:", e)
 
@@ -116,7 +118,7 @@ def actualizar_producto_entregable():
 @rutas_producto_entregable.route("/producto_entregable/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_producto_entregable(codigo):
     try:
-        requests.delete(f"{API_PRODUCTO_ENTREGABLE_URL}/id_producto/{codigo}")
+        cliente_api.eliminar(f"{API_PRODUCTO_ENTREGABLE_URL}/id_producto/{codigo}")
     except Exception as e:
         print("Error al eliminar asociación:", e)
 
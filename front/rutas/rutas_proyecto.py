@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import busqueda, cliente_api
 
 rutas_proyecto = Blueprint("rutas_proyecto", __name__)
 
@@ -9,6 +9,10 @@ API_PROYECTO_URL = "http://localhost:5031/api/proyecto"
 API_TIPO_PROYECTO_URL = "http://localhost:5031/api/tipo_proyecto"
 API_USUARIO_URL = "http://localhost:5031/api/usuario"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_TIPO_PROYECTO = ["id", "nombre"]
+COLUMNAS_USUARIO = ["id", "email"]
+
 def formatear_fecha(fecha_str):
     """
     Convierte una fecha a formato YYYY-MM-DD compatible con <input type="date">.
@@ -28,28 +32,36 @@ def formatear_fecha(fecha_str):
 @rutas_proyecto.route("/proyecto")
 def proyecto():
     try:
-        proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
+        proyectos = cliente_api.obtener_datos(API_PROYECTO_URL)
     except Exception as e:
         print("Error al obtener proyectos:", e)
         proyectos = []
 
     try:
-        tipos = requests.get(API_TIPO_PROYECTO_URL).json().get("datos", [])
+        tipos = cliente_api.obtener_columnas(API_TIPO_PROYECTO_URL, COLUMNAS_TIPO_PROYECTO)
     except:
         tipos = []
 
     try:
-        usuarios = requests.get(API_USUARIO_URL).json().get("datos", [])
+        usuarios = cliente_api.obtener_columnas(API_USUARIO_URL, COLUMNAS_USUARIO)
     except:
         usuarios = []
 
+    # Búsqueda de texto libre (?texto=); el desplegable de proyecto padre sigue con todos
+    texto = request.args.get("texto", "").strip()
+    proyectos_padre = proyectos
+    if texto:
+        proyectos = busqueda.buscar("proyecto", proyectos, texto)
+
     return render_template(
         "proyecto.html",
         proyectos=proyectos,
         proyecto=None,
         tipos=tipos,
         usuarios=usuarios,
-        modo="crear"
+        modo="crear",
+        proyectos_padre=proyectos_padre,
+        texto=texto
     )
 
 # ------------------- BUSCAR PROYECTO -------------------
@@ -59,30 +71,28 @@ def buscar_proyecto():
 
     if id_buscar:
         try:
-            respuesta = requests.get(f"{API_PROYECTO_URL}/id/{id_buscar}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    proyecto = datos[0]
-                    proyecto["fecha_inicio"] = formatear_fecha(datos[0].get("fecha_inicio"))
-                    proyecto["fecha_fin_prevista"] = formatear_fecha(datos[0].get("fecha_fin_prevista"))
-                    proyecto["fecha_modificacion"] = formatear_fecha(datos[0].get("fecha_modificacion"))
-                    proyecto["fecha_finalizacion"] = formatear_fecha(datos[0].get("fecha_finalizacion"))
-                    proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
-                    tipos = requests.get(API_TIPO_PROYECTO_URL).json().get("datos", [])
-                    usuarios = requests.get(API_USUARIO_URL).json().get("datos", [])
-                    return render_template(
-                        "proyecto.html",
-                        proyectos=proyectos,
-                        proyecto=proyecto,
-                        tipos=tipos,
-                        usuarios=usuarios,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_PROYECTO_URL}/id/{id_buscar}")
+            if datos:
+                proyecto = dict(datos[0])
+                proyecto["fecha_inicio"] = formatear_fecha(datos[0].get("fecha_inicio"))
+                proyecto["fecha_fin_prevista"] = formatear_fecha(datos[0].get("fecha_fin_prevista"))
+                proyecto["fecha_modificacion"] = formatear_fecha(datos[0].get("fecha_modificacion"))
+                proyecto["fecha_finalizacion"] = formatear_fecha(datos[0].get("fecha_finalizacion"))
+                proyectos = cliente_api.obtener_datos(API_PROYECTO_URL)
+                tipos = cliente_api.obtener_columnas(API_TIPO_PROYECTO_URL, COLUMNAS_TIPO_PROYECTO)
+                usuarios = cliente_api.obtener_columnas(API_USUARIO_URL, COLUMNAS_USUARIO)
+                return render_template(
+                    "proyecto.html",
+                    proyectos=proyectos,
+                    proyecto=proyecto,
+                    tipos=tipos,
+                    usuarios=usuarios,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
+    proyectos = cliente_api.obtener_datos(API_PROYECTO_URL)
     return render_template(
         "proyecto.html",
         proyectos=proyectos,
@@ -109,7 +119,7 @@ def crear_proyecto():
     }
 
     try:
-        requests.post(API_PROYECTO_URL, json=datos)
+        cliente_api.crear(API_PROYECTO_URL, datos)
     except Exception as e:
         return f"Error al crear proyecto: {e}"
 
@@ -136,7 +146,7 @@ def actualizar_proyecto():
     }
 
     try:
-        requests.put(f"{API_PROYECTO_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_PROYECTO_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar proyecto: {e}"
 
@@ -146,7 +156,7 @@ def actualizar_proyecto():
 @rutas_proyecto.route("/proyecto/eliminar/<string:id>", methods=["POST"])
 def eliminar_proyecto(id):
     try:
-        requests.delete(f"{API_PROYECTO_URL}/id/{id}")
+        cliente_api.eliminar(f"{API_PROYECTO_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar proyecto: {e}"
 
@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import cliente_api
 
 rutas_proyecto_producto = Blueprint("rutas_proyecto_producto", __name__)
 
@@ -10,6 +10,10 @@ API_PROYECTO_URL = "http://localhost:5031/api/proyecto"
 API_PRODUCTO_URL = "http://localhost:5031/api/producto"
 API_PROYECTO_PRODUCTO_VIEW = "http://localhost:5031/api/view_proyecto_producto"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_PROYECTO = ["id", "titulo"]
+COLUMNAS_PRODUCTO = ["id", "titulo"]
+
 
 def formatear_fecha(fecha_str):
     if not fecha_str:
@@ -26,23 +30,23 @@ def formatear_fecha(fecha_str):
 @rutas_proyecto_producto.route("/proyecto_producto")
 def proyecto_producto():
     try:
-        asociaciones = requests.get(API_PROYECTO_PRODUCTO_URL).json().get("datos", [])
+        asociaciones = cliente_api.obtener_datos(API_PROYECTO_PRODUCTO_URL)
     except Exception as e:
         print("Error al cargar asociaciones:", e)
         asociaciones = []
 
     try:
-        proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
+        proyectos = cliente_api.obtener_columnas(API_PROYECTO_URL, COLUMNAS_PROYECTO)
     except Exception:
         proyectos = []
 
     try:
-        productos = requests.get(API_PRODUCTO_URL).json().get("datos", [])
+        productos = cliente_api.obtener_columnas(API_PRODUCTO_URL, COLUMNAS_PRODUCTO)
     except Exception:
         productos = []
         
     try:
-        proyecto_producto_view = requests.get(API_PROYECTO_PRODUCTO_VIEW).json().get("datos", [])
+        proyecto_producto_view = cliente_api.obtener_datos(API_PROYECTO_PRODUCTO_VIEW)
     except Exception:
         proyecto_producto_view = []
 
@@ -63,25 +67,23 @@ def buscar_proyecto_producto():
     id_buscar = request.form.get("codigo_buscar")
 
     try:
-        respuesta = requests.get(f"{API_PROYECTO_PRODUCTO_URL}/id_proyecto/{id_buscar}")
-        if respuesta.status_code == 200:
-            datos = respuesta.json().get("datos", [])
-            if datos:
-                asociacion = datos[0]
-                asociacion["fecha_asociacion"] = formatear_fecha(asociacion.get("fecha_asociacion"))
-                asociaciones = requests.get(API_PROYECTO_PRODUCTO_URL).json().get("datos", [])
-                proyectos = requests.get(API_PROYECTO_URL).json().get("datos", [])
-                productos = requests.get(API_PRODUCTO_URL).json().get("datos", [])
-                proyecto_producto_view = requests.get(API_PROYECTO_PRODUCTO_VIEW).json().get("datos", [])
-                return render_template(
-                    "proyecto_producto.html",
-                    proyecto_producto_view=proyecto_producto_view,
-                    asociaciones=asociaciones,
-                    asociacion=asociacion,
-                    proyectos=proyectos,
-                    productos=productos,
-                    modo="actualizar"
-                )
+        datos = cliente_api.obtener_datos(f"{API_PROYECTO_PRODUCTO_URL}/id_proyecto/{id_buscar}")
+        if datos:
+            asociacion = dict(datos[0])
+            asociacion["fecha_asociacion"] = formatear_fecha(asociacion.get("fecha_asociacion"))
+            asociaciones = cliente_api.obtener_datos(API_PROYECTO_PRODUCTO_URL)
+            proyectos = cliente_api.obtener_columnas(API_PROYECTO_URL, COLUMNAS_PROYECTO)
+            productos = cliente_api.obtener_columnas(API_PRODUCTO_URL, COLUMNAS_PRODUCTO)
+            proyecto_producto_view = cliente_api.obtener_datos(API_PROYECTO_PRODUCTO_VIEW)
+            return render_template(
+                "proyecto_producto.html",
+                proyecto_producto_view=proyecto_producto_view,
+                asociaciones=asociaciones,
+                asociacion=asociacion,
+                proyectos=proyectos,
+                productos=productos,
+                modo="actualizar"
+            )
     except Exception as e:
         print("Error al buscar asociación:", e)
 
@@ -98,7 +100,7 @@ def crear_proyecto_producto():
     }
 
     try:
-        requests.post(API_PROYECTO_PRODUCTO_URL, json=datos)
+        cliente_api.crear(API_PROYECTO_PRODUCTO_URL, datos)
     except Exception as e:
         print("Error al crear asociación:", e)
 
@@ -116,7 +118,7 @@ def actualizar_proyecto_producto():
     }
 
     try:
-        requests.put(f"{API_PROYECTO_PRODUCTO_URL}/id_proyecto/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_PROYECTO_PRODUCTO_URL}/id_proyecto/{codigo}", datos)
     except Exception as e:
         print("Error al actualizar asociación:", e)
 
@@ -127,7 +129,7 @@ def actualizar_proyecto_producto():
 @rutas_proyecto_producto.route("/proyecto_producto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_proyecto_producto(codigo):
     try:
-        requests.delete(f"{API_PROYECTO_PRODUCTO_URL}/id_proyecto/{codigo}")
+        cliente_api.eliminar(f"{API_PROYECTO_PRODUCTO_URL}/id_proyecto/{codigo}")
     except Exception as e:
         print("Error al eliminar asociación:", e)
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 rutas_responsable = Blueprint("rutas_responsable", __name__)
 
@@ -8,22 +8,26 @@ API_RESPONSABLE_URL = "http://localhost:5031/api/responsable"
 API_TIPO_RESPONSABLE_URL = "http://localhost:5031/api/tipo_responsable"
 API_USUARIO_URL = "http://localhost:5031/api/usuario"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_TIPO_RESPONSABLE = ["id", "titulo"]
+COLUMNAS_USUARIO = ["id", "email"]
+
 # ------------------- LISTAR responsables -------------------
 @rutas_responsable.route("/responsable")
 def responsable():
     try:
-        responsables = requests.get(API_RESPONSABLE_URL).json().get("datos", [])
+        responsables = cliente_api.obtener_datos(API_RESPONSABLE_URL)
     except Exception as e:
         print("Error al cargar responsables:", e)
         responsables = []
 
     try:
-        tipos_responsable = requests.get(API_TIPO_RESPONSABLE_URL).json().get("datos", [])
+        tipos_responsable = cliente_api.obtener_columnas(API_TIPO_RESPONSABLE_URL, COLUMNAS_TIPO_RESPONSABLE)
     except Exception:
         tipos_responsable = []
 
     try:
-        usuarios = requests.get(API_USUARIO_URL).json().get("datos", [])
+        usuarios = cliente_api.obtener_columnas(API_USUARIO_URL, COLUMNAS_USUARIO)
     except Exception:
         usuarios = []
 
@@ -42,22 +46,20 @@ def buscar_responsable():
     id_buscar = request.form.get("codigo_buscar")
 
     try:
-        respuesta = requests.get(f"{API_RESPONSABLE_URL}/id/{id_buscar}")
-        if respuesta.status_code == 200:
-            datos = respuesta.json().get("datos", [])
-            if datos:
-                responsable = datos[0]
-                responsables = requests.get(API_RESPONSABLE_URL).json().get("datos", [])
-                tipos_responsable = requests.get(API_TIPO_RESPONSABLE_URL).json().get("datos", [])
-                usuarios = requests.get(API_USUARIO_URL).json().get("datos", [])
-                return render_template(
-                    "responsable.html",
-                    responsables=responsables,
-                    responsable=responsable,
-                    tipos_responsable=tipos_responsable,
-                    usuarios=usuarios,
-                    modo="actualizar"
-                )
+        datos = cliente_api.obtener_datos(f"{API_RESPONSABLE_URL}/id/{id_buscar}")
+        if datos:
+            responsable = datos[0]
+            responsables = cliente_api.obtener_datos(API_RESPONSABLE_URL)
+            tipos_responsable = cliente_api.obtener_columnas(API_TIPO_RESPONSABLE_URL, COLUMNAS_TIPO_RESPONSABLE)
+            usuarios = cliente_api.obtener_columnas(API_USUARIO_URL, COLUMNAS_USUARIO)
+            return render_template(
+                "responsable.html",
+                responsables=responsables,
+                responsable=responsable,
+                tipos_responsable=tipos_responsable,
+                usuarios=usuarios,
+                modo="actualizar"
+            )
     except Exception as e:
         print("Error al buscar responsable:", e)
 
@@ -73,7 +75,7 @@ def crear_responsable():
     }
 
     try:
-        requests.post(API_RESPONSABLE_URL, json=datos)
+        cliente_api.crear(API_RESPONSABLE_URL, datos)
     except Exception as e:
         print("Error al crear responsable:", e)
 
@@ -91,7 +93,7 @@ def actualizar_responsable():
     }
 
     try:
-        requests.put(f"{API_RESPONSABLE_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_RESPONSABLE_URL}/id/{codigo}", datos)
     except Exception as e:
         print("Error al actualizar responsable:", e)
 
@@ -101,7 +103,7 @@ def actualizar_responsable():
 @rutas_responsable.route("/responsable/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_responsable(codigo):
     try:
-        requests.delete(f"{API_RESPONSABLE_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_RESPONSABLE_URL}/id/{codigo}")
     except Exception as e:
         print("Error al eliminar responsable:", e)
 
@@ -1,6 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
 from datetime import datetime
+from servicios import cliente_api
 
 rutas_responsable_entregable = Blueprint("rutas_responsable_entregable", __name__)
 
@@ -9,6 +9,10 @@ API_RESPONSABLE = "http://localhost:5031/api/responsable"
 API_ENTREGABLE = "http://localhost:5031/api/entregable"
 API_RE_view = "http://localhost:5031/api/view_responsable_entregable"
 
+# Columnas que usan los desplegables de cada tabla auxiliar
+COLUMNAS_RESPONSABLE = ["id", "nombre"]
+COLUMNAS_ENTREGABLE = ["id", "titulo"]
+
 
 def formatear_fecha(fecha_str):
     if not fecha_str:
@@ -25,10 +29,10 @@ def formatear_fecha(fecha_str):
 @rutas_responsable_entregable.route("/responsable_entregable")
 def responsable_entregable():
     try:
-        asociaciones = requests.get(API_RE).json().get("datos", [])
-        responsables = requests.get(API_RESPONSABLE).json().get("datos", [])
-        entregables = requests.get(API_ENTREGABLE).json().get("datos", [])
-        re_view = requests.get(API_RE_view).json().get("datos", [])
+        asociaciones = cliente_api.obtener_datos(API_RE)
+        responsables = cliente_api.obtener_columnas(API_RESPONSABLE, COLUMNAS_RESPONSABLE)
+        entregables = cliente_api.obtener_columnas(API_ENTREGABLE, COLUMNAS_ENTREGABLE)
+        re_view = cliente_api.obtener_datos(API_RE_view)
     except Exception as e:
         print("Error al conectar con la API:", e)
         asociaciones, responsables, entregables,  re_view= [], [], [] , []
@@ -51,35 +55,22 @@ def buscar_responsable_entregable():
     id_responsable = request.form.get("id_responsable_buscar")
 
     try:
-        asociaciones = requests.get(API_RE).json().get("datos", [])
-        responsables = requests.get(API_RESPONSABLE).json().get("datos", [])
-        entregables = requests.get(API_ENTREGABLE).json().get("datos", [])
-        re_view = requests.get(API_RE_view).json().get("datos", [])
+        responsables = cliente_api.obtener_columnas(API_RESPONSABLE, COLUMNAS_RESPONSABLE)
+        entregables = cliente_api.obtener_columnas(API_ENTREGABLE, COLUMNAS_ENTREGABLE)
+        re_view = cliente_api.obtener_datos(API_RE_view)
+        # Solo las asociaciones del responsable buscado, filtradas por la API
+        coincidencias = cliente_api.filtrar(API_RE, {"id_responsable": id_responsable}) if id_responsable else []
     except Exception as e:
         print("Error al conectar con la API:", e)
-        asociaciones, responsables, entregables, re_view = [], [], [], []
-
-    if not id_responsable:
-        return render_template(
-            "responsable_entregable.html",
-            re_view=re_view,
-            asociaciones=asociaciones,
-            responsables=responsables,
-            entregables=entregables,
-            asociacion=None,
-            modo="crear"
-        )
-
-    # Buscar localmente en las asociaciones
-    coincidencias = [a for a in asociaciones if str(a.get("id_responsable")) == str(id_responsable)]
+        responsables, entregables, re_view, coincidencias = [], [], [], []
 
     if coincidencias:
-        asociacion = coincidencias[0]
+        asociacion = dict(coincidencias[0])
         asociacion["fecha_asociacion"] = formatear_fecha(asociacion.get("fecha_asociacion"))
         return render_template(
             "responsable_entregable.html",
             re_view=re_view,
-            asociaciones=asociaciones,
+            asociaciones=coincidencias,
             responsables=responsables,
             entregables=entregables,
             asociacion=asociacion,
@@ -89,7 +80,7 @@ def buscar_responsable_entregable():
         return render_template(
             "responsable_entregable.html",
             re_view=re_view,
-            asociaciones=asociaciones,
+            asociaciones=coincidencias,
             responsables=responsables,
             entregables=entregables,
             asociacion=None,
@@ -107,7 +98,7 @@ def crear_responsable_entregable():
     }
 
     try:
-        requests.post(API_RE, json=datos)
+        cliente_api.crear(API_RE, datos)
     except Exception as e:
         print("Error al crear asociación:", e)
 
@@ -126,7 +117,7 @@ def actualizar_responsable_entregable():
     }
 
     try:
-        requests.put(f"{API_RE}/id_responsable/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_RE}/id_responsable/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la meta estratégica: {e}"
 
@@ -138,7 +129,7 @@ def actualizar_responsable_entregable():
 @rutas_responsable_entregable.route("/responsable_entregable/eliminar/<int:id_responsable>", methods=["POST"])
 def eliminar_responsable_entregable(id_responsable):
     try:
-        requests.delete(f"{API_RE}/id_responsable/{id_responsable}")
+        cliente_api.eliminar(f"{API_RE}/id_responsable/{id_responsable}")
     except Exception as e:
         print("Error al eliminar asociación:", e)
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de tipo_producto
 rutas_tipo_producto = Blueprint("rutas_tipo_producto", __name__)
@@ -11,8 +11,7 @@ API_URL = "http://localhost:5031/api/tipo_producto"
 @rutas_tipo_producto.route("/tipo_producto")
 def tipo_producto():
     try:
-        respuesta = requests.get(API_URL)
-        tipos_productos = respuesta.json().get("datos", [])
+        tipos_productos = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         tipos_productos = []
         print("Error al conectar con la API:", e)
@@ -31,22 +30,20 @@ def buscar_tipo_producto():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    tipo_producto = datos[0]
-                    tipos_productos = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "tipo_productos.html",
-                        tipos_productos=tipos_productos,
-                        tipo_producto=tipo_producto,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                tipo_producto = datos[0]
+                tipos_productos = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "tipo_productos.html",
+                    tipos_productos=tipos_productos,
+                    tipo_producto=tipo_producto,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    tipos_productos = requests.get(API_URL).json().get("datos", [])
+    tipos_productos = cliente_api.obtener_datos(API_URL)
     return render_template(
         "tipo_productos.html",
         tipos_productos=tipos_productos,
@@ -64,7 +61,7 @@ def crear_tipo_producto():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear el tipo de producto: {e}"
 
@@ -80,7 +77,7 @@ def actualizar_tipo_producto():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar tipo de producto: {e}"
 
@@ -90,7 +87,7 @@ def actualizar_tipo_producto():
 @rutas_tipo_producto.route("/tipo_producto/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_tipo_producto(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar tipo de producto: {e}"
 
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de tipo_responsable
 rutas_tipo_responsable = Blueprint("rutas_tipo_responsable", __name__)
@@ -12,8 +12,7 @@ API_URL = "http://localhost:5031/api/tipo_responsable"
 def tipo_responsable():
 
     try:
-        respuesta = requests.get(API_URL)
-        tipos_responsables = respuesta.json().get("datos", [])
+        tipos_responsables = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         tipos_responsables = []
         print("Error al conectar con la API:", e)
@@ -32,22 +31,20 @@ def buscar_tipo_responsable():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    tipo_responsable = datos[0]
-                    tipos_responsables = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "tipo_responsables.html",
-                        tipos_responsables=tipos_responsables,
-                        tipo_responsable=tipo_responsable,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                tipo_responsable = datos[0]
+                tipos_responsables = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "tipo_responsables.html",
+                    tipos_responsables=tipos_responsables,
+                    tipo_responsable=tipo_responsable,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    tipos_responsables = requests.get(API_URL).json().get("datos", [])
+    tipos_responsables = cliente_api.obtener_datos(API_URL)
     return render_template(
         "tipo_responsables.html",
         tipos_responsables=tipos_responsables,
@@ -65,7 +62,7 @@ def crear_tipo_responsable():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear el tipo de responsable: {e}"
 
@@ -81,7 +78,7 @@ def actualizar_tipo_responsable():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar tipo de responsable: {e}"
 
@@ -91,7 +88,7 @@ def actualizar_tipo_responsable():
 @rutas_tipo_responsable.route("/tipo_responsable/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_tipo_responsable(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar tipo de responsable: {e}"
 
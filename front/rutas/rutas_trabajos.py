@@ -0,0 +1,72 @@
+from flask import Blueprint, render_template, request, redirect, url_for, jsonify, abort, send_file
+from servicios import exportaciones, trabajos
+
+# Crear el Blueprint de los trabajos en segundo plano
+rutas_trabajos = Blueprint("rutas_trabajos", __name__)
+
+
+def quiere_json():
+    """True si quien pide prefiere JSON (fetch, scripts) antes que la página HTML."""
+    return request.accept_mimetypes.best_match(["text/html", "application/json"]) == "application/json"
+
+
+def estado_publico(trabajo):
+    """Campos del trabajo que se muestran (sin datos internos de la cola)."""
+    return {
+        "id": trabajo["id"],
+        "tipo": trabajo["tipo"],
+        "estado": trabajo["estado"],
+        "progreso": trabajo["progreso"],
+        "mensaje": trabajo["mensaje"],
+        "intentos": trabajo["intentos"],
+        "creado": trabajo["creado"],
+        "actualizado": trabajo["actualizado"],
+        "resultado": url_for("rutas_trabajos.resultado_trabajo", id_trabajo=trabajo["id"])
+                     if trabajo["estado"] == "terminado" else None,
+    }
+
+# ------------------- LISTAR trabajos -------------------
+@rutas_trabajos.route("/trabajos")
+def trabajos_lista():
+    recientes = [estado_publico(t) for t in trabajos.recientes()]
+    if quiere_json():
+        return jsonify(recientes)
+    return render_template("trabajos.html", trabajos=recientes, nuevo=request.args.get("nuevo", type=int))
+
+# ------------------- ESTADO de un trabajo -------------------
+@rutas_trabajos.route("/trabajos/<int:id_trabajo>")
+def estado_trabajo(id_trabajo):
+    trabajo = trabajos.obtener(id_trabajo)
+    if trabajo is None:
+        abort(404)
+    return jsonify(estado_publico(trabajo))
+
+# ------------------- RESULTADO de un trabajo -------------------
+@rutas_trabajos.route("/trabajos/<int:id_trabajo>/resultado")
+def resultado_trabajo(id_trabajo):
+    trabajo = trabajos.obtener(id_trabajo)
+    if trabajo is None:
+        abort(404)
+    if trabajo["estado"] != "terminado":
+        return jsonify(estado_publico(trabajo)), 409
+    resultado = trabajo["resultado"]
+    if isinstance(resultado, dict) and "archivo" in resultado:
+        camino = exportaciones.ubicacion(resultado["archivo"])
+        if camino is None:
+            abort(404)
+        return send_file(camino, as_attachment=True, download_name=resultado["archivo"])
+    return jsonify(resultado)
+
+# ------------------- EXPORTAR una tabla -------------------
+@rutas_trabajos.route("/trabajos/exportar/<string:tabla>", methods=["POST"])
+def exportar_tabla(tabla):
+    if tabla not in exportaciones.TABLAS:
+        abort(404)
+    try:
+        id_trabajo = trabajos.encolar("exportar_csv", {"tabla": tabla})
+    except Exception as e:
+        return f"Error al encolar la exportación: {e}"
+
+    if quiere_json():
+        return jsonify({"id": id_trabajo, "estado": url_for("rutas_trabajos.estado_trabajo", id_trabajo=id_trabajo)}), 202
+    return redirect(url_for("rutas_trabajos.trabajos_lista", nuevo=id_trabajo))
@@ -1,8 +1,7 @@
 # =================== rutas/rutas_usuarios.py ===================
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
-# Importar la función para encriptar contraseñas
-from werkzeug.security import generate_password_hash  
+# Las contraseñas se cifran en un pool aparte (servicios/contrasenas.py)
+from servicios import cliente_api, contrasenas
 
 rutas_usuario = Blueprint("rutas_usuario", __name__)
 API_URL = "http://localhost:5031/api/usuario"
@@ -12,8 +11,7 @@ API_URL = "http://localhost:5031/api/usuario"
 @rutas_usuario.route("/usuario")
 def usuario():
     try:
-        respuesta = requests.get(API_URL)
-        usuarios = respuesta.json().get("datos", [])
+        usuarios = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         usuarios = []
         print("Error al conectar con la API:", e)
@@ -33,22 +31,20 @@ def buscar_usuario():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    usuario = datos[0]
-                    usuarios = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "usuarios.html",
-                        usuarios=usuarios,
-                        usuario=usuario,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                usuario = datos[0]
+                usuarios = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "usuarios.html",
+                    usuarios=usuarios,
+                    usuario=usuario,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    usuarios = requests.get(API_URL).json().get("datos", [])
+    usuarios = cliente_api.obtener_datos(API_URL)
     return render_template(
         "usuarios.html",
         usuarios=usuarios,
@@ -63,7 +59,10 @@ def buscar_usuario():
 def crear_usuario():
     contrasena_plana = request.form.get("contrasena")
     #Almacenamos la contraseña encriptada
-    contrasena_hash = generate_password_hash(contrasena_plana)  
+    try:
+        contrasena_hash = contrasenas.cifrar(contrasena_plana)
+    except contrasenas.Saturado as e:
+        return f"Error al crear el usuario: {e}", 503
 
     datos = {
         "email": request.form.get("email"),
@@ -73,7 +72,7 @@ def crear_usuario():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear el usuario: {e}"
 
@@ -85,17 +84,24 @@ def crear_usuario():
 def actualizar_usuario():
     codigo = request.form.get("id")
     contrasena_plana = request.form.get("contrasena")
-    contrasena_hash = generate_password_hash(contrasena_plana)  # 🔒 re-encriptar
 
     datos = {
         "email": request.form.get("email"),
-        "contrasena": contrasena_hash,
         "ruta_avatar": request.form.get("ruta_avatar") or None,
         "activo": request.form.get("activo")
     }
 
+    # Solo se re-encripta si se escribió una contraseña nueva; sin el campo,
+    # la API conserva la guardada. El formulario nunca trae el hash guardado,
+    # así que lo escrito siempre es una contraseña en texto plano
+    if contrasena_plana:
+        try:
+            datos["contrasena"] = contrasenas.cifrar(contrasena_plana)  # 🔒 re-encriptar
+        except contrasenas.Saturado as e:
+            return f"Error al actualizar usuario: {e}", 503
+
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar usuario: {e}"
 
@@ -106,7 +112,7 @@ def actualizar_usuario():
 @rutas_usuario.route("/usuario/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_usuario(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar usuario: {e}"
 
@@ -1,6 +1,6 @@
-# Importar módulos necesarios de Flask y la librería requests para conectarse a la API externa
+# Importar módulos necesarios de Flask y el cliente compartido para conectarse a la API externa
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios import cliente_api
 
 # Crear el Blueprint de variables estratégicas
 rutas_variable_estrategica = Blueprint("rutas_variable_estrategica", __name__)
@@ -12,8 +12,7 @@ API_URL = "http://localhost:5031/api/variable_estrategica"
 @rutas_variable_estrategica.route("/variable_estrategica")
 def variable_estrategica():
     try:
-        respuesta = requests.get(API_URL)
-        variables_estrategicas = respuesta.json().get("datos", [])
+        variables_estrategicas = cliente_api.obtener_datos(API_URL)
     except Exception as e:
         variables_estrategicas = []
         print("Error al conectar con la API:", e)
@@ -32,22 +31,20 @@ def buscar_variable_estrategica():
 
     if codigo:
         try:
-            respuesta = requests.get(f"{API_URL}/id/{codigo}")
-            if respuesta.status_code == 200:
-                datos = respuesta.json().get("datos", [])
-                if datos:
-                    variable_estrategica = datos[0]
-                    variables_estrategicas = requests.get(API_URL).json().get("datos", [])
-                    return render_template(
-                        "variables_estrategicas.html",
-                        variables_estrategicas=variables_estrategicas,
-                        variable_estrategica=variable_estrategica,
-                        modo="actualizar"
-                    )
+            datos = cliente_api.obtener_datos(f"{API_URL}/id/{codigo}")
+            if datos:
+                variable_estrategica = datos[0]
+                variables_estrategicas = cliente_api.obtener_datos(API_URL)
+                return render_template(
+                    "variables_estrategicas.html",
+                    variables_estrategicas=variables_estrategicas,
+                    variable_estrategica=variable_estrategica,
+                    modo="actualizar"
+                )
         except Exception as e:
             return f"Error en la búsqueda: {e}"
 
-    variables_estrategicas = requests.get(API_URL).json().get("datos", [])
+    variables_estrategicas = cliente_api.obtener_datos(API_URL)
     return render_template(
         "variables_estrategicas.html",
         variables_estrategicas=variables_estrategicas,
@@ -65,7 +62,7 @@ def crear_variable_estrategica():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        cliente_api.crear(API_URL, datos)
     except Exception as e:
         return f"Error al crear la variable estratégica: {e}"
 
@@ -81,7 +78,7 @@ def actualizar_variable_estrategica():
     }
 
     try:
-        requests.put(f"{API_URL}/id/{codigo}", json=datos)
+        cliente_api.actualizar(f"{API_URL}/id/{codigo}", datos)
     except Exception as e:
         return f"Error al actualizar la variable estratégica: {e}"
 
@@ -91,7 +88,7 @@ def actualizar_variable_estrategica():
 @rutas_variable_estrategica.route("/variable_estrategica/eliminar/<string:codigo>", methods=["POST"])
 def eliminar_variable_estrategica(codigo):
     try:
-        requests.delete(f"{API_URL}/id/{codigo}")
+        cliente_api.eliminar(f"{API_URL}/id/{codigo}")
     except Exception as e:
         return f"Error al eliminar la variable estratégica: {e}"
 
@@ -0,0 +1,197 @@
+# =================== servicios/almacen.py ===================
+"""
+Almacén local de los archivos subidos, direccionado por contenido.
+
+Cada archivo se guarda una sola vez, con su hash SHA-256 como nombre:
+
+    ARCHIVOS_DIR/objetos/3f/3fa1...e9
+
+y la fila de `archivo` guarda esa ruta relativa ("objetos/3f/3fa1...e9").
+Subir dos veces el mismo contenido (aunque tenga otro nombre) no ocupa más
+disco: la segunda subida encuentra el objeto y descarta su copia.
+
+La subida no se arma en memoria ni se copia dos veces: PeticionConSubidas
+(la clase de petición de la app, ver instalar()) le da al parser de
+multipart un destino que escribe cada trozo directamente en un temporal
+dentro del almacén y va calculando el hash y el tamaño a medida que llegan
+los bytes. guardar() solo tiene que renombrar el temporal a su objeto (o
+borrarlo si el objeto ya existía). Un archivo que supera ARCHIVOS_MAX_MB
+corta la subida con 413 en cuanto se pasa del límite, y los temporales que
+la vista no guardó se borran al cerrar la petición.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from servicios import metricas
+
+# Carpeta del almacén (por defecto front/almacen)
+DIRECTORIO = os.environ.get(
+    "ARCHIVOS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "almacen"))
+
+# Tamaño máximo de cada archivo subido
+MAX_BYTES = int(os.environ.get("ARCHIVOS_MAX_MB", "200")) * 1024 * 1024
+
+# Margen para los demás campos del formulario en el límite de la petición completa
+MARGEN_FORMULARIO = 1024 * 1024
+
+# Bytes que se copian por vez cuando la subida no llegó por PeticionConSubidas
+TROZO = 1024 * 1024
+
+_RUTA_OBJETO = re.compile(r"^objetos/([0-9a-f]{2})/(\1[0-9a-f]{62})$")
+
+_candado = threading.Lock()
+_estadisticas = {"subidas": 0, "duplicadas": 0, "rechazadas": 0, "bytes_escritos": 0}
+
+
+def ruta_de(hash_contenido):
+    """Ruta relativa (la que se guarda en `archivo.ruta`) del objeto con ese hash."""
+    return f"objetos/{hash_contenido[:2]}/{hash_contenido}"
+
+
+def hash_de(ruta):
+    """Hash del objeto al que apunta una ruta del almacén, o None si la ruta no es del almacén."""
+    coincidencia = _RUTA_OBJETO.match(ruta or "")
+    return coincidencia.group(2) if coincidencia else None
+
+
+def ubicacion(ruta):
+    """Camino absoluto en disco de una ruta del almacén, o None si no es del almacén."""
+    if hash_de(ruta) is None:
+        return None
+    return os.path.join(DIRECTORIO, *ruta.split("/"))
+
+
+def _contar(clave, cantidad=1):
+    with _candado:
+        _estadisticas[clave] += cantidad
+
+
+class Objeto:
+    """Archivo ya guardado en el almacén."""
+
+    def __init__(self, hash_contenido, tamano, nuevo):
+        self.hash = hash_contenido
+        self.tamano = tamano
+        self.nuevo = nuevo              # False si el contenido ya estaba guardado
+        self.ruta = ruta_de(hash_contenido)
+
+
+class Subida:
+    """
+    Destino de un archivo mientras llega: un temporal dentro del almacén
+    (mismo disco que los objetos, así guardarlo es un rename) que calcula
+    el hash y el tamaño con cada trozo escrito.
+    """
+
+    def __init__(self, maximo=MAX_BYTES):
+        carpeta = os.path.join(DIRECTORIO, "tmp")
+        os.makedirs(carpeta, exist_ok=True)
+        descriptor, self.temporal = tempfile.mkstemp(dir=carpeta, suffix=".subida")
+        self._archivo = os.fdopen(descriptor, "w+b")
+        self._hash = hashlib.sha256()
+        self.maximo = maximo
+        self.tamano = 0
+        self.objeto = None
+
+    def write(self, datos):
+        self.tamano += len(datos)
+        if self.tamano > self.maximo:
+            _contar("rechazadas")
+            self.descartar()
+            raise RequestEntityTooLarge(f"El archivo supera el máximo de {self.maximo // (1024 * 1024)} MB")
+        self._hash.update(datos)
+        return self._archivo.write(datos)
+
+    def __getattr__(self, nombre):
+        # read, readline, seek, tell... (los usa FileStorage) van al temporal
+        return getattr(self._archivo, nombre)
+
+    def guardar(self):
+        """Mueve el temporal a su objeto (o lo borra si el contenido ya existía) y devuelve el Objeto."""
+        if self.objeto is not None:
+            return self.objeto
+        self._archivo.close()
+        hash_contenido = self._hash.hexdigest()
+        destino = os.path.join(DIRECTORIO, *ruta_de(hash_contenido).split("/"))
+        nuevo = not os.path.exists(destino)
+        if nuevo:
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            # Si otra subida del mismo contenido ganó la carrera, el rename deja un objeto idéntico
+            os.replace(self.temporal, destino)
+            _contar("bytes_escritos", self.tamano)
+        else:
+            os.remove(self.temporal)
+            _contar("duplicadas")
+        _contar("subidas")
+        self.objeto = Objeto(hash_contenido, self.tamano, nuevo)
+        return self.objeto
+
+    def descartar(self):
+        """Cierra y borra el temporal si no se guardó."""
+        if not self._archivo.closed:
+            self._archivo.close()
+        if self.objeto is None and os.path.exists(self.temporal):
+            os.remove(self.temporal)
+
+    def close(self):
+        self.descartar()
+
+
+class PeticionConSubidas(Request):
+    """
+    Petición de Flask cuyos archivos multipart se escriben directamente en
+    el almacén. Al cerrar la petición Werkzeug cierra cada archivo: las
+    Subidas que la vista no guardó borran su temporal.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return Subida()
+
+
+def guardar(archivo):
+    """
+    Guarda en el almacén un archivo de request.files y devuelve su Objeto,
+    o None si el campo llegó vacío (no se eligió archivo).
+    """
+    if archivo is None or not archivo.filename:
+        return None
+    if isinstance(archivo.stream, Subida):
+        return archivo.stream.guardar()
+    # La app no usa PeticionConSubidas: se copia por trozos, igualmente sin leerlo entero
+    subida = Subida()
+    try:
+        while True:
+            trozo = archivo.stream.read(TROZO)
+            if not trozo:
+                break
+            subida.write(trozo)
+        return subida.guardar()
+    finally:
+        subida.descartar()
+
+
+def _metricas_almacen():
+    """Colector para /metrics con los contadores del almacén de archivos."""
+    with _candado:
+        e = dict(_estadisticas)
+    return [
+        ("almacen_subidas_total", "counter", "Archivos subidos y guardados.", [((), e["subidas"])]),
+        ("almacen_subidas_duplicadas_total", "counter", "Subidas cuyo contenido ya estaba guardado.", [((), e["duplicadas"])]),
+        ("almacen_subidas_rechazadas_total", "counter", "Subidas cortadas por superar el tamaño máximo.", [((), e["rechazadas"])]),
+        ("almacen_bytes_escritos_total", "counter", "Bytes de objetos nuevos guardados.", [((), e["bytes_escritos"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_almacen)
+
+
+def instalar(aplicacion):
+    """Usa PeticionConSubidas en la app y limita el tamaño de las peticiones."""
+    aplicacion.request_class = PeticionConSubidas
+    aplicacion.config.setdefault("MAX_CONTENT_LENGTH", MAX_BYTES + MARGEN_FORMULARIO)
@@ -0,0 +1,122 @@
+# =================== servicios/blueprints.py ===================
+"""
+Registro declarativo de los Blueprints de la aplicación, con carga
+perezosa opcional.
+
+app.py describe cada sección con (módulo, nombre del Blueprint, perezosa).
+Las secciones no perezosas se importan y registran como siempre. Las
+perezosas no se importan al arrancar: sus reglas de URL se leen de
+rutas/manifiesto.json y cada vista importa el módulo en su primera
+petición. url_for() funciona igual porque los endpoints existen desde el
+arranque.
+
+El manifiesto se regenera (desde la carpeta front/) con:
+    python -m servicios.blueprints
+Si un módulo cambió después de generarlo (su contenido ya no coincide),
+esa sección se importa normalmente y se avisa por consola.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from flask import Flask
+
+CARPETA_FRONT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_MANIFIESTO = os.path.join(CARPETA_FRONT, "rutas", "manifiesto.json")
+
+
+def _archivo_de(modulo):
+    return os.path.join(CARPETA_FRONT, *modulo.split(".")) + ".py"
+
+
+def _importar(modulo):
+    """Importa el módulo por el mecanismo normal (así aparece en python -X importtime)."""
+    return __import__(modulo, fromlist=["_"])
+
+
+def _firma(modulo):
+    """Hash del contenido del módulo (sin importar los finales de línea)."""
+    with open(_archivo_de(modulo), "rb") as archivo:
+        return hashlib.sha1(archivo.read().replace(b"\r\n", b"\n")).hexdigest()
+
+
+class VistaPerezosa:
+    """Vista que importa su módulo la primera vez que se llama."""
+
+    def __init__(self, modulo, funcion):
+        self.modulo = modulo
+        self.funcion = funcion
+        self._vista = None
+        self._candado = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        if self._vista is None:
+            with self._candado:
+                if self._vista is None:
+                    self._vista = getattr(_importar(self.modulo), self.funcion)
+        return self._vista(*args, **kwargs)
+
+
+def leer_manifiesto():
+    try:
+        with open(RUTA_MANIFIESTO, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def registrar(aplicacion, secciones, carga_perezosa=False):
+    """
+    Registra las secciones en la aplicación. Con carga_perezosa=False se
+    importan todas, incluidas las marcadas como perezosas.
+    """
+    manifiesto = leer_manifiesto() if carga_perezosa else {}
+    for modulo, nombre, perezosa in secciones:
+        entrada = manifiesto.get(modulo)
+        if perezosa and entrada and entrada["firma"] == _firma(modulo):
+            for regla in entrada["reglas"]:
+                funcion = regla["endpoint"].split(".", 1)[1]
+                aplicacion.add_url_rule(regla["regla"], regla["endpoint"],
+                                        VistaPerezosa(modulo, funcion), methods=regla["metodos"])
+            continue
+        if perezosa and carga_perezosa:
+            print(f"Manifiesto de rutas desactualizado para {modulo}: se importa al arrancar "
+                  "(regenerar con python -m servicios.blueprints)")
+        aplicacion.register_blueprint(getattr(_importar(modulo), nombre))
+
+
+def generar_manifiesto(secciones):
+    """Importa todas las secciones y guarda sus reglas en rutas/manifiesto.json."""
+    aplicacion = Flask(__name__)
+    manifiesto = {}
+    for modulo, nombre, _ in secciones:
+        aplicacion.register_blueprint(getattr(_importar(modulo), nombre))
+        manifiesto[modulo] = {"firma": _firma(modulo), "reglas": []}
+    por_blueprint = {nombre: modulo for modulo, nombre, _ in secciones}
+    for regla in aplicacion.url_map.iter_rules():
+        modulo = por_blueprint.get(regla.endpoint.split(".", 1)[0])
+        if modulo not in manifiesto:
+            continue
+        # La vista perezosa busca la función por el nombre del endpoint
+        funcion = getattr(_importar(modulo), regla.endpoint.split(".", 1)[1], None)
+        if funcion is not aplicacion.view_functions[regla.endpoint]:
+            print(f"{modulo}: el endpoint {regla.endpoint} no coincide con una función del módulo; "
+                  "la sección se importará siempre al arrancar")
+            del manifiesto[modulo]
+            continue
+        manifiesto[modulo]["reglas"].append({
+            "regla": regla.rule,
+            "endpoint": regla.endpoint,
+            "metodos": sorted(regla.methods - {"HEAD", "OPTIONS"}),
+        })
+    with open(RUTA_MANIFIESTO, "w", encoding="utf-8") as archivo:
+        json.dump(manifiesto, archivo, indent=2, ensure_ascii=False)
+    return manifiesto
+
+
+if __name__ == "__main__":
+    from app import SECCIONES
+
+    generado = generar_manifiesto(SECCIONES)
+    print(f"Manifiesto guardado en {RUTA_MANIFIESTO} ({sum(len(e['reglas']) for e in generado.values())} reglas)")
@@ -0,0 +1,259 @@
+# =================== servicios/busqueda.py ===================
+"""
+Búsqueda de texto libre en los listados.
+
+Cada tabla buscable tiene un índice invertido en memoria (palabra ->
+registros que la contienen) construido a partir del listado en caché. Los
+listados se comparten entre hilos y no se modifican (ver
+servicios/cliente_api.py), así que el índice se pone al día solo cuando
+recibe una lista distinta de la última, y entonces vuelve a tokenizar solo
+los registros que cambiaron: una escritura aplicada al listado en caché
+cambia un registro, un refresco trae los mismos datos en objetos nuevos
+pero con los mismos valores.
+
+La búsqueda ignora mayúsculas y tildes. Un registro aparece si contiene
+todas las palabras buscadas (la última también como prefijo, para poder
+buscar mientras se escribe) y los resultados se ordenan por relevancia:
+cada palabra suma según lo rara que es en la tabla (idf) y el campo donde
+aparece (pesa más el código o el título que la descripción).
+"""
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+# Tablas buscables y los campos que se indexan de cada una, con su peso
+PESOS = {"codigo": 3.0, "titulo": 3.0, "descripcion": 1.0, "observaciones": 1.0}
+TABLAS = ("proyecto", "entregable", "actividad", "producto", "presupuesto")
+
+# Resultados que se devuelven como máximo, los más relevantes
+LIMITE_RESULTADOS = 1000
+
+# Con más palabras nuevas o eliminadas que estas el vocabulario se reordena entero
+MAX_CAMBIOS_VOCABULARIO = 1000
+
+# Peso de una palabra que solo coincide como prefijo frente a una completa
+PESO_PREFIJO = 0.5
+
+# Largo mínimo de la última palabra para buscarla también como prefijo ("4"
+# abarcaría casi todos los números de la tabla)
+MIN_PREFIJO = 2
+
+_PALABRA = re.compile(r"\w+")
+
+
+def palabras(texto):
+    """Palabras del texto en minúsculas y sin tildes: "Título Nº1" -> ["titulo", "no1"]."""
+    texto = unicodedata.normalize("NFKD", str(texto).lower())
+    return _PALABRA.findall(texto.encode("ascii", "ignore").decode("ascii"))
+
+
+class IndiceTexto:
+    """Índice invertido de los campos de texto de una tabla."""
+
+    def __init__(self, campos):
+        self.campos = campos
+        self._datos = None          # última lista indexada
+        self._documentos = {}       # id -> (fila, valores de los campos)
+        self._posiciones = {}       # id -> posición en la lista (desempate)
+        self._postings = {}         # palabra -> {id: peso}
+        self._ordenados = {}        # palabra -> ids de mayor a menor peso (se arma al buscar)
+        self._maximos = {}          # palabra -> mayor peso de sus registros (se calcula al buscar)
+        self._vocabulario = []      # palabras ordenadas, para buscar por prefijo
+        self._agregadas = set()     # palabras nuevas que aún no están en el vocabulario
+        self._quitadas = set()      # palabras que ya no existen pero siguen en el vocabulario
+        self._candado = threading.Lock()
+
+    # ------------------- ACTUALIZACIÓN -------------------
+    def _agregar(self, clave, fila, valores):
+        pesos = {}
+        for campo, valor in zip(self.campos, valores):
+            if valor is None:
+                continue
+            for palabra in palabras(valor):
+                pesos[palabra] = pesos.get(palabra, 0.0) + PESOS[campo]
+        for palabra, peso in pesos.items():
+            registros = self._postings.get(palabra)
+            if registros is None:
+                registros = self._postings[palabra] = {}
+                if palabra in self._quitadas:
+                    self._quitadas.discard(palabra)
+                else:
+                    self._agregadas.add(palabra)
+            registros[clave] = peso
+            self._ordenados.pop(palabra, None)
+            self._maximos.pop(palabra, None)
+        self._documentos[clave] = (fila, valores)
+
+    def _quitar(self, clave):
+        _, valores = self._documentos.pop(clave)
+        for palabra in {p for v in valores if v is not None for p in palabras(v)}:
+            registros = self._postings.get(palabra)
+            if registros is not None:
+                registros.pop(clave, None)
+                self._ordenados.pop(palabra, None)
+                self._maximos.pop(palabra, None)
+                if not registros:
+                    del self._postings[palabra]
+                    if palabra in self._agregadas:
+                        self._agregadas.discard(palabra)
+                    else:
+                        self._quitadas.add(palabra)
+
+    def sincronizar(self, datos):
+        """Pone el índice al día con la lista, tokenizando solo los registros que cambiaron."""
+        if datos is self._datos:
+            return
+        posiciones = {}
+        for posicion, fila in enumerate(datos):
+            clave = fila.get("id", posicion)
+            if clave in posiciones:
+                continue  # id repetido: se indexa la primera fila
+            posiciones[clave] = posicion
+            documento = self._documentos.get(clave)
+            if documento is not None and documento[0] is fila:
+                continue
+            valores = tuple(fila.get(c) for c in self.campos)
+            if documento is not None:
+                if documento[1] == valores:
+                    self._documentos[clave] = (fila, valores)
+                    continue
+                self._quitar(clave)
+            self._agregar(clave, fila, valores)
+        for clave in [c for c in self._documentos if c not in posiciones]:
+            self._quitar(clave)
+        self._posiciones = posiciones
+        self._datos = datos
+
+    # ------------------- BÚSQUEDA -------------------
+    def _actualizar_vocabulario(self):
+        """Lleva al vocabulario ordenado las palabras agregadas y quitadas desde la última búsqueda."""
+        if len(self._agregadas) + len(self._quitadas) > MAX_CAMBIOS_VOCABULARIO:
+            self._vocabulario = sorted(self._postings)
+        else:
+            for palabra in self._quitadas:
+                del self._vocabulario[bisect_left(self._vocabulario, palabra)]
+            for palabra in self._agregadas:
+                insort(self._vocabulario, palabra)
+        self._agregadas.clear()
+        self._quitadas.clear()
+
+    def _coincidencias(self, termino, prefijo):
+        """
+        (registros, palabra, escala) del término: {id: peso} de los registros
+        que contienen la palabra (o alguna que empiece por ella), la palabra
+        cuyas listas se usan (None si se juntaron varias) y el factor que
+        se aplica a sus pesos.
+        """
+        exactos = self._postings.get(termino, {})
+        variantes = []
+        if prefijo and len(termino) >= MIN_PREFIJO:
+            self._actualizar_vocabulario()
+            i = bisect_left(self._vocabulario, termino)
+            while i < len(self._vocabulario) and self._vocabulario[i].startswith(termino):
+                if self._vocabulario[i] != termino:
+                    variantes.append(self._vocabulario[i])
+                i += 1
+        if not variantes:
+            return exactos, termino, 1.0
+        if not exactos and len(variantes) == 1:
+            # Una sola palabra empieza por el término: se usan sus listas ya ordenadas
+            return self._postings[variantes[0]], variantes[0], PESO_PREFIJO
+        registros = dict(exactos)
+        for palabra in variantes:
+            for clave, peso in self._postings[palabra].items():
+                peso *= PESO_PREFIJO
+                if peso > registros.get(clave, 0.0):
+                    registros[clave] = peso
+        return registros, None, 1.0
+
+    def _ordenados_de(self, registros, palabra):
+        """Ids de mayor a menor peso, a igual peso en el orden del listado."""
+        ordenados = self._ordenados.get(palabra) if palabra else None
+        if ordenados is None:
+            posiciones = self._posiciones
+            ordenados = sorted(registros, key=lambda c: (-registros[c], posiciones.get(c, 0)))
+            if palabra:
+                self._ordenados[palabra] = ordenados
+        return ordenados
+
+    def _maximo_de(self, registros, palabra):
+        maximo = self._maximos.get(palabra) if palabra else None
+        if maximo is None:
+            maximo = max(registros.values())
+            if palabra:
+                self._maximos[palabra] = maximo
+        return maximo
+
+    def buscar(self, datos, texto, limite=LIMITE_RESULTADOS):
+        """
+        Las `limite` filas de datos más relevantes entre las que contienen
+        todas las palabras del texto, de la más a la menos relevante.
+
+        Se recorre la palabra más rara en orden de peso descendente y se
+        para en cuanto ningún registro restante puede superar al último de
+        los `limite` mejores: una búsqueda que coincide con toda la tabla
+        cuesta lo mismo que una que coincide con `limite` registros.
+        """
+        terminos = list(dict.fromkeys(palabras(texto)))
+        if not terminos:
+            return list(datos)
+        with self._candado:
+            self.sincronizar(datos)
+            total = len(self._documentos)
+            listas = [self._coincidencias(t, prefijo=(i == len(terminos) - 1)) for i, t in enumerate(terminos)]
+            listas.sort(key=lambda lista: len(lista[0]))
+            (principal, palabra, escala), otras = listas[0], listas[1:]
+            if not principal:
+                return []
+            ordenados = self._ordenados_de(principal, palabra)
+            factor = escala * math.log(1 + total / len(principal))
+            factores = [e * math.log(1 + total / len(r)) for r, _, e in otras]
+            # Lo máximo que pueden sumar las demás palabras a un registro
+            resto_maximo = sum(f * self._maximo_de(r, p) for f, (r, p, _) in zip(factores, otras))
+            otras = [registros for registros, _, _ in otras]
+
+            posiciones = self._posiciones
+            mejores = []  # montículo de (puntaje, -posición, id): en la raíz el peor
+            for clave in ordenados:
+                puntaje = factor * principal[clave]
+                if len(mejores) == limite and puntaje + resto_maximo <= mejores[0][0]:
+                    break
+                for registros, f in zip(otras, factores):
+                    peso = registros.get(clave)
+                    if peso is None:
+                        break
+                    puntaje += f * peso
+                else:
+                    elemento = (puntaje, -posiciones.get(clave, 0), clave)
+                    if len(mejores) < limite:
+                        heapq.heappush(mejores, elemento)
+                    elif elemento > mejores[0]:
+                        heapq.heapreplace(mejores, elemento)
+            mejores.sort(reverse=True)
+            return [self._documentos[clave][0] for _, _, clave in mejores]
+
+
+_indices = {}
+_candado = threading.Lock()
+
+
+def indice(tabla):
+    """Índice de la tabla (se crea vacío la primera vez)."""
+    with _candado:
+        if tabla not in _indices:
+            _indices[tabla] = IndiceTexto(tuple(PESOS))
+        return _indices[tabla]
+
+
+def buscar(tabla, datos, texto):
+    """
+    Filtra y ordena por relevancia el listado de la tabla (tal como lo
+    devuelve cliente_api.obtener_datos) según el texto buscado. Un texto
+    sin palabras devuelve el listado completo.
+    """
+    if tabla not in TABLAS:
+        raise ValueError(f"La tabla {tabla} no tiene búsqueda de texto")
+    return indice(tabla).buscar(datos, texto)
@@ -0,0 +1,197 @@
+# =================== servicios/cache_api.py ===================
+"""
+Caché en memoria para los listados que devuelve la API en C#.
+
+Cada entrada tiene dos tiempos de vida:
+- TTL suave: mientras no se supere, la entrada se sirve tal cual.
+- TTL duro: entre el TTL suave y el duro la entrada se sirve obsoleta de
+  inmediato y se lanza UN refresco en segundo plano (stale-while-revalidate).
+  Pasado el TTL duro la petición espera a que se cargue el valor nuevo.
+
+Los refrescos corren en un pool de hilos pequeño y dedicado, de modo que
+la latencia de la API no recae sobre las peticiones de los usuarios.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _Entrada:
+    """
+    Valor guardado en la caché junto con el instante en que se obtuvo y su
+    versión (cambia solo cuando cambian los datos).
+    """
+
+    __slots__ = ("valor", "guardado", "refrescando", "version")
+
+    def __init__(self, valor, guardado, version):
+        self.valor = valor
+        self.guardado = guardado
+        self.refrescando = False
+        self.version = version
+
+
+class CacheListas:
+    """Caché clave -> valor con TTL suave/duro y refresco en segundo plano."""
+
+    def __init__(self, ttl_suave=30, ttl_duro=300, hilos_refresco=2):
+        self.ttl_suave = ttl_suave
+        self.ttl_duro = ttl_duro
+        self._entradas = {}
+        self._candado = threading.Lock()
+        # Se incrementa en cada invalidación: una carga que empezó antes de
+        # invalidar no debe volver a guardar datos ya obsoletos.
+        self._epoca = 0
+        # Versiones únicas en toda la caché: un listado borrado y vuelto a
+        # cargar nunca repite la versión que tenía antes.
+        self._versiones = itertools.count(1)
+        self._refrescador = ThreadPoolExecutor(
+            max_workers=hilos_refresco, thread_name_prefix="refresco-cache"
+        )
+
+        # Contadores expuestos por estadisticas()
+        self.aciertos = 0
+        self.fallos = 0
+        self.obsoletos_servidos = 0
+        self.refrescos = 0
+        self.refrescos_fallidos = 0
+        self.escrituras_aplicadas = 0
+
+    # ------------------- LECTURA -------------------
+    def obtener(self, clave, cargar):
+        """
+        Devuelve el valor de la clave. Si no está en caché (o superó el TTL
+        duro) llama a cargar() y guarda el resultado.
+        """
+        ahora = time.monotonic()
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            epoca = self._epoca
+            if entrada is not None:
+                edad = ahora - entrada.guardado
+                if edad < self.ttl_suave:
+                    self.aciertos += 1
+                    return entrada.valor
+                if edad < self.ttl_duro:
+                    self.obsoletos_servidos += 1
+                    if not entrada.refrescando:
+                        entrada.refrescando = True
+                        self._refrescador.submit(self._refrescar, clave, cargar, entrada, epoca)
+                    return entrada.valor
+            self.fallos += 1
+
+        return self._guardar(clave, cargar(), epoca)
+
+    def _refrescar(self, clave, cargar, entrada, epoca):
+        """Tarea del pool de refresco: recarga la clave sin bloquear a nadie."""
+        try:
+            valor = cargar()
+        except Exception as e:
+            with self._candado:
+                self.refrescos_fallidos += 1
+            print("Error al refrescar la caché de", clave, ":", e)
+        else:
+            with self._candado:
+                self.refrescos += 1
+            self._guardar(clave, valor, epoca)
+        finally:
+            entrada.refrescando = False
+
+    def _guardar(self, clave, valor, epoca):
+        """Guarda el valor si no hubo invalidaciones desde epoca. Devuelve el valor guardado."""
+        with self._candado:
+            if epoca != self._epoca:
+                return valor
+            anterior = self._entradas.get(clave)
+        # Comparar dos tablas enteras lleva su tiempo: se hace sin el candado
+        # y después se comprueba que nadie cambió la entrada mientras tanto
+        iguales = anterior is not None and anterior.valor == valor
+        with self._candado:
+            if epoca != self._epoca or self._entradas.get(clave) is not anterior:
+                return valor
+            if iguales:
+                # Un refresco que trae los mismos datos conserva la versión
+                # (y el objeto) para no invalidar lo que dependa de ellos
+                self._entradas[clave] = _Entrada(anterior.valor, time.monotonic(), anterior.version)
+            else:
+                self._entradas[clave] = _Entrada(valor, time.monotonic(), next(self._versiones))
+            return self._entradas[clave].valor
+
+    def version_de(self, valor):
+        """
+        Devuelve (clave, versión) de la entrada cuyo valor es exactamente
+        este objeto, o None si el objeto no salió de la caché.
+        """
+        with self._candado:
+            for clave, entrada in self._entradas.items():
+                if entrada.valor is valor:
+                    return clave, entrada.version
+        return None
+
+    def version_fresca(self, clave):
+        """
+        Versión de la clave si está en caché y no superó el TTL suave, o
+        None (no guardada o a punto de refrescarse). No carga nada.
+        """
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and time.monotonic() - entrada.guardado < self.ttl_suave:
+                return entrada.version
+        return None
+
+    # ------------------- ESCRITURAS CONFIRMADAS -------------------
+    def aplicar(self, clave, cambiar):
+        """
+        Aplica a la entrada una escritura que la API ya confirmó, sin volver a
+        cargarla: cambiar(valor) devuelve el valor nuevo (un objeto nuevo, los
+        valores guardados se comparten entre hilos) o None si no se puede
+        aplicar. En ese caso, o si la clave no está guardada, la entrada se
+        elimina. Devuelve True si se aplicó; la entrada recibe una versión nueva
+        y conserva su instante de carga (el TTL sigue contando).
+        """
+        with self._candado:
+            # Una carga que empezó antes de la escritura ya no debe guardarse
+            self._epoca += 1
+            entrada = self._entradas.pop(clave, None)
+            if entrada is None:
+                return False
+            nuevo = cambiar(entrada.valor)
+            if nuevo is None:
+                return False
+            self._entradas[clave] = _Entrada(nuevo, entrada.guardado, next(self._versiones))
+            self.escrituras_aplicadas += 1
+            return True
+
+    # ------------------- INVALIDACIÓN -------------------
+    def invalidar(self, condicion=None):
+        """
+        Elimina las entradas cuya clave cumple condicion(clave), o todas si
+        no se indica condición.
+        """
+        with self._candado:
+            self._epoca += 1
+            if condicion is None:
+                self._entradas.clear()
+                return
+            for clave in [c for c in self._entradas if condicion(c)]:
+                del self._entradas[clave]
+
+    # ------------------- ESTADÍSTICAS -------------------
+    def estadisticas(self):
+        """Devuelve contadores de uso y la antigüedad (segundos) de cada entrada."""
+        ahora = time.monotonic()
+        with self._candado:
+            return {
+                "entradas": len(self._entradas),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "obsoletos_servidos": self.obsoletos_servidos,
+                "refrescos": self.refrescos,
+                "refrescos_fallidos": self.refrescos_fallidos,
+                "escrituras_aplicadas": self.escrituras_aplicadas,
+                "antiguedad": {
+                    clave: round(ahora - entrada.guardado, 3)
+                    for clave, entrada in self._entradas.items()
+                },
+            }
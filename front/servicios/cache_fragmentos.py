@@ -0,0 +1,118 @@
+# =================== servicios/cache_fragmentos.py ===================
+"""
+Caché del HTML ya renderizado de las tablas de los listados.
+
+Entre dos visitas a /proyecto los datos casi nunca cambian, así que el
+<tbody> que genera Jinja es el mismo. Las plantillas envuelven ese bloque
+en:
+
+    {% call cache_fragmento("proyecto", proyectos) %} ... {% endcall %}
+
+La clave del fragmento es su nombre más la versión de cada listado que
+recibe (ver CacheListas.version_de): cuando un listado cambia, cambia la
+clave y el fragmento viejo deja de usarse. Si alguna lista no viene de la
+caché de listados (un error de la API, una lista filtrada o armada en la
+ruta) el bloque se renderiza normalmente, sin guardar nada. Las listas
+ordenadas por columna guardadas en servicios/orden.py cuentan como
+listados de la caché, con el orden como parte de la clave.
+
+La memoria está acotada: al superar el máximo se expulsan los fragmentos
+usados hace más tiempo (LRU). Las escrituras borran además los fragmentos
+de las tablas afectadas junto con sus listados (cliente_api.invalidar_tabla).
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from markupsafe import Markup
+
+
+class CacheFragmentos:
+    """Caché LRU clave -> HTML, limitada por el tamaño total en bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        # clave -> (html, listados de los que depende)
+        self._fragmentos = OrderedDict()
+        self._candado = threading.Lock()
+
+        # Contadores expuestos por estadisticas()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    # ------------------- LECTURA -------------------
+    def obtener(self, clave, listados, generar):
+        """
+        Devuelve el HTML de la clave. Si no está guardado llama a generar()
+        y lo guarda, anotando los listados (URL) de los que depende.
+        """
+        with self._candado:
+            fragmento = self._fragmentos.get(clave)
+            if fragmento is not None:
+                self._fragmentos.move_to_end(clave)
+                self.aciertos += 1
+                return fragmento[0]
+            self.fallos += 1
+
+        html = generar()
+        tamano = sys.getsizeof(html)
+        if tamano > self.max_bytes:
+            return html
+        with self._candado:
+            if clave not in self._fragmentos:
+                self._fragmentos[clave] = (html, listados)
+                self.bytes += tamano
+            while self.bytes > self.max_bytes:
+                _, (viejo, _) = self._fragmentos.popitem(last=False)
+                self.bytes -= sys.getsizeof(viejo)
+                self.expulsiones += 1
+        return html
+
+    # ------------------- INVALIDACIÓN -------------------
+    def invalidar(self, condicion=None):
+        """
+        Elimina los fragmentos que dependen de algún listado que cumple
+        condicion(url), o todos si no se indica condición.
+        """
+        with self._candado:
+            if condicion is None:
+                self._fragmentos.clear()
+                self.bytes = 0
+                return
+            for clave in [c for c, (_, listados) in self._fragmentos.items()
+                          if any(condicion(url) for url in listados)]:
+                html, _ = self._fragmentos.pop(clave)
+                self.bytes -= sys.getsizeof(html)
+
+    # ------------------- ESTADÍSTICAS -------------------
+    def estadisticas(self):
+        with self._candado:
+            return {
+                "fragmentos": len(self._fragmentos),
+                "bytes": self.bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expulsiones": self.expulsiones,
+            }
+
+
+def instalar(aplicacion):
+    """Registra cache_fragmento() como función global de las plantillas."""
+    from servicios import cliente_api, orden, parcial
+
+    def cache_fragmento(nombre, *listas, caller):
+        # Un listado de la caché, o uno de ellos ya ordenado por columna (servicios/orden.py)
+        versiones = [cliente_api.cache.version_de(lista) or orden.cache.version_de(lista) for lista in listas]
+        if not listas or None in versiones:
+            html = caller()
+        else:
+            clave = (nombre,) + tuple(versiones)
+            listados = tuple(url for url, _ in versiones)
+            html = Markup(cliente_api.fragmentos.obtener(clave, listados, lambda: str(caller())))
+        # Respuesta parcial de una escritura: no hace falta el resto de la página
+        parcial.capturar(html)
+        return html
+
+    aplicacion.jinja_env.globals["cache_fragmento"] = cache_fragmento
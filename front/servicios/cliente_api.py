@@ -0,0 +1,609 @@
+# =================== servicios/cliente_api.py ===================
+"""
+Cliente HTTP compartido para consumir la API en C#.
+
+Todas las rutas leen los datos de la API por medio de este módulo. Las
+peticiones GET idénticas que llegan al mismo tiempo (desde distintos hilos
+del mismo worker) se agrupan en una sola llamada: el primer hilo hace la
+petición y los demás esperan y reciben el mismo resultado ya decodificado.
+Así, una ráfaga de N cargas de /proyecto cuesta una llamada por recurso
+en lugar de N.
+
+Los listados completos (/api/{tabla}) se guardan además en una caché con
+refresco en segundo plano (ver servicios/cache_api.py). Las escrituras
+(crear, actualizar, eliminar) pasan también por aquí: las actualizaciones
+y eliminaciones confirmadas se aplican al listado en caché y el resto
+invalida los listados afectados.
+
+La caché es propia de cada proceso. Con varios workers, cada escritura
+deja además una marca en CACHE_ESCRITURAS_DIR y antes de cada petición
+los demás procesos descartan los listados de las tablas marcadas desde la
+última vez (ver sincronizar_escrituras).
+
+Los datos devueltos se comparten entre hilos: deben tratarse como de solo
+lectura. Para modificar un registro antes de mostrarlo se copia primero,
+por ejemplo con dict(datos[0]).
+"""
+import os
+import re
+import threading
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+import requests
+from flask import g, has_request_context
+from requests.adapters import HTTPAdapter
+
+from servicios import concurrencia, json_api, metricas, traza, validacion
+from servicios.cache_api import CacheListas
+from servicios.cache_fragmentos import CacheFragmentos
+
+# Tiempo máximo (en segundos) que se espera una respuesta de la API.
+# Evita que un hilo, y todos los que esperan su resultado, queden colgados.
+TIEMPO_ESPERA = 30
+
+# Conexiones keep-alive con la API que se conservan abiertas. Con gevent un
+# proceso atiende cientos de peticiones a la vez: con el pool por defecto
+# (10) las conexiones sobrantes se cerrarían y se abrirían en cada llamada.
+CONEXIONES_API = int(os.environ.get("API_CONEXIONES", "100" if concurrencia.modo_verde() else "10"))
+
+# Sesión compartida: reutiliza las conexiones HTTP (keep-alive) con la API.
+# Es segura entre hilos y entre greenlets: urllib3 reparte las conexiones
+# con una cola y la API no envía cookies que la sesión deba guardar.
+_sesion = requests.Session()
+_sesion.mount("http://", HTTPAdapter(pool_maxsize=CONEXIONES_API))
+_sesion.mount("https://", HTTPAdapter(pool_maxsize=CONEXIONES_API))
+
+# Tiempos de vida (en segundos) de los listados en caché: pasado el TTL
+# suave se sirven obsoletos mientras se refrescan; pasado el duro se espera.
+TTL_SUAVE = 30
+TTL_DURO = 300
+
+cache = CacheListas(ttl_suave=TTL_SUAVE, ttl_duro=TTL_DURO, hilos_refresco=2)
+
+# HTML de las tablas ya renderizado, por versión de los listados que muestra
+# (ver servicios/cache_fragmentos.py). Memoria máxima en MB por proceso.
+FRAGMENTOS_MAX_MB = float(os.environ.get("FRAGMENTOS_MAX_MB", "32"))
+
+fragmentos = CacheFragmentos(max_bytes=int(FRAGMENTOS_MAX_MB * 1024 * 1024))
+
+# Peticiones GET en curso, indexadas por URL
+_en_vuelo = {}
+_candado = threading.Lock()
+
+
+class _Vuelo:
+    """Petición GET en curso cuyo resultado comparten todos los hilos que la esperan."""
+
+    __slots__ = ("evento", "resultado", "error")
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+def _llamar(metodo, url, **opciones):
+    """Hace la petición HTTP a la API y anota su duración en las métricas."""
+    inicio = time.perf_counter()
+    codigo = "error"
+    try:
+        respuesta = _sesion.request(metodo, url, timeout=TIEMPO_ESPERA, **opciones)
+        codigo = respuesta.status_code
+        # Con stream=True el cuerpo aún no se leyó: sus bytes no se cuentan
+        traza.anotar(origen="api", bytes=0 if opciones.get("stream") else len(respuesta.content))
+        return respuesta
+    finally:
+        metricas.registrar_llamada_api(tabla_de(url), metodo, codigo, time.perf_counter() - inicio)
+
+
+def _pedir_json(url):
+    """Hace el GET real a la API y devuelve (codigo_estado, json decodificado o None)."""
+    respuesta = _llamar("GET", url)
+    if respuesta.status_code != 200 or not respuesta.content:
+        return respuesta.status_code, None
+    return respuesta.status_code, json_api.cargar(respuesta.content)
+
+
+def _compartido(clave, pedir):
+    """
+    Devuelve el resultado de pedir(), compartido con los hilos que piden la
+    misma clave mientras la petición sigue en curso. Los errores de conexión
+    o de decodificación se propagan a todos los que esperaban.
+    """
+    with _candado:
+        vuelo = _en_vuelo.get(clave)
+        lider = vuelo is None
+        if lider:
+            vuelo = _Vuelo()
+            _en_vuelo[clave] = vuelo
+
+    if not lider:
+        traza.anotar(origen="compartida")
+        vuelo.evento.wait()
+        if vuelo.error is not None:
+            raise vuelo.error
+        return vuelo.resultado
+
+    try:
+        vuelo.resultado = pedir()
+    except Exception as e:
+        vuelo.error = e
+        raise
+    finally:
+        # Se retira antes de despertar a los demás: una petición posterior
+        # volverá a consultar la API en lugar de recibir un resultado viejo.
+        # Si una escritura ya lo retiró, puede haber otro GET nuevo en su lugar.
+        with _candado:
+            if _en_vuelo.get(clave) is vuelo:
+                del _en_vuelo[clave]
+        vuelo.evento.set()
+
+    return vuelo.resultado
+
+
+def obtener_json(url):
+    """
+    Devuelve (codigo_estado, cuerpo) del GET a la URL indicada.
+
+    Si ya hay un GET idéntico en curso, espera a que termine y reutiliza su
+    resultado en lugar de repetir la llamada.
+    """
+    return _compartido(url, lambda: _pedir_json(url))
+
+
+class ErrorApi(Exception):
+    """La API respondió con un error del servidor (5xx)."""
+
+
+def partes_url(url):
+    """
+    Devuelve los segmentos de la ruta después de /api/.
+    Ej.: http://localhost:5031/api/proyecto/id/3 -> ["proyecto", "id", "3"]
+    """
+    segmentos = [s for s in urlsplit(url).path.split("/") if s]
+    if segmentos and segmentos[0] == "api":
+        segmentos = segmentos[1:]
+    return segmentos
+
+
+def tabla_de(url):
+    """Nombre de la tabla (o vista) a la que apunta una URL de la API."""
+    segmentos = partes_url(url)
+    return segmentos[0] if segmentos else ""
+
+
+def es_listado(url):
+    """True si la URL pide el listado completo de una tabla (/api/{tabla})."""
+    return len(partes_url(url)) == 1 and not urlsplit(url).query
+
+
+def _cargar_datos(url):
+    """Descarga la lista "datos" de la URL. Lanza ErrorApi ante un 5xx."""
+    estado, cuerpo = obtener_json(url)
+    if estado >= 500:
+        raise ErrorApi(f"La API respondió {estado} para {url}")
+    if not cuerpo:
+        return []
+    return cuerpo.get("datos", [])
+
+
+def obtener_datos(url):
+    """
+    Devuelve la lista "datos" de la respuesta de la API, o [] si la
+    respuesta no es 200 o no trae registros. Los listados completos se
+    sirven desde la caché.
+    """
+    try:
+        with traza.llamada("GET", url):
+            if es_listado(url):
+                datos = cache.obtener(url, lambda: _cargar_datos(url))
+                # Versión del listado para el ETag de la página (servicios/validacion.py)
+                version = cache.version_de(datos)
+                validacion.usar_listado(url, version[1] if version else None)
+                return datos
+            validacion.sin_validador()
+            return _cargar_datos(url)
+    except ErrorApi as e:
+        validacion.sin_validador()
+        print("Error al consultar la API:", e)
+        return []
+
+
+# Tamaño de los trozos que se leen de la respuesta en iterar_datos()
+TROZO_LECTURA = 64 * 1024
+
+
+def iterar_datos(url):
+    """
+    Genera uno a uno los registros de la lista "datos" del GET a la URL,
+    decodificándolos a medida que llegan (ver servicios/json_api.py). Para
+    exportaciones y agregaciones sobre tablas grandes: no pasa por la caché
+    ni arma la lista completa, así que la memoria no depende del tamaño de
+    la tabla. Si la respuesta no es 200 no genera nada; ante un 5xx lanza
+    ErrorApi.
+    """
+    with traza.llamada("GET", url):
+        respuesta = _llamar("GET", url, stream=True)
+    try:
+        if respuesta.status_code >= 500:
+            raise ErrorApi(f"La API respondió {respuesta.status_code} para {url}")
+        if respuesta.status_code != 200:
+            return
+        yield from json_api.iterar_datos(respuesta.iter_content(TROZO_LECTURA))
+    finally:
+        respuesta.close()
+
+
+# ------------------- PROYECCIÓN DE COLUMNAS -------------------
+# Motor de la base de datos detrás de la API (DatabaseProvider en
+# appsettings.json): decide cómo se limita la consulta (TOP o LIMIT).
+MOTOR_BD = os.environ.get("API_MOTOR_BD", "SqlServer")
+
+# Filas de una consulta proyectada: las mismas que trae /api/{tabla} sin ?limite=
+LIMITE_LISTADO = 1000
+
+# Tras un rechazo de la API, segundos durante los que esa proyección se
+# sustituye por el listado completo antes de volver a intentarla
+REINTENTO_PROYECCION = TTL_DURO
+
+_IDENTIFICADOR = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# clave de la proyección -> momento (time.monotonic) en que la API la rechazó
+_proyecciones_fallidas = {}
+
+
+def _validar_identificadores(*nombres):
+    for nombre in nombres:
+        if not _IDENTIFICADOR.match(nombre):
+            raise ValueError(f"Identificador no válido en la consulta: {nombre!r}")
+
+
+def consulta_columnas(tabla, columnas=None, filtros=()):
+    """
+    SELECT de esas columnas de la tabla (todas si no se indican), con el
+    límite como parámetro @limite y, por cada campo de filtros, la condición
+    "campo = @filtro_campo". Los nombres se validan: no pueden llevar nada
+    más que letras, dígitos y "_", y los valores viajan siempre como
+    parámetros, así que no hay forma de inyectar SQL por aquí.
+    """
+    _validar_identificadores(tabla, *(columnas or ()), *filtros)
+    lista = ", ".join(columnas) if columnas else "*"
+    donde = " AND ".join(f"{campo} = @filtro_{campo}" for campo in filtros)
+    donde = f" WHERE {donde}" if donde else ""
+    if MOTOR_BD.lower() == "sqlserver":
+        return f"SELECT TOP (@limite) {lista} FROM {tabla}{donde}"
+    return f"SELECT {lista} FROM {tabla}{donde} LIMIT @limite"
+
+
+def url_proyeccion(url, columnas):
+    """Clave en la caché de la proyección: .../api/usuario?columnas=id,email"""
+    return f"{url_listado(url)}?columnas={','.join(columnas)}"
+
+
+def _consultar(url, columnas, filtros=None):
+    """
+    Ejecuta la consulta en /api/consultas. Devuelve (codigo_estado, filas);
+    un 404 (la consulta no devolvió nada) es una lista vacía.
+    """
+    filtros = filtros or {}
+    partes = urlsplit(url)
+    parametros = {f"filtro_{campo}": valor for campo, valor in filtros.items()}
+    cuerpo = {"consulta": consulta_columnas(tabla_de(url), columnas, filtros),
+              "parametros": dict(parametros, limite=LIMITE_LISTADO)}
+    respuesta = _llamar("POST", f"{partes.scheme}://{partes.netloc}/api/consultas/ejecutarconsultaparametrizada",
+                        json=cuerpo)
+    if respuesta.status_code == 404:
+        return 404, []
+    if respuesta.status_code != 200 or not respuesta.content:
+        return respuesta.status_code, None
+    resultado = json_api.cargar(respuesta.content)
+    return 200, resultado.get("resultados", resultado.get("Resultados")) or []
+
+
+def _cargar_columnas(clave, url, columnas):
+    """Filas de la proyección. Lanza ErrorApi si la API la rechaza."""
+    estado, filas = _compartido(clave, lambda: _consultar(url, columnas))
+    if filas is None:
+        raise ErrorApi(f"La API respondió {estado} a la proyección {clave}")
+    return filas
+
+
+def obtener_columnas(url, columnas):
+    """
+    Como obtener_datos(url) para un listado completo, pero cada fila trae
+    solo las columnas indicadas. Para las listas de los desplegables, que
+    usan dos o tres campos de tablas con muchos más: se transfiere y se
+    decodifica una fracción del listado.
+
+    La proyección se guarda en la caché como un listado más (misma
+    invalidación, refresco y versión para los ETag y fragmentos). Si la API
+    la rechaza (una columna que no existe en la base, consultas
+    deshabilitadas) se avisa una vez y se usa el listado completo durante
+    REINTENTO_PROYECCION segundos.
+    """
+    clave = url_proyeccion(url, columnas)
+    rechazo = _proyecciones_fallidas.get(clave)
+    if rechazo is not None and time.monotonic() - rechazo < REINTENTO_PROYECCION:
+        return obtener_datos(url)
+    try:
+        with traza.llamada("POST", clave):
+            datos = cache.obtener(clave, lambda: _cargar_columnas(clave, url, columnas))
+    except ErrorApi as e:
+        if rechazo is None:
+            print("Proyección rechazada, se usa el listado completo:", e)
+        _proyecciones_fallidas[clave] = time.monotonic()
+        return obtener_datos(url)
+    _proyecciones_fallidas.pop(clave, None)
+    version = cache.version_de(datos)
+    validacion.usar_listado(clave, version[1] if version else None)
+    return datos
+
+
+# ------------------- CONSULTAS FILTRADAS -------------------
+def filtrar(url, filtros, columnas=None):
+    """
+    Filas de la tabla de la URL cuyos campos son iguales a los de filtros
+    ({campo: valor}), sin descargar el listado completo para recorrerlo:
+
+    - un solo filtro y todas las columnas: GET /api/{tabla}/{campo}/{valor};
+    - si no, una consulta parametrizada en /api/consultas con un WHERE por
+      campo (ver consulta_columnas). Los valores viajan como parámetros.
+
+    No pasa por la caché: las búsquedas son de una sola vez y la página que
+    las muestra queda sin ETag. Si la API rechaza la consulta se filtra el
+    listado completo (también limitado a LIMITE_LISTADO filas).
+    """
+    filtros = {campo: str(valor) for campo, valor in filtros.items()}
+    if len(filtros) == 1 and not columnas:
+        (campo, valor), = filtros.items()
+        _validar_identificadores(campo)
+        return obtener_datos(f"{url_listado(url)}/{campo}/{quote(valor, safe='')}")
+
+    clave = f"{url_listado(url)}?{urlencode(sorted(filtros.items()))}&columnas={','.join(columnas or ['*'])}"
+    validacion.sin_validador()
+    try:
+        with traza.llamada("POST", clave):
+            estado, filas = _compartido(clave, lambda: _consultar(url, columnas, filtros))
+        if filas is not None:
+            return filas
+        raise ErrorApi(f"La API respondió {estado} a la consulta {clave}")
+    except ErrorApi as e:
+        print("Consulta filtrada rechazada, se filtra el listado completo:", e)
+    filas = [f for f in obtener_datos(url_listado(url)) if all(_coincide(f, c, v) for c, v in filtros.items())]
+    return [{c: f.get(c) for c in columnas} for f in filas] if columnas else filas
+
+
+# ------------------- ESCRITURAS -------------------
+# Funciones que se llaman con el nombre de la tabla tras cada escritura que
+# la API confirmó (servicios/informes.py marca así sus informes como viejos)
+al_escribir = []
+
+
+def invalidar_tabla(tabla, conservar_listado=False):
+    """
+    Quita de la caché el listado de la tabla y todas las vistas (view_*),
+    que pueden combinar datos de esa tabla con otras, junto con los
+    fragmentos HTML renderizados a partir de ellos, y las proyecciones de
+    columnas de la tabla. Con conservar_listado el listado completo de la
+    tabla se mantiene (la escritura ya se le aplicó).
+
+    También desengancha los GET de esas URL que siguen en curso: empezaron
+    antes de la escritura, así que las peticiones que lleguen después deben
+    hacer su propia llamada en lugar de esperar un resultado ya viejo.
+    """
+    def afectada(url):
+        return tabla_de(url) == tabla or tabla_de(url).startswith("view_")
+
+    def descartar(url):
+        # Las proyecciones (?columnas=) no reciben la escritura: se descartan siempre
+        return afectada(url) and not (conservar_listado and tabla_de(url) == tabla and es_listado(url))
+
+    with _candado:
+        for url in [u for u in _en_vuelo if afectada(u)]:
+            del _en_vuelo[url]
+    cache.invalidar(descartar)
+    fragmentos.invalidar(afectada)
+
+
+def url_listado(url):
+    """URL del listado completo de la tabla de una URL: .../api/proyecto/id/3 -> .../api/proyecto"""
+    partes = urlsplit(url)
+    return f"{partes.scheme}://{partes.netloc}/api/{tabla_de(url)}"
+
+
+def _coincide(fila, clave, valor):
+    return clave in fila and str(fila[clave]) == valor
+
+
+def _aplicar_escritura(metodo, url, datos, respuesta):
+    """
+    Aplica al listado en caché una escritura confirmada (PUT o DELETE sobre
+    /api/{tabla}/{clave}/{valor}) en lugar de descartarlo. Devuelve True si
+    lo logró; si no, el llamador invalida el listado como siempre.
+
+    - DELETE: se quitan las filas con esa clave.
+    - PUT: la API no devuelve el registro, así que se relee solo esa clave
+      y se reemplazan sus filas (con los tipos y formatos de la API, no los
+      del formulario).
+    - POST: la API no devuelve el id creado; no hay forma segura de insertar
+      la fila, se invalida.
+    """
+    segmentos = partes_url(url)
+    if metodo not in ("PUT", "DELETE") or respuesta.status_code != 200 or len(segmentos) != 3:
+        return False
+    _, clave, valor = segmentos
+    if metodo == "PUT" and clave in (datos or {}) and str(datos[clave]) != valor:
+        return False  # cambió la propia clave: las filas viejas ya no se encuentran por ella
+
+    nuevas = None
+    if metodo == "PUT":
+        # Un GET de esa clave que empezó antes de la escritura traería el registro viejo
+        with _candado:
+            _en_vuelo.pop(url, None)
+        try:
+            with traza.llamada("GET", url):
+                nuevas = _cargar_datos(url)
+        except Exception as e:
+            print("No se pudo releer el registro actualizado:", e)
+            return False
+        if not nuevas:
+            return False
+
+    def cambiar(filas):
+        quedan = [f for f in filas if not _coincide(f, clave, valor)]
+        if len(quedan) == len(filas):
+            return None  # ninguna fila coincide: la caché no refleja lo que la API cambió
+        if nuevas is None:
+            return quedan
+        if len(filas) - len(quedan) != len(nuevas):
+            return None
+        # Las filas actualizadas quedan en el lugar que ocupaban las viejas
+        pendientes = iter(nuevas)
+        return [next(pendientes) if _coincide(f, clave, valor) else f for f in filas]
+
+    return cache.aplicar(url_listado(url), cambiar)
+
+
+def _enviar(metodo, url, datos=None):
+    """
+    Envía una escritura a la API. Si se pudo aplicar al listado en caché este
+    sigue activo con una versión nueva; si no, se invalida. Las vistas
+    (view_*) se invalidan siempre.
+
+    Anota en g.escrituras_ok si todas las escrituras de la petición salieron
+    bien: servicios/parcial.py solo responde en parcial en ese caso.
+    """
+    respuesta = None
+    try:
+        with traza.llamada(metodo, url):
+            respuesta = _llamar(metodo, url, json=datos)
+        return respuesta
+    finally:
+        aplicada = respuesta is not None and _aplicar_escritura(metodo, url, datos, respuesta)
+        invalidar_tabla(tabla_de(url), conservar_listado=aplicada)
+        _marcar_escritura(tabla_de(url))
+        if has_request_context():
+            g.escrituras_ok = respuesta is not None and respuesta.ok and g.get("escrituras_ok", True)
+        if respuesta is not None and respuesta.ok:
+            for observador in al_escribir:
+                try:
+                    observador(tabla_de(url))
+                except Exception as e:
+                    # La API ya aplicó la escritura: se informa y se sigue
+                    print("Falló un observador de escrituras:", e)
+
+
+# ------------------- INVALIDACIÓN ENTRE WORKERS -------------------
+# invalidar_tabla() solo limpia la caché del proceso que hizo la escritura.
+# Para que los demás workers no sirvan el listado viejo hasta el TTL duro,
+# cada escritura toca ESCRITURAS_DIR/<tabla> y ESCRITURAS_DIR/_todas.
+# Antes de cada petición el proceso mira solo _todas; si cambió desde la
+# última vez, revisa las marcas de las tablas e invalida las que cambiaron.
+# Los workers de un mismo servidor comparten la carpeta; con varios
+# servidores tiene que ser una carpeta compartida o el cambio se verá al
+# vencer el TTL suave del listado en los demás.
+CARPETA_FRONT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ESCRITURAS_DIR = os.environ.get("CACHE_ESCRITURAS_DIR", os.path.join(CARPETA_FRONT, "escrituras"))
+_MARCA_GENERAL = "_todas"
+
+# archivo de marca -> st_mtime_ns que este proceso ya tuvo en cuenta
+_marcas_vistas = {}
+
+
+def _marcar_escritura(tabla):
+    """Deja constancia para los demás procesos de que la tabla cambió."""
+    if not _IDENTIFICADOR.match(tabla):
+        return
+    ahora = time.time_ns()
+    try:
+        os.makedirs(ESCRITURAS_DIR, exist_ok=True)
+        for nombre in (tabla, _MARCA_GENERAL):
+            camino = os.path.join(ESCRITURAS_DIR, nombre)
+            with open(camino, "a"):
+                os.utime(camino, ns=(ahora, ahora))
+            # La escritura propia ya se aplicó a esta caché: no hay que volver a invalidarla
+            with _candado:
+                _marcas_vistas[nombre] = ahora
+    except OSError as e:
+        print("No se pudo marcar la escritura para los demás procesos:", e)
+
+
+def sincronizar_escrituras():
+    """Invalida los listados de las tablas que otro proceso escribió desde la última revisión."""
+    try:
+        general = os.stat(os.path.join(ESCRITURAS_DIR, _MARCA_GENERAL)).st_mtime_ns
+    except OSError:
+        return
+    if _marcas_vistas.get(_MARCA_GENERAL) == general:
+        return
+    try:
+        with os.scandir(ESCRITURAS_DIR) as entradas:
+            marcas = {e.name: e.stat().st_mtime_ns for e in entradas if e.is_file()}
+    except OSError as e:
+        print("No se pudieron leer las marcas de escritura:", e)
+        return
+    cambiadas = []
+    with _candado:
+        for nombre, marca in marcas.items():
+            if _marcas_vistas.get(nombre) != marca:
+                _marcas_vistas[nombre] = marca
+                if nombre != _MARCA_GENERAL:
+                    cambiadas.append(nombre)
+    for tabla in cambiadas:
+        invalidar_tabla(tabla)
+
+
+def instalar(aplicacion):
+    """Revisa las escrituras de los demás procesos antes de cada petición."""
+    aplicacion.before_request(sincronizar_escrituras)
+
+
+def crear(url, datos):
+    """POST de un registro nuevo. Devuelve la respuesta de la API."""
+    return _enviar("POST", url, datos)
+
+
+def actualizar(url, datos):
+    """PUT sobre un registro existente. Devuelve la respuesta de la API."""
+    return _enviar("PUT", url, datos)
+
+
+def eliminar(url):
+    """DELETE de un registro. Devuelve la respuesta de la API."""
+    return _enviar("DELETE", url)
+
+
+# ------------------- MÉTRICAS DE LA CACHÉ -------------------
+def _metricas_cache():
+    """Colector para /metrics con los contadores de la caché de listados."""
+    e = cache.estadisticas()
+    antiguedades = e["antiguedad"].values()
+    return [
+        ("cache_listas_aciertos_total", "counter", "Listados servidos frescos desde la caché.", [((), e["aciertos"])]),
+        ("cache_listas_fallos_total", "counter", "Listados que hubo que pedir a la API.", [((), e["fallos"])]),
+        ("cache_listas_obsoletos_total", "counter", "Listados servidos obsoletos mientras se refrescan.", [((), e["obsoletos_servidos"])]),
+        ("cache_listas_refrescos_total", "counter", "Refrescos en segundo plano por resultado.",
+         [((("resultado", "ok"),), e["refrescos"]), ((("resultado", "error"),), e["refrescos_fallidos"])]),
+        ("cache_listas_escrituras_aplicadas_total", "counter", "Escrituras aplicadas al listado en caché sin recargarlo.",
+         [((), e["escrituras_aplicadas"])]),
+        ("cache_listas_entradas", "gauge", "Listados guardados en la caché.", [((), e["entradas"])]),
+        ("cache_listas_antiguedad_max_segundos", "gauge", "Antigüedad del listado más viejo en caché.",
+         [((), max(antiguedades, default=0))]),
+    ]
+
+
+def _metricas_fragmentos():
+    """Colector para /metrics con los contadores de la caché de fragmentos HTML."""
+    e = fragmentos.estadisticas()
+    return [
+        ("cache_fragmentos_aciertos_total", "counter", "Tablas servidas ya renderizadas.", [((), e["aciertos"])]),
+        ("cache_fragmentos_fallos_total", "counter", "Tablas que hubo que renderizar.", [((), e["fallos"])]),
+        ("cache_fragmentos_expulsiones_total", "counter", "Fragmentos expulsados por falta de memoria.", [((), e["expulsiones"])]),
+        ("cache_fragmentos_entradas", "gauge", "Fragmentos guardados.", [((), e["fragmentos"])]),
+        ("cache_fragmentos_bytes", "gauge", "Memoria ocupada por los fragmentos.", [((), e["bytes"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_cache)
+metricas.registro.agregar_colector(_metricas_fragmentos)
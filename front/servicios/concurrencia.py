@@ -0,0 +1,103 @@
+# =================== servicios/concurrencia.py ===================
+"""
+Soporte para el modo cooperativo con gevent (WEB_MODO=gevent).
+
+En ese modo gevent reemplaza (monkey patching) socket, threading, time.sleep,
+etc.: cada petición corre en un greenlet y, mientras espera a la API, el
+proceso atiende otras. Un solo proceso sostiene así cientos de páginas
+cargando a la vez en lugar de una por hilo.
+
+Condición para que sea seguro: el parche debe aplicarse ANTES de importar
+la aplicación. Los candados que crean cliente_api, cache_api y metricas al
+importarse deben ser los de gevent; un candado del sistema tomado por un
+greenlet que cede el control bloquearía todo el proceso. verificar()
+comprueba que sea así.
+"""
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+def modo_verde():
+    """True si gevent ya parcheó threading (servidor en modo gevent)."""
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+def local_por_hilo():
+    """
+    threading.local ligado al hilo del sistema operativo. Con gevent,
+    threading.local pasa a ser uno por greenlet (uno por petición); aquí se
+    usa el original para que los acumuladores no crezcan con cada petición.
+    """
+    if modo_verde():
+        return sys.modules["gevent.monkey"].get_original("threading", "local")()
+    return threading.local()
+
+
+def referencia_hilo():
+    """
+    Función que devuelve el hilo actual mientras siga vivo, o None.
+    Con gevent los hilos del sistema duran lo que el proceso, así que la
+    referencia no caduca.
+    """
+    if modo_verde():
+        return lambda: True
+    return weakref.ref(threading.current_thread())
+
+
+def candado_del_sistema():
+    """
+    threading.Lock del sistema operativo, para datos compartidos con los
+    hilos de ejecutor_de_cpu(). Se toma solo un instante, así que un greenlet
+    que lo espera no llega a frenar el proceso.
+    """
+    if modo_verde():
+        return sys.modules["gevent.monkey"].get_original("threading", "Lock")()
+    return threading.Lock()
+
+
+def ejecutor_de_cpu(hilos, prefijo):
+    """
+    Pool de hilos para trabajo de CPU en segundo plano. Con gevent los hilos
+    de un ThreadPoolExecutor son greenlets y ese trabajo frenaría todas las
+    peticiones del proceso; el ThreadPoolExecutor de gevent usa hilos del
+    sistema.
+    """
+    if modo_verde():
+        from gevent.threadpool import ThreadPoolExecutor as EjecutorNativo
+        return EjecutorNativo(max_workers=hilos)
+    return ThreadPoolExecutor(max_workers=hilos, thread_name_prefix=prefijo)
+
+
+def _es_de_gevent(objeto):
+    return type(objeto).__module__.startswith("gevent")
+
+
+def verificar():
+    """
+    Comprueba que el modo gevent esté bien aplicado. Devuelve la lista de
+    problemas encontrados (vacía si todo está bien).
+    """
+    import socket
+
+    from servicios import cliente_api, metricas
+
+    if not modo_verde():
+        return ["gevent no parcheó threading: falta monkey.patch_all() antes de importar la aplicación"]
+
+    problemas = []
+    with socket.socket() as prueba:
+        cooperativo = _es_de_gevent(prueba)
+    if not cooperativo:
+        problemas.append("socket no es cooperativo: las llamadas a la API bloquearían el proceso")
+    candados = {
+        "cliente_api._candado": cliente_api._candado,
+        "cliente_api.cache._candado": cliente_api.cache._candado,
+        "metricas.registro._candado": metricas.registro._candado,
+    }
+    for nombre, candado in candados.items():
+        if not _es_de_gevent(candado):
+            problemas.append(f"{nombre} es un candado del sistema: la aplicación se importó antes del parche")
+    return problemas
@@ -0,0 +1,126 @@
+# =================== servicios/contrasenas.py ===================
+"""
+Cifrado y verificación de contraseñas fuera del hilo de la petición.
+
+generate_password_hash y check_password_hash son lentos a propósito
+(scrypt): cada llamada ocupa la CPU decenas de milisegundos y, con el GIL
+tomado, frena al resto de peticiones del worker. Aquí corren en un pool
+propio de CONTRASENAS_PROCESOS procesos y la petición solo espera el
+resultado.
+
+La cola está acotada: con MAX_PENDIENTES operaciones en curso, una nueva
+espera como mucho ESPERA_COLA segundos a que se libere un lugar y si no
+lanza Saturado (la vista responde 503 en lugar de encolar sin límite).
+
+Con gevent se usan hilos del sistema en lugar de procesos
+(multiprocessing no convive con el parche); scrypt libera el GIL mientras
+calcula, así que tampoco frena a los greenlets.
+"""
+import hmac
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from servicios import concurrencia, metricas
+
+# Procesos que cifran y verifican contraseñas
+PROCESOS = int(os.environ.get("CONTRASENAS_PROCESOS", str(min(2, os.cpu_count() or 1))))
+
+# Operaciones en curso o en cola como máximo, y segundos que espera una nueva por un lugar
+MAX_PENDIENTES = int(os.environ.get("CONTRASENAS_COLA", "32"))
+ESPERA_COLA = 5.0
+
+
+class Saturado(Exception):
+    """La cola de contraseñas está llena: hay que reintentar más tarde."""
+
+
+_candado = threading.Lock()
+_lugares = threading.BoundedSemaphore(MAX_PENDIENTES)
+_ejecutor = None
+_estadisticas = {"cifradas": 0, "verificadas": 0, "rechazadas": 0}
+
+
+def _obtener_ejecutor():
+    global _ejecutor
+    with _candado:
+        if _ejecutor is None:
+            if concurrencia.modo_verde():
+                _ejecutor = concurrencia.ejecutor_de_cpu(PROCESOS, "contrasenas")
+            else:
+                # spawn: el proceso web tiene hilos (trabajos, caché), no se clona con fork
+                _ejecutor = ProcessPoolExecutor(max_workers=PROCESOS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return _ejecutor
+
+
+def _ejecutar(funcion, *argumentos):
+    """Corre funcion en el pool respetando el límite de la cola."""
+    global _ejecutor
+    if not _lugares.acquire(timeout=ESPERA_COLA):
+        with _candado:
+            _estadisticas["rechazadas"] += 1
+        raise Saturado("Hay demasiadas contraseñas en proceso, intente de nuevo en unos segundos")
+    try:
+        ejecutor = _obtener_ejecutor()
+        try:
+            return ejecutor.submit(funcion, *argumentos).result()
+        except BrokenProcessPool:
+            # Murió un proceso del pool: se crea otro para la próxima
+            with _candado:
+                if _ejecutor is ejecutor:
+                    _ejecutor = None
+            raise
+    finally:
+        _lugares.release()
+
+
+def cifrar(contrasena):
+    """Hash de la contraseña (generate_password_hash) calculado en el pool."""
+    resultado = _ejecutar(generate_password_hash, contrasena)
+    with _candado:
+        _estadisticas["cifradas"] += 1
+    return resultado
+
+
+def es_hash(valor):
+    """True si el valor tiene el formato de generate_password_hash (metodo$sal$hash)."""
+    return isinstance(valor, str) and valor.count("$") >= 2
+
+
+def verificar(guardada, contrasena):
+    """
+    True si la contraseña corresponde a la guardada. Las contraseñas de
+    usuarios antiguos guardadas sin cifrar se comparan directamente (sin
+    pasar por el pool).
+    """
+    if not guardada or contrasena is None:
+        return False
+    if not es_hash(guardada):
+        return hmac.compare_digest(str(guardada).encode("utf-8"), contrasena.encode("utf-8"))
+    try:
+        correcta = _ejecutar(check_password_hash, guardada, contrasena)
+    except ValueError:
+        # Hash de un método que werkzeug no conoce
+        return False
+    with _candado:
+        _estadisticas["verificadas"] += 1
+    return correcta
+
+
+def _metricas_contrasenas():
+    """Colector para /metrics con los contadores del pool de contraseñas."""
+    with _candado:
+        e = dict(_estadisticas)
+    return [
+        ("contrasenas_cifradas_total", "counter", "Contraseñas cifradas en el pool.", [((), e["cifradas"])]),
+        ("contrasenas_verificadas_total", "counter", "Contraseñas verificadas en el pool.", [((), e["verificadas"])]),
+        ("contrasenas_rechazadas_total", "counter", "Operaciones rechazadas por tener la cola llena.", [((), e["rechazadas"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_contrasenas)
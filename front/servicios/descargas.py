@@ -0,0 +1,105 @@
+# =================== servicios/descargas.py ===================
+"""
+Envío de los archivos del almacén (servicios/almacen.py) al navegador.
+
+Los adjuntos de los entregables pueden pesar cientos de MB, así que el
+contenido nunca pasa por Python si el servidor puede evitarlo:
+- con gunicorn o waitress la respuesta usa wsgi.file_wrapper, que envía el
+  archivo con sendfile (sin copiarlo a memoria del proceso) desde la
+  posición actual del archivo y hasta Content-Length, así que también
+  sirve para un rango;
+- con servidores sin file_wrapper (el de desarrollo, gevent) se lee por
+  trozos de TROZO bytes, sin pasar nunca de lo pedido.
+
+El ETag es el hash del contenido (fuerte: el mismo ETag es siempre el mismo
+archivo, byte a byte) y Last-Modified la fecha del objeto en disco. Se
+atienden If-None-Match / If-Modified-Since (304) y las peticiones Range de
+un solo rango (206, o 416 si no es satisfacible), con If-Range para que una
+descarga reanudada no mezcle dos versiones. Varios rangos en una petición
+se responden con el archivo completo, como permite el RFC 9110.
+"""
+import os
+import unicodedata
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from flask import current_app, request
+from werkzeug.http import is_resource_modified, parse_if_range_header
+
+# Bytes que se leen por vez cuando el servidor no ofrece sendfile
+TROZO = 256 * 1024
+
+
+def _disposicion(nombre):
+    """Parámetros de Content-Disposition, con filename* si el nombre no es ASCII."""
+    try:
+        nombre.encode("ascii")
+        return {"filename": nombre}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode("ascii")
+        return {"filename": simple, "filename*": f"UTF-8''{quote(nombre, safe='')}"}
+
+
+def _rango_vigente(etag, modificado):
+    """False si If-Range indica que el rango pedido es de otra versión del archivo."""
+    condicion = parse_if_range_header(request.headers.get("If-Range"))
+    if condicion.etag is not None:
+        return condicion.etag == etag
+    if condicion.date is not None:
+        # RFC 9110 §13.1.5: la fecha solo vale si es exactamente Last-Modified
+        return condicion.date == modificado
+    return True
+
+
+def _leer(archivo, largo):
+    """Genera el contenido por trozos, sin pasar de largo bytes."""
+    try:
+        while largo > 0:
+            trozo = archivo.read(min(TROZO, largo))
+            if not trozo:
+                break
+            largo -= len(trozo)
+            yield trozo
+    finally:
+        archivo.close()
+
+
+def enviar(camino, etag, nombre, tipo=None):
+    """Respuesta con el archivo de camino (o la parte pedida con Range), lista para devolver desde la vista."""
+    estado = os.stat(camino)
+    tamano = estado.st_size
+    modificado = datetime.fromtimestamp(int(estado.st_mtime), tz=timezone.utc)
+
+    respuesta = current_app.response_class(mimetype=tipo or "application/octet-stream", direct_passthrough=True)
+    respuesta.set_etag(etag)
+    respuesta.last_modified = modificado
+    respuesta.headers["Cache-Control"] = "private, no-cache"
+    respuesta.headers["Accept-Ranges"] = "bytes"
+    respuesta.headers.set("Content-Disposition", "attachment", **_disposicion(nombre or etag))
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=modificado):
+        respuesta.status_code = 304
+        return respuesta
+
+    inicio, largo = 0, tamano
+    rango = request.range
+    if rango is not None and len(rango.ranges) == 1 and _rango_vigente(etag, modificado):
+        limites = rango.range_for_length(tamano)
+        if limites is None:
+            respuesta.status_code = 416
+            respuesta.headers["Content-Range"] = f"bytes */{tamano}"
+            return respuesta
+        inicio, fin = limites
+        largo = fin - inicio
+        respuesta.status_code = 206
+        respuesta.headers["Content-Range"] = rango.to_content_range_header(tamano)
+
+    archivo = open(camino, "rb")
+    archivo.seek(inicio)
+    respuesta.content_length = largo
+    envoltorio = request.environ.get("wsgi.file_wrapper")
+    if envoltorio is not None:
+        respuesta.response = envoltorio(archivo, TROZO)
+    else:
+        respuesta.response = _leer(archivo, largo)
+    return respuesta
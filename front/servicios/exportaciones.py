@@ -0,0 +1,70 @@
+# =================== servicios/exportaciones.py ===================
+"""
+Exportación de tablas completas a CSV como trabajo en segundo plano (ver
+servicios/trabajos.py).
+
+Una tabla grande tarda en descargarse y en escribirse, así que la página
+solo encola el trabajo "exportar_csv" y el archivo queda en
+TRABAJOS_DIR para descargarlo desde /trabajos/<id>/resultado. Los
+registros se leen con cliente_api.iterar_datos, a medida que llegan y sin
+armar la lista en memoria, y se escriben directamente al CSV.
+"""
+import csv
+import os
+import re
+import time
+import uuid
+
+from servicios import cliente_api, trabajos
+
+API_BASE = "http://localhost:5031/api"
+
+# Tablas que se pueden exportar (usuario queda fuera: tiene contraseñas)
+TABLAS = ("proyecto", "entregable", "actividad", "producto", "presupuesto",
+          "distribucion_presupuesto", "ejecucion_presupuesto")
+
+# Filas pedidas a la API: la tabla entera, no las 1000 del listado
+LIMITE = 1_000_000
+
+# Cada cuántas filas se informa el avance
+FILAS_AVANCE = 5000
+
+_NOMBRE_ARCHIVO = re.compile(r"^[a-z_]+-\d{14}-[0-9a-f]{8}\.csv$")
+
+
+def ubicacion(nombre):
+    """Camino de un CSV exportado, o None si el nombre no es de una exportación."""
+    if not _NOMBRE_ARCHIVO.match(nombre or ""):
+        return None
+    return os.path.join(trabajos.DIRECTORIO_RESULTADOS, nombre)
+
+
+@trabajos.tarea("exportar_csv")
+def exportar_csv(argumentos, avance):
+    tabla = argumentos["tabla"]
+    if tabla not in TABLAS:
+        raise ValueError(f"La tabla {tabla} no se puede exportar")
+    os.makedirs(trabajos.DIRECTORIO_RESULTADOS, exist_ok=True)
+    nombre = f"{tabla}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.csv"
+    destino = ubicacion(nombre)
+    temporal = destino + ".tmp"
+
+    filas = 0
+    try:
+        with open(temporal, "w", newline="", encoding="utf-8-sig") as salida:
+            escritor = None
+            for fila in cliente_api.iterar_datos(f"{API_BASE}/{tabla}?limite={LIMITE}"):
+                if escritor is None:
+                    escritor = csv.DictWriter(salida, fieldnames=list(fila), extrasaction="ignore")
+                    escritor.writeheader()
+                escritor.writerow(fila)
+                filas += 1
+                if filas % FILAS_AVANCE == 0:
+                    avance(None, f"{filas} filas exportadas")
+        os.replace(temporal, destino)
+        avance(1.0, f"{filas} filas exportadas")
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return {"archivo": nombre, "filas": filas}
@@ -0,0 +1,389 @@
+# =================== servicios/informes.py ===================
+"""
+Informes de estado por proyecto, precalculados en segundo plano.
+
+Cada informe junta los datos del proyecto, sus metas estratégicas, sus
+productos con sus entregables y actividades (avance) y sus presupuestos con
+su ejecución. Se generan como trabajos de servicios/trabajos.py, nunca
+dentro de una petición, y quedan en disco (INFORMES_DIR) en HTML y, si
+WeasyPrint está instalado, también en PDF:
+
+    proyecto-<id>.html / proyecto-<id>.pdf / proyecto-<id>.json (huella)
+
+Solo se regeneran cuando cambian sus datos:
+- cada escritura confirmada sobre una tabla fuente (cliente_api.al_escribir)
+  toca cambios/<tabla>; un informe verificado antes de ese instante se
+  considera desactualizado y la página que lo pide encola su regeneración
+  (mientras tanto sirve el anterior);
+- al generar, la huella (hash de los datos del proyecto y de la
+  plantilla) se compara con la del informe guardado: si es la misma no se
+  vuelve a renderizar, solo se marca como verificado. Así la generación
+  semanal de todos los proyectos solo renderiza los que cambiaron, aunque
+  el cambio se haya hecho fuera de esta aplicación.
+
+La generación semanal lee cada tabla fuente entera una sola vez, registro a
+registro (cliente_api.iterar_datos), y renderiza los informes que cambiaron
+en paralelo en un pool de INFORMES_PROCESOS procesos. El informe de un solo
+proyecto lee solo las filas de ese proyecto, siguiendo sus claves foráneas
+(RELACIONES) con GET /api/{tabla}/{campo}/{valor}.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+
+import jinja2
+
+from servicios import cliente_api, concurrencia, trabajos
+
+API_BASE = "http://localhost:5031/api"
+
+CARPETA_FRONT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO = os.environ.get("INFORMES_DIR", os.path.join(CARPETA_FRONT, "informes"))
+PLANTILLA = "informe_proyecto.html"
+
+# Procesos que renderizan informes en paralelo en la generación por lotes
+PROCESOS = int(os.environ.get("INFORMES_PROCESOS", str(os.cpu_count() or 2)))
+
+# Filas pedidas a la API por tabla: la tabla entera
+LIMITE = 1_000_000
+
+# Tablas de las que sale algún dato del informe
+FUENTES = ("proyecto", "meta_proyecto", "meta_estrategica", "proyecto_producto", "producto",
+           "producto_entregable", "entregable", "actividad", "presupuesto",
+           "ejecucion_presupuesto", "estado_proyecto", "estado")
+
+# Cómo se llega desde los proyectos al resto de sus filas, en orden:
+# (tabla, campo, tabla de origen, campo de origen) lee las filas de tabla
+# cuyo campo vale alguno de los valores de campo de origen en las filas ya
+# leídas de la tabla de origen. Son las mismas relaciones de datos_proyecto().
+RELACIONES = (
+    ("estado_proyecto", "id_proyecto", "proyecto", "id"),
+    ("meta_proyecto", "id_proyecto", "proyecto", "id"),
+    ("proyecto_producto", "id_proyecto", "proyecto", "id"),
+    ("presupuesto", "id_proyecto", "proyecto", "id"),
+    ("estado", "id", "estado_proyecto", "id_estado"),
+    ("meta_estrategica", "id", "meta_proyecto", "id_meta"),
+    ("producto", "id", "proyecto_producto", "id_producto"),
+    ("producto_entregable", "id_producto", "producto", "id"),
+    ("entregable", "id", "producto_entregable", "id_entregable"),
+    ("actividad", "id_entregable", "entregable", "id"),
+    ("ejecucion_presupuesto", "presupuesto_id", "presupuesto", "id"),
+)
+
+_entorno = None
+_weasyprint = None
+
+
+# ------------------- DATOS DEL INFORME -------------------
+class Fuentes:
+    """Tablas fuente en memoria, con índices por id y por clave foránea."""
+
+    def __init__(self, tablas):
+        self.tablas = tablas
+        self._por_id = {}
+        self._grupos = {}
+
+    @classmethod
+    def cargar(cls, avance=None):
+        tablas = {}
+        for numero, tabla in enumerate(FUENTES):
+            if avance:
+                avance(numero / len(FUENTES) * 0.3, f"Leyendo {tabla}")
+            tablas[tabla] = list(cliente_api.iterar_datos(f"{API_BASE}/{tabla}?limite={LIMITE}"))
+        return cls(tablas)
+
+    @classmethod
+    def cargar_proyectos(cls, ids, avance=None):
+        """
+        Solo las filas de los proyectos de ids y las que cuelgan de ellos
+        (RELACIONES), sin descargar las tablas enteras. Como cargar(), ante
+        un 5xx de la API lanza ErrorApi y el trabajo se reintenta.
+        """
+        tablas = {tabla: [] for tabla in FUENTES}
+
+        def leer(tabla, campo, valores):
+            for valor in sorted({str(v) for v in valores if v is not None}):
+                url = f"{API_BASE}/{tabla}/{campo}/{quote(valor, safe='')}"
+                tablas[tabla].extend(cliente_api.iterar_datos(url))
+
+        leer("proyecto", "id", ids)
+        for numero, (tabla, campo, origen, campo_origen) in enumerate(RELACIONES):
+            if avance:
+                avance(numero / len(RELACIONES) * 0.3, f"Leyendo {tabla}")
+            leer(tabla, campo, [f.get(campo_origen) for f in tablas[origen]])
+        return cls(tablas)
+
+    def fila(self, tabla, id_fila):
+        if tabla not in self._por_id:
+            self._por_id[tabla] = {str(f.get("id")): f for f in self.tablas[tabla]}
+        return self._por_id[tabla].get(str(id_fila))
+
+    def de(self, tabla, campo, valor):
+        """Filas de la tabla cuyo campo vale valor (por ejemplo, las actividades de un entregable)."""
+        clave = (tabla, campo)
+        if clave not in self._grupos:
+            grupos = defaultdict(list)
+            for f in self.tablas[tabla]:
+                grupos[str(f.get(campo))].append(f)
+            self._grupos[clave] = grupos
+        return self._grupos[clave].get(str(valor), [])
+
+
+def datos_proyecto(fuentes, id_proyecto):
+    """Todos los datos que muestra el informe del proyecto, o None si no existe."""
+    proyecto = fuentes.fila("proyecto", id_proyecto)
+    if proyecto is None:
+        return None
+    productos = []
+    for asociacion in fuentes.de("proyecto_producto", "id_proyecto", id_proyecto):
+        producto = fuentes.fila("producto", asociacion.get("id_producto"))
+        if producto is None:
+            continue
+        entregables = []
+        for pe in fuentes.de("producto_entregable", "id_producto", producto.get("id")):
+            entregable = fuentes.fila("entregable", pe.get("id_entregable"))
+            if entregable is not None:
+                actividades = fuentes.de("actividad", "id_entregable", entregable.get("id"))
+                entregables.append({"entregable": entregable, "actividades": actividades})
+        productos.append({"producto": producto, "entregables": entregables})
+    return {
+        "proyecto": proyecto,
+        "estados": [e for e in (fuentes.fila("estado", ep.get("id_estado"))
+                                for ep in fuentes.de("estado_proyecto", "id_proyecto", id_proyecto)) if e],
+        "metas": [m for m in (fuentes.fila("meta_estrategica", mp.get("id_meta"))
+                              for mp in fuentes.de("meta_proyecto", "id_proyecto", id_proyecto)) if m],
+        "productos": productos,
+        "presupuestos": [{"presupuesto": p, "ejecuciones": fuentes.de("ejecucion_presupuesto", "presupuesto_id", p.get("id"))}
+                         for p in fuentes.de("presupuesto", "id_proyecto", id_proyecto)],
+    }
+
+
+def _numero(valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def resumen(datos):
+    """Totales del informe: avance de entregables y actividades y ejecución del presupuesto."""
+    entregables = [e for p in datos["productos"] for e in p["entregables"]]
+    actividades = [a for e in entregables for a in e["actividades"]]
+    aprobado = sum(_numero(p["presupuesto"].get("monto_aprobado")) for p in datos["presupuestos"])
+    planeado = sum(_numero(e.get("monto_planeado")) for p in datos["presupuestos"] for e in p["ejecuciones"])
+    ejecutado = sum(_numero(e.get("monto_ejecutado")) for p in datos["presupuestos"] for e in p["ejecuciones"])
+    return {
+        "productos": len(datos["productos"]),
+        "entregables": len(entregables),
+        "entregables_terminados": sum(1 for e in entregables if e["entregable"].get("fecha_finalizacion")),
+        "actividades": len(actividades),
+        "actividades_terminadas": sum(1 for a in actividades
+                                      if a.get("fecha_finalizacion") or _numero(a.get("porcentaje_avance")) >= 100),
+        "avance_actividades": (sum(_numero(a.get("porcentaje_avance")) for a in actividades) / len(actividades)
+                               if actividades else 0.0),
+        "solicitado": sum(_numero(p["presupuesto"].get("monto_solicitado")) for p in datos["presupuestos"]),
+        "aprobado": aprobado,
+        "planeado": planeado,
+        "ejecutado": ejecutado,
+        "ejecucion": ejecutado / aprobado * 100 if aprobado else 0.0,
+    }
+
+
+def _version_plantilla():
+    with open(os.path.join(CARPETA_FRONT, "templates", PLANTILLA), "rb") as archivo:
+        return hashlib.sha1(archivo.read()).hexdigest()
+
+
+def huella(datos, version_plantilla):
+    """Hash de los datos del informe y de la plantilla con que se renderiza."""
+    contenido = json.dumps([version_plantilla, datos], sort_keys=True, default=str)
+    return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+
+# ------------------- ARCHIVOS -------------------
+def camino(id_proyecto, extension):
+    return os.path.join(DIRECTORIO, f"proyecto-{int(id_proyecto)}.{extension}")
+
+
+def _ultimo_cambio():
+    """Instante de la última escritura confirmada sobre alguna tabla fuente (0 si no hubo)."""
+    ultimo = 0.0
+    for tabla in FUENTES:
+        try:
+            ultimo = max(ultimo, os.stat(os.path.join(DIRECTORIO, "cambios", tabla)).st_mtime)
+        except FileNotFoundError:
+            pass
+    return ultimo
+
+
+def marcar_cambio(tabla):
+    """Observador de cliente_api.al_escribir: deja constancia de que cambió una tabla fuente."""
+    if tabla not in FUENTES:
+        return
+    carpeta = os.path.join(DIRECTORIO, "cambios")
+    # La escritura ya se confirmó: un fallo del disco no debe convertirla en un error
+    try:
+        os.makedirs(carpeta, exist_ok=True)
+        with open(os.path.join(carpeta, tabla), "a"):
+            os.utime(os.path.join(carpeta, tabla))
+    except OSError as e:
+        print("No se pudo marcar el cambio de la tabla", tabla, "para los informes:", e)
+
+
+def estados(ids):
+    """
+    {id: "vigente" | "desactualizado" | "sin_generar"} de los informes. La
+    fecha de verificación de cada informe es la de modificación de su .json.
+    """
+    ultimo = _ultimo_cambio()
+    resultado = {}
+    for id_proyecto in ids:
+        try:
+            verificado = os.stat(camino(id_proyecto, "json")).st_mtime
+        except (FileNotFoundError, ValueError):
+            resultado[id_proyecto] = "sin_generar"
+            continue
+        resultado[id_proyecto] = "vigente" if verificado >= ultimo else "desactualizado"
+    return resultado
+
+
+def con_pdf(ids):
+    """Ids de los informes que tienen versión en PDF."""
+    return {id_proyecto for id_proyecto in ids if os.path.exists(camino(id_proyecto, "pdf"))}
+
+
+def _escribir(destino, contenido):
+    """Escribe el archivo de forma atómica (quien lo lee nunca ve uno a medias)."""
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as salida:
+            salida.write(contenido)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+def _pdf(html):
+    """PDF del HTML con WeasyPrint, o None si no está disponible."""
+    global _weasyprint
+    if _weasyprint is None:
+        try:
+            import weasyprint
+            _weasyprint = weasyprint
+        except (ImportError, OSError):  # OSError: instalada sin las bibliotecas del sistema (pango)
+            _weasyprint = False
+    if not _weasyprint:
+        return None
+    return _weasyprint.HTML(string=html).write_pdf()
+
+
+def renderizar(id_proyecto, datos, huella_datos, verificado):
+    """
+    Genera el HTML (y el PDF) del informe y guarda su huella. Corre en los
+    procesos del pool, así que solo usa sus argumentos y el disco.
+    """
+    global _entorno
+    if _entorno is None:
+        _entorno = jinja2.Environment(loader=jinja2.FileSystemLoader(os.path.join(CARPETA_FRONT, "templates")),
+                                      autoescape=True)
+    html = _entorno.get_template(PLANTILLA).render(
+        datos=datos, resumen=resumen(datos), generado=time.strftime("%Y-%m-%d %H:%M", time.localtime(verificado)))
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    _escribir(camino(id_proyecto, "html"), html.encode("utf-8"))
+    pdf = _pdf(html)
+    if pdf is not None:
+        _escribir(camino(id_proyecto, "pdf"), pdf)
+    _escribir(camino(id_proyecto, "json"), json.dumps({"huella": huella_datos, "pdf": pdf is not None}).encode("utf-8"))
+    os.utime(camino(id_proyecto, "json"), (verificado, verificado))
+    return id_proyecto
+
+
+def _huella_guardada(id_proyecto):
+    try:
+        with open(camino(id_proyecto, "json"), encoding="utf-8") as archivo:
+            return json.load(archivo).get("huella")
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _ejecutor():
+    if concurrencia.modo_verde():
+        # multiprocessing no convive con el parche de gevent: hilos del sistema
+        return concurrencia.ejecutor_de_cpu(PROCESOS, "informes")
+    # spawn: el proceso web tiene hilos (trabajos, caché), no se clona con fork
+    return ProcessPoolExecutor(max_workers=PROCESOS, mp_context=multiprocessing.get_context("spawn"))
+
+
+# ------------------- GENERACIÓN -------------------
+def generar(ids=None, avance=None):
+    """
+    Genera los informes de los proyectos (todos si ids es None) que
+    cambiaron desde la última vez. Devuelve cuántos se renderizaron y
+    cuántos seguían iguales. Con ids solo se leen las filas de esos
+    proyectos; sin ids, las tablas enteras.
+    """
+    avance = avance or (lambda fraccion=None, mensaje=None: None)
+    # Una escritura durante la generación deja el informe desactualizado
+    inicio = time.time()
+    if ids is None:
+        fuentes = Fuentes.cargar(avance)
+        ids = [f.get("id") for f in fuentes.tablas["proyecto"]]
+    else:
+        fuentes = Fuentes.cargar_proyectos(ids, avance)
+    version_plantilla = _version_plantilla()
+
+    pendientes, sin_cambios = [], 0
+    for id_proyecto in ids:
+        datos = datos_proyecto(fuentes, id_proyecto)
+        if datos is None:
+            continue
+        huella_datos = huella(datos, version_plantilla)
+        if huella_datos == _huella_guardada(id_proyecto) and os.path.exists(camino(id_proyecto, "html")):
+            os.utime(camino(id_proyecto, "json"), (inicio, inicio))
+            sin_cambios += 1
+        else:
+            pendientes.append((id_proyecto, datos, huella_datos, inicio))
+    avance(0.4, f"{len(pendientes)} informe(s) por generar, {sin_cambios} sin cambios")
+
+    def informar(hechos):
+        if hechos % 10 == 0 or hechos == len(pendientes):
+            avance(0.4 + 0.6 * hechos / len(pendientes), f"{hechos} de {len(pendientes)} informes generados")
+
+    if len(pendientes) <= 1 or PROCESOS <= 1:
+        for hechos, argumentos in enumerate(pendientes, start=1):
+            renderizar(*argumentos)
+            informar(hechos)
+    else:
+        with _ejecutor() as ejecutor:
+            futuros = [ejecutor.submit(renderizar, *argumentos) for argumentos in pendientes]
+            for hechos, futuro in enumerate(as_completed(futuros), start=1):
+                futuro.result()
+                informar(hechos)
+    return {"generados": len(pendientes), "sin_cambios": sin_cambios}
+
+
+@trabajos.tarea("informe_proyecto")
+def informe_proyecto(argumentos, avance):
+    return generar([argumentos["id_proyecto"]], avance)
+
+
+@trabajos.tarea("informes_todos")
+def informes_todos(argumentos, avance):
+    return generar(None, avance)
+
+
+def solicitar(id_proyecto=None):
+    """Encola la generación de un informe (o de todos), sin duplicar una ya pendiente. Devuelve el id del trabajo."""
+    if id_proyecto is None:
+        return trabajos.encolar("informes_todos", unico=True)
+    return trabajos.encolar("informe_proyecto", {"id_proyecto": int(id_proyecto)}, unico=True)
+
+
+cliente_api.al_escribir.append(marcar_cambio)
@@ -0,0 +1,143 @@
+# =================== servicios/json_api.py ===================
+"""
+Decodificación del JSON que devuelve la API en C#.
+
+- cargar(bytes): decodifica la respuesta completa. Usa orjson si está
+  instalado (varias veces más rápido que el json de la biblioteca estándar
+  y sin pasar por str); si no, json.loads.
+- iterar_datos(trozos): recorre la lista "datos" de la respuesta
+  {"...": ..., "datos": [...]} registro a registro a medida que llegan los
+  bytes, sin armar la lista completa en memoria. Pensado para exportaciones
+  y agregaciones sobre tablas grandes: la memoria usada no depende del
+  número de filas.
+"""
+import codecs
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decodificador usado, para diagnóstico ("orjson" o "json")
+DECODIFICADOR = "orjson" if orjson is not None else "json"
+
+_decodificador = json.JSONDecoder()
+_ESPACIOS = " \t\r\n"
+
+# Caracteres con los que empieza un número JSON y los que puede contener
+_INICIO_NUMERO = "-0123456789"
+_CARACTERES_NUMERO = "0123456789+-.eE"
+
+
+def cargar(contenido):
+    """Decodifica el cuerpo (bytes) de una respuesta JSON."""
+    if orjson is not None:
+        return orjson.loads(contenido)
+    return json.loads(contenido)
+
+
+class _Lector:
+    """Texto de la respuesta que se va completando con los trozos que llegan."""
+
+    def __init__(self, trozos):
+        self._trozos = iter(trozos)
+        self.texto = ""
+        self.pos = 0
+        self.agotado = False
+
+    def leer(self):
+        """Agrega el siguiente trozo; devuelve False si ya no quedan."""
+        # Se descarta lo ya consumido para que el texto no crezca con la respuesta
+        self.texto = self.texto[self.pos:]
+        self.pos = 0
+        for trozo in self._trozos:
+            if trozo:
+                self.texto += trozo
+                return True
+        self.agotado = True
+        return False
+
+    def caracter(self):
+        """Primer carácter que no es espacio (sin consumirlo), o "" al final."""
+        while True:
+            while self.pos < len(self.texto) and self.texto[self.pos] in _ESPACIOS:
+                self.pos += 1
+            if self.pos < len(self.texto) or not self.leer():
+                return self.texto[self.pos:self.pos + 1]
+
+    def esperar(self, esperado):
+        encontrado = self.caracter()
+        if encontrado != esperado:
+            raise ValueError(f"JSON inesperado: se esperaba {esperado!r} y llegó {encontrado!r}")
+        self.pos += 1
+
+    def _numero_cortado(self):
+        """True si el valor es un número que llega hasta el final del texto (puede seguir)."""
+        if self.agotado or self.texto[self.pos:self.pos + 1] not in _INICIO_NUMERO:
+            return False
+        fin = self.pos
+        while fin < len(self.texto) and self.texto[fin] in _CARACTERES_NUMERO:
+            fin += 1
+        return fin == len(self.texto)
+
+    def valor(self):
+        """Decodifica el siguiente valor JSON completo, leyendo más trozos si hace falta."""
+        self.caracter()
+        while True:
+            # Un número al final del texto puede seguir en el próximo trozo,
+            # aunque lo recibido ya se pueda decodificar ("12", "1.", "2e")
+            if self._numero_cortado() and self.leer():
+                continue
+            try:
+                valor, fin = _decodificador.raw_decode(self.texto, self.pos)
+            except json.JSONDecodeError:
+                if self.leer():
+                    continue
+                raise
+            self.pos = fin
+            return valor
+
+
+def _texto(trozos):
+    """Convierte los trozos de bytes en texto sin cortar caracteres UTF-8 multibyte."""
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    for trozo in trozos:
+        yield decodificador.decode(trozo)
+    yield decodificador.decode(b"", final=True)
+
+
+def iterar_datos(trozos):
+    """
+    Genera uno a uno los registros de la lista "datos" de una respuesta
+    {"clave": valor, ..., "datos": [ {...}, {...} ]} recibida como trozos de
+    bytes. Las demás claves se decodifican y se descartan. Una respuesta sin
+    "datos" no genera nada.
+    """
+    lector = _Lector(_texto(trozos))
+    if lector.caracter() == "":
+        return
+    lector.esperar("{")
+    if lector.caracter() == "}":
+        return
+    while True:
+        clave = lector.valor()
+        lector.esperar(":")
+        if clave != "datos":
+            lector.valor()
+        else:
+            lector.esperar("[")
+            if lector.caracter() == "]":
+                lector.pos += 1
+            else:
+                while True:
+                    yield lector.valor()
+                    separador = lector.caracter()
+                    if separador not in (",", "]"):
+                        raise ValueError(f"JSON inesperado en la lista datos: {separador!r}")
+                    lector.pos += 1
+                    if separador == "]":
+                        break
+        if lector.caracter() == "}":
+            return
+        lector.esperar(",")
@@ -0,0 +1,173 @@
+# =================== servicios/limites.py ===================
+"""
+Límite de intentos de login por IP y por email (cubetas de fichas).
+
+Cada intento de /login descarga los usuarios de la API y verifica un hash
+caro (servicios/contrasenas.py): sin límite, repetir el formulario alcanza
+para saturar el front y la API. Antes de hacer nada de eso la vista pide
+una ficha a dos cubetas, la de la IP y la del email:
+
+- cada cubeta guarda hasta `capacidad` fichas y recupera `capacidad` cada
+  `periodo` segundos (de a poco, no todas juntas);
+- cada intento gasta una ficha de cada una; sin fichas el intento se
+  rechaza enseguida con 429 y Retry-After.
+
+Las cubetas viven en un backend intercambiable: cualquier objeto con
+consumir(clave, capacidad, periodo) -> segundos de espera (0 si hay
+ficha). Por defecto es EnMemoria, propio de cada proceso; con LIMITES_DB
+se usa EnSqlite, compartido por todos los workers de gunicorn en esa
+máquina. Se puede asignar otro (por ejemplo uno sobre un servidor
+compartido) en `backend`.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from servicios import concurrencia, metricas
+
+# Intentos de login permitidos: (capacidad, periodo en segundos)
+LOGIN_POR_IP = (20, 60)
+LOGIN_POR_EMAIL = (5, 300)
+
+# Cubetas que guarda EnMemoria como máximo (se descartan las menos usadas)
+MAX_CLAVES = 100_000
+
+_candado = threading.Lock()
+_estadisticas = {"permitidos": 0, "rechazados_ip": 0, "rechazados_email": 0}
+
+
+def _recargar(fichas, instante, ahora, capacidad, periodo):
+    """Fichas de la cubeta en `ahora`, contando las recuperadas desde `instante`."""
+    return min(capacidad, fichas + (ahora - instante) * capacidad / periodo)
+
+
+def _espera(fichas, capacidad, periodo):
+    """Segundos hasta que la cubeta vuelva a tener una ficha entera."""
+    return (1 - fichas) * periodo / capacidad
+
+
+# ------------------- BACKENDS -------------------
+class EnMemoria:
+    """Cubetas en un dict del proceso (LRU acotado a max_claves)."""
+
+    def __init__(self, max_claves=MAX_CLAVES):
+        self.max_claves = max_claves
+        # clave -> (fichas, instante)
+        self._cubetas = OrderedDict()
+        self._candado = threading.Lock()
+
+    def consumir(self, clave, capacidad, periodo):
+        ahora = time.monotonic()
+        with self._candado:
+            fichas, instante = self._cubetas.get(clave, (capacidad, ahora))
+            fichas = _recargar(fichas, instante, ahora, capacidad, periodo)
+            if fichas >= 1:
+                self._cubetas[clave] = (fichas - 1, ahora)
+                espera = 0
+            else:
+                self._cubetas[clave] = (fichas, ahora)
+                espera = _espera(fichas, capacidad, periodo)
+            self._cubetas.move_to_end(clave)
+            while len(self._cubetas) > self.max_claves:
+                self._cubetas.popitem(last=False)
+        return espera
+
+
+class EnSqlite:
+    """Cubetas en una base SQLite compartida por los procesos de la máquina."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        # Una conexión por hilo del sistema, como en servicios/trabajos.py
+        self._local = concurrencia.local_por_hilo()
+        self._usos = 0
+
+    def _conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS cubetas (clave TEXT PRIMARY KEY, fichas REAL NOT NULL, instante REAL NOT NULL)"
+            )
+            self._local.conexion = conexion
+        return conexion
+
+    def consumir(self, clave, capacidad, periodo):
+        # Reloj de pared: el monotónico no se comparte entre procesos
+        ahora = time.time()
+        conexion = self._conexion()
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            fila = conexion.execute("SELECT fichas, instante FROM cubetas WHERE clave = ?", (clave,)).fetchone()
+            fichas = capacidad if fila is None else _recargar(fila[0], min(fila[1], ahora), ahora, capacidad, periodo)
+            espera = 0 if fichas >= 1 else _espera(fichas, capacidad, periodo)
+            conexion.execute(
+                "INSERT INTO cubetas (clave, fichas, instante) VALUES (?, ?, ?) "
+                "ON CONFLICT (clave) DO UPDATE SET fichas = excluded.fichas, instante = excluded.instante",
+                (clave, fichas - 1 if espera == 0 else fichas, ahora),
+            )
+            self._usos += 1
+            if self._usos % 1000 == 0:
+                # Una cubeta sin usar durante su periodo ya está llena: guardarla no cambia nada
+                conexion.execute("DELETE FROM cubetas WHERE instante < ?", (ahora - max(LOGIN_POR_IP[1], LOGIN_POR_EMAIL[1]),))
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        return espera
+
+
+backend = EnSqlite(os.environ["LIMITES_DB"]) if os.environ.get("LIMITES_DB") else EnMemoria()
+
+
+# ------------------- LOGIN -------------------
+def _consumir(clave, capacidad, periodo):
+    try:
+        return backend.consumir(clave, capacidad, periodo)
+    except Exception as e:
+        # Si falla el backend compartido no se bloquea el login de todos
+        print("Error en el límite de intentos:", e)
+        return 0
+
+
+def _contar(clave):
+    with _candado:
+        _estadisticas[clave] += 1
+
+
+def intento_login(ip, email):
+    """
+    Gasta una ficha de la IP y otra del email. Devuelve 0 si el intento
+    puede seguir o los segundos (enteros) que hay que esperar.
+    """
+    espera = _consumir(f"login:ip:{ip}", *LOGIN_POR_IP)
+    if espera:
+        _contar("rechazados_ip")
+        return math.ceil(espera)
+    espera = _consumir(f"login:email:{(email or '').strip().lower()}", *LOGIN_POR_EMAIL)
+    if espera:
+        _contar("rechazados_email")
+        return math.ceil(espera)
+    _contar("permitidos")
+    return 0
+
+
+def _metricas_limites():
+    """Colector para /metrics con los intentos de login permitidos y rechazados."""
+    with _candado:
+        e = dict(_estadisticas)
+    return [
+        ("login_intentos_total", "counter", "Intentos de login según el límite de intentos.",
+         [((("resultado", "permitido"),), e["permitidos"]),
+          ((("resultado", "rechazado_ip"),), e["rechazados_ip"]),
+          ((("resultado", "rechazado_email"),), e["rechazados_email"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_limites)
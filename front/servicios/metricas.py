@@ -0,0 +1,468 @@
+# =================== servicios/metricas.py ===================
+"""
+Métricas de la aplicación en formato de texto de Prometheus (/metrics).
+
+Se exportan:
+- Latencia por endpoint (histograma) y peticiones en curso.
+- Llamadas a la API en C# por tabla y método HTTP (conteo y latencia).
+- Tiempo de renderizado de las plantillas Jinja.
+- Cualquier valor extra que aporten los colectores registrados (por
+  ejemplo los aciertos y fallos de la caché de listados).
+
+La recolección no toma candados en el camino de cada petición: cada hilo
+acumula en su propio diccionario y solo al leer /metrics se suman todos.
+Con gevent el acumulador es por hilo del sistema, no por greenlet.
+
+Con varios procesos (gunicorn) cada uno tiene su propio registro. Si se
+define METRICAS_DIR (gunicorn.conf.py la define), cada proceso deja ahí
+sus valores cada METRICAS_INTERVALO segundos y /metrics devuelve el total
+de todos, lo atienda el proceso que lo atienda:
+- contadores e histogramas se suman, incluidos los de procesos que ya
+  terminaron (gunicorn los recicla; así los totales no retroceden);
+- los indicadores (gauge) llevan la etiqueta pid, solo de los procesos
+  vivos.
+
+/metrics muestra tablas y tiempos de la API: solo responde con una sesión
+iniciada o con la cabecera "Authorization: Bearer <METRICAS_TOKEN>".
+
+Este módulo lo usan las dos aplicaciones (front y front_flask_jinja, que
+lo importa desde aquí; ver front_flask_jinja/servicios/__init__.py).
+"""
+import atexit
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from flask import Response, g, request, session, template_rendered, before_render_template
+
+from servicios import concurrencia
+
+try:
+    import fcntl
+except ImportError:  # Windows: waitress corre en un solo proceso
+    fcntl = None
+
+# Carpeta compartida por los procesos del servidor (None: solo este proceso)
+DIRECTORIO = os.environ.get("METRICAS_DIR") or None
+
+# Segundos entre cada volcado de los valores del proceso a DIRECTORIO
+INTERVALO = float(os.environ.get("METRICAS_INTERVALO", "5"))
+
+# Sin volcar durante este tiempo, un proceso se da por terminado: sus
+# contadores pasan a _retirados.json y su archivo se borra
+RETIRO = 120
+
+# Token para leer /metrics sin sesión (el de Prometheus)
+TOKEN = os.environ.get("METRICAS_TOKEN") or None
+
+# Límites (en segundos) de los buckets de los histogramas de latencia
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Registro:
+    """Conjunto de métricas con un acumulador independiente por hilo."""
+
+    def __init__(self):
+        self._definiciones = {}      # nombre -> (tipo, ayuda, buckets)
+        self._fragmentos = []        # (referencia débil al hilo, dict del hilo)
+        self._retirados = {}         # valores de hilos que ya terminaron
+        self._colectores = []
+        self._local = concurrencia.local_por_hilo()
+        self._candado = threading.Lock()
+
+    # ------------------- DEFINICIÓN -------------------
+    def definir(self, nombre, tipo, ayuda, buckets=None):
+        self._definiciones[nombre] = (tipo, ayuda, buckets)
+
+    def agregar_colector(self, colector):
+        """
+        Registra una función que, al leer /metrics, devuelve una lista de
+        (nombre, tipo, ayuda, [(etiquetas, valor), ...]).
+        """
+        self._colectores.append(colector)
+
+    # ------------------- ESCRITURA (sin candados) -------------------
+    def _fragmento(self):
+        fragmento = getattr(self._local, "valores", None)
+        if fragmento is None:
+            fragmento = self._local.valores = {}
+            # Solo la primera vez de cada hilo se toma el candado
+            with self._candado:
+                self._fragmentos.append((concurrencia.referencia_hilo(), fragmento))
+        return fragmento
+
+    def sumar(self, nombre, etiquetas=(), valor=1):
+        """Suma al contador (o indicador) nombre{etiquetas}."""
+        fragmento = self._fragmento()
+        clave = (nombre, etiquetas)
+        fragmento[clave] = fragmento.get(clave, 0) + valor
+
+    def observar(self, nombre, etiquetas, valor):
+        """Registra una observación en el histograma nombre{etiquetas}."""
+        fragmento = self._fragmento()
+        clave = (nombre, etiquetas)
+        cubetas = fragmento.get(clave)
+        buckets = self._definiciones[nombre][2]
+        if cubetas is None:
+            # [conteo por bucket..., suma, total]
+            cubetas = fragmento[clave] = [0] * (len(buckets) + 2)
+        for i, limite in enumerate(buckets):
+            if valor <= limite:
+                cubetas[i] += 1
+                break
+        cubetas[-2] += valor
+        cubetas[-1] += 1
+
+    # ------------------- LECTURA -------------------
+    def _sumar_valores(self, destino, origen):
+        for clave, valor in origen.items():
+            if isinstance(valor, list):
+                actual = destino.get(clave)
+                destino[clave] = valor[:] if actual is None else [a + b for a, b in zip(actual, valor)]
+            else:
+                destino[clave] = destino.get(clave, 0) + valor
+
+    def _consolidar(self):
+        """Suma los acumuladores de todos los hilos en un único diccionario."""
+        with self._candado:
+            vivos = []
+            for referencia, fragmento in self._fragmentos:
+                if referencia() is None:
+                    # El hilo terminó: sus valores pasan a los retirados
+                    self._sumar_valores(self._retirados, fragmento.copy())
+                else:
+                    vivos.append((referencia, fragmento))
+            self._fragmentos = vivos
+            total = {}
+            self._sumar_valores(total, self._retirados)
+            for _, fragmento in vivos:
+                self._sumar_valores(total, fragmento.copy())
+        return total
+
+    def familias(self):
+        """
+        Métricas de este proceso, incluidas las de los colectores, como
+        [(nombre, tipo, ayuda, buckets, {etiquetas: valor})].
+        """
+        por_nombre = {}
+        for (nombre, etiquetas), valor in self._consolidar().items():
+            por_nombre.setdefault(nombre, {})[etiquetas] = valor
+
+        familias = [(nombre, tipo, ayuda, buckets, por_nombre.get(nombre, {}))
+                    for nombre, (tipo, ayuda, buckets) in self._definiciones.items()]
+        for colector in self._colectores:
+            try:
+                for nombre, tipo, ayuda, muestras in colector():
+                    familias.append((nombre, tipo, ayuda, None, dict(muestras)))
+            except Exception as e:
+                print("Error en un colector de métricas:", e)
+        return familias
+
+    def exportar(self):
+        """Devuelve todas las métricas en formato de texto de Prometheus."""
+        familias = self.familias()
+        if DIRECTORIO:
+            familias = _combinar(familias, _leer_otros_procesos())
+        return _texto(familias)
+
+
+def _texto(familias):
+    lineas = []
+    for nombre, tipo, ayuda, buckets, muestras in familias:
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        for etiquetas, valor in sorted(muestras.items()):
+            if tipo == "histogram":
+                acumulado = 0
+                for limite, cantidad in zip(buckets, valor):
+                    acumulado += cantidad
+                    lineas.append(f"{nombre}_bucket{_etiquetas(etiquetas + (('le', repr(limite)),))} {acumulado}")
+                lineas.append(f"{nombre}_bucket{_etiquetas(etiquetas + (('le', '+Inf'),))} {valor[-1]}")
+                lineas.append(f"{nombre}_sum{_etiquetas(etiquetas)} {valor[-2]}")
+                lineas.append(f"{nombre}_count{_etiquetas(etiquetas)} {valor[-1]}")
+            else:
+                lineas.append(f"{nombre}{_etiquetas(etiquetas)} {valor}")
+    return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(etiquetas):
+    """Convierte (('clave', 'valor'), ...) en {clave="valor",...}."""
+    if not etiquetas:
+        return ""
+    partes = []
+    for clave, valor in etiquetas:
+        valor = str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        partes.append(f'{clave}="{valor}"')
+    return "{" + ",".join(partes) + "}"
+
+
+# ------------------- VARIOS PROCESOS (METRICAS_DIR) -------------------
+_RETIRADOS = "_retirados.json"
+_identidad = None
+_volcado = []
+
+
+def _archivo_propio():
+    """
+    Nombre del archivo de este proceso. Se calcula después del fork (el pid
+    cambia) y lleva un sufijo al azar: un proceso nuevo que recibe el pid de
+    uno terminado no pisa sus contadores.
+    """
+    global _identidad
+    pid = os.getpid()
+    if _identidad is None or _identidad[0] != pid:
+        _identidad = (pid, f"{pid}-{uuid.uuid4().hex[:8]}.json")
+    return _identidad[1]
+
+
+def _serializar(familias):
+    return json.dumps([[nombre, tipo, ayuda, buckets, [[etiquetas, valor] for etiquetas, valor in muestras.items()]]
+                       for nombre, tipo, ayuda, buckets, muestras in familias])
+
+
+def _deserializar(texto):
+    return [(nombre, tipo, ayuda, tuple(buckets) if buckets else None,
+             {tuple(tuple(par) for par in etiquetas): valor for etiquetas, valor in muestras})
+            for nombre, tipo, ayuda, buckets, muestras in json.loads(texto)]
+
+
+def _escribir(nombre, contenido):
+    """Escribe el archivo de forma atómica (quien lo lee nunca ve uno a medias)."""
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=DIRECTORIO, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as salida:
+            salida.write(contenido)
+        os.replace(temporal, os.path.join(DIRECTORIO, nombre))
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+class _Candado:
+    """flock sobre DIRECTORIO/.candado: compartido para leer, exclusivo para retirar procesos."""
+
+    def __init__(self, exclusivo):
+        self.exclusivo = exclusivo
+
+    def __enter__(self):
+        os.makedirs(DIRECTORIO, exist_ok=True)
+        self.archivo = open(os.path.join(DIRECTORIO, ".candado"), "a")
+        if fcntl:
+            fcntl.flock(self.archivo, fcntl.LOCK_EX if self.exclusivo else fcntl.LOCK_SH)
+
+    def __exit__(self, *error):
+        self.archivo.close()
+
+
+def volcar():
+    """Guarda en DIRECTORIO los valores actuales de este proceso."""
+    if DIRECTORIO:
+        try:
+            _escribir(_archivo_propio(), _serializar(registro.familias()))
+        except OSError as e:
+            print("No se pudieron guardar las métricas del proceso:", e)
+
+
+def _sumar_muestras(destino, muestras):
+    for etiquetas, valor in muestras.items():
+        actual = destino.get(etiquetas)
+        if actual is None:
+            destino[etiquetas] = list(valor) if isinstance(valor, list) else valor
+        elif isinstance(valor, list):
+            destino[etiquetas] = [a + b for a, b in zip(actual, valor)]
+        else:
+            destino[etiquetas] = actual + valor
+
+
+def _retirar(archivos):
+    """
+    Pasa a _retirados.json los contadores e histogramas de los procesos
+    terminados y borra sus archivos (los indicadores ya no valen nada).
+    """
+    if fcntl is None:
+        return
+    with _Candado(exclusivo=True):
+        camino = os.path.join(DIRECTORIO, _RETIRADOS)
+        try:
+            with open(camino, encoding="utf-8") as archivo:
+                retirados = {nombre: [tipo, ayuda, buckets, muestras]
+                             for nombre, tipo, ayuda, buckets, muestras in _deserializar(archivo.read())}
+        except (OSError, ValueError):
+            retirados = {}
+        muertos = []
+        for nombre_archivo in archivos:
+            ruta = os.path.join(DIRECTORIO, nombre_archivo)
+            try:
+                if time.time() - os.stat(ruta).st_mtime < RETIRO:
+                    continue  # otro lector ya lo retiró o el proceso volvió a volcar
+                with open(ruta, encoding="utf-8") as archivo:
+                    familias = _deserializar(archivo.read())
+            except (OSError, ValueError):
+                continue
+            for nombre, tipo, ayuda, buckets, muestras in familias:
+                if tipo != "gauge":
+                    _sumar_muestras(retirados.setdefault(nombre, [tipo, ayuda, buckets, {}])[3], muestras)
+            muertos.append(ruta)
+        if not muertos:
+            return
+        _escribir(_RETIRADOS, _serializar([(nombre, *familia) for nombre, familia in retirados.items()]))
+        for ruta in muertos:
+            os.remove(ruta)
+
+
+def _leer_otros_procesos():
+    """[(pid, vivo, familias)] de los demás procesos que dejaron sus valores en DIRECTORIO."""
+    propio = _archivo_propio()
+    ahora = time.time()
+    otros, terminados = [], []
+    try:
+        with _Candado(exclusivo=False):
+            for entrada in os.scandir(DIRECTORIO):
+                if not entrada.name.endswith(".json") or entrada.name == propio:
+                    continue
+                try:
+                    edad = ahora - entrada.stat().st_mtime
+                    with open(entrada.path, encoding="utf-8") as archivo:
+                        familias = _deserializar(archivo.read())
+                except (OSError, ValueError):
+                    continue
+                if entrada.name == _RETIRADOS:
+                    otros.append((None, False, familias))
+                    continue
+                otros.append((entrada.name.split("-", 1)[0], edad < 3 * INTERVALO, familias))
+                if edad >= RETIRO:
+                    terminados.append(entrada.name)
+    except OSError as e:
+        print("No se pudieron leer las métricas de los demás procesos:", e)
+    if terminados:
+        try:
+            _retirar(terminados)
+        except OSError as e:
+            print("No se pudieron retirar las métricas de procesos terminados:", e)
+    return otros
+
+
+def _combinar(propias, otros):
+    """Suma contadores e histogramas; los indicadores de los procesos vivos llevan su pid."""
+    combinadas = {}
+    for pid, vivo, familias in [(str(os.getpid()), True, propias)] + otros:
+        for nombre, tipo, ayuda, buckets, muestras in familias:
+            destino = combinadas.setdefault(nombre, [tipo, ayuda, buckets, {}])[3]
+            if tipo == "gauge":
+                if vivo:
+                    destino.update({etiquetas + (("pid", pid),): valor for etiquetas, valor in muestras.items()})
+            else:
+                _sumar_muestras(destino, muestras)
+    return [(nombre, *familia) for nombre, familia in combinadas.items()]
+
+
+def _volcar_periodicamente():
+    while True:
+        time.sleep(INTERVALO)
+        volcar()
+
+
+def _iniciar_volcado():
+    """Arranca, con la primera petición del proceso, el hilo que vuelca sus valores."""
+    if _volcado or not DIRECTORIO:
+        return
+    with registro._candado:
+        if _volcado:
+            return
+        hilo = threading.Thread(target=_volcar_periodicamente, name="metricas-volcado", daemon=True)
+        hilo.start()
+        _volcado.append(hilo)
+    atexit.register(volcar)
+
+
+# Registro único del proceso
+registro = Registro()
+registro.definir("flask_peticion_duracion_segundos", "histogram",
+                 "Duración de las peticiones HTTP por endpoint.", BUCKETS_LATENCIA)
+registro.definir("flask_respuestas_total", "counter",
+                 "Respuestas HTTP por endpoint y código de estado.")
+registro.definir("flask_peticiones_en_curso", "gauge",
+                 "Peticiones HTTP que se están atendiendo en este momento.")
+registro.definir("api_llamadas_total", "counter",
+                 "Llamadas a la API en C# por tabla, método y código de estado.")
+registro.definir("api_llamada_duracion_segundos", "histogram",
+                 "Duración de las llamadas a la API en C# por tabla y método.", BUCKETS_LATENCIA)
+registro.definir("plantilla_render_duracion_segundos", "histogram",
+                 "Tiempo de renderizado de cada plantilla Jinja.", BUCKETS_LATENCIA)
+
+
+def registrar_llamada_api(tabla, metodo, codigo, segundos):
+    """Anota una llamada a la API en C#. codigo es "error" si no hubo respuesta."""
+    registro.sumar("api_llamadas_total", (("tabla", tabla), ("metodo", metodo), ("codigo", str(codigo))))
+    registro.observar("api_llamada_duracion_segundos", (("tabla", tabla), ("metodo", metodo)), segundos)
+
+
+# ------------------- INTEGRACIÓN CON FLASK -------------------
+def _inicio_peticion():
+    g._metricas_inicio = time.perf_counter()
+    g._metricas_endpoint = request.endpoint or "desconocido"
+    registro.sumar("flask_peticiones_en_curso", (), 1)
+
+
+def _fin_peticion(respuesta):
+    inicio = g.pop("_metricas_inicio", None)
+    if inicio is not None:
+        endpoint = g._metricas_endpoint
+        registro.observar("flask_peticion_duracion_segundos", (("endpoint", endpoint),), time.perf_counter() - inicio)
+        registro.sumar("flask_respuestas_total", (("endpoint", endpoint), ("codigo", str(respuesta.status_code))))
+    return respuesta
+
+
+def _cierre_peticion(error=None):
+    if g.pop("_metricas_endpoint", None) is not None:
+        registro.sumar("flask_peticiones_en_curso", (), -1)
+
+
+def _antes_de_render(sender, template, context, **extra):
+    g.setdefault("_metricas_plantillas", []).append(time.perf_counter())
+
+
+def _despues_de_render(sender, template, context, **extra):
+    pila = g.get("_metricas_plantillas")
+    if pila:
+        registro.observar("plantilla_render_duracion_segundos",
+                          (("plantilla", template.name or "desconocida"),),
+                          time.perf_counter() - pila.pop())
+
+
+def autorizado():
+    """True si la petición puede leer /metrics: sesión iniciada o el token de METRICAS_TOKEN."""
+    if session.get("usuario"):
+        return True
+    if TOKEN is None:
+        return False
+    return hmac.compare_digest(request.headers.get("Authorization", "").encode("utf-8"),
+                               f"Bearer {TOKEN}".encode("utf-8"))
+
+
+def exponer():
+    """Vista de /metrics."""
+    if not autorizado():
+        return Response("No autorizado\n", status=401, mimetype="text/plain",
+                        headers={"WWW-Authenticate": 'Bearer realm="metrics"'})
+    return Response(registro.exportar(), mimetype="text/plain; version=0.0.4")
+
+
+def instalar(aplicacion):
+    """
+    Registra los ganchos de medición y la ruta /metrics en la aplicación.
+    Debe llamarse antes de registrar otros before_request para que las
+    peticiones redirigidas o rechazadas también se midan.
+    """
+    aplicacion.before_request(_iniciar_volcado)
+    aplicacion.before_request(_inicio_peticion)
+    aplicacion.after_request(_fin_peticion)
+    aplicacion.teardown_request(_cierre_peticion)
+    before_render_template.connect(_antes_de_render, aplicacion)
+    template_rendered.connect(_despues_de_render, aplicacion)
+    aplicacion.add_url_rule("/metrics", "metricas", exponer)
@@ -0,0 +1,274 @@
+# =================== servicios/miniaturas.py ===================
+"""
+Miniaturas de los archivos del almacén (imágenes y primera página de PDF).
+
+Generarlas cuesta CPU y disco, así que nunca se hace dentro de la
+petición: la página solo pone un <img> que apunta a
+/archivo/miniatura/<hash>, y esa ruta
+- sirve la miniatura si ya existe (guardada en disco por hash de
+  contenido, así que vale para siempre y se envía como immutable);
+- si no, la encarga a un pool de hilos en segundo plano y responde 202 con
+  una imagen de "pendiente" que no se guarda en caché; static/miniaturas.js
+  vuelve a pedirla unas veces hasta que está lista. Sin JavaScript queda
+  la imagen de pendiente hasta la próxima visita;
+- si el archivo no admite vista previa (otro tipo, sin Pillow o sin
+  pdftoppm, o falló la generación) responde con un ícono genérico.
+
+La cola está acotada: con MAX_PENDIENTES encargos en curso los nuevos no
+se aceptan y se vuelven a pedir en el próximo reintento del navegador.
+
+Si el contenido no se puede decodificar (no es una imagen válida, está
+truncada, pdftoppm no pudo con el PDF) queda marcado en disco (<hash>.sin)
+y no se vuelve a intentar: el archivo no va a cambiar. Cualquier otro
+fallo (disco lleno, carpeta temporal, tiempo agotado) puede ser pasajero:
+no deja marca y se reintenta pasados ESPERA_REINTENTO segundos.
+
+Las imágenes necesitan Pillow y los PDF el programa pdftoppm (poppler);
+sin ellos la aplicación funciona igual, solo que sin vistas previas.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from servicios import almacen, concurrencia, metricas
+
+try:
+    from PIL import Image, ImageOps, UnidentifiedImageError
+except ImportError:
+    Image = None
+    UnidentifiedImageError = None
+
+# Carpeta de las miniaturas, dentro del almacén
+DIRECTORIO = os.path.join(almacen.DIRECTORIO, "miniaturas")
+
+# Caja en la que entra cada miniatura (ancho, alto)
+TAMANO = (160, 160)
+
+# Hilos que generan miniaturas y encargos en curso como máximo
+HILOS = int(os.environ.get("MINIATURAS_HILOS", "2"))
+MAX_PENDIENTES = 256
+
+# Segundos que puede tardar pdftoppm con la primera página de un PDF
+TIEMPO_PDF = 30
+
+# Tras un fallo pasajero, segundos durante los que se muestra el ícono
+# genérico antes de volver a intentarlo
+ESPERA_REINTENTO = 60
+
+PDFTOPPM = shutil.which("pdftoppm")
+
+# Firmas de los primeros bytes de cada formato
+_FIRMAS_IMAGEN = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF87a", b"GIF89a", b"BM", b"II*\x00", b"MM\x00*")
+_FIRMA_PDF = b"%PDF-"
+
+PENDIENTE = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="160" height="160" viewBox="0 0 160 160">'
+    '<rect width="160" height="160" fill="#eee"/>'
+    '<text x="80" y="88" font-size="14" text-anchor="middle" fill="#888">Generando…</text></svg>'
+)
+SIN_VISTA = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="160" height="160" viewBox="0 0 160 160">'
+    '<path d="M50 30h42l18 18v82H50z" fill="#f5f5f5" stroke="#999" stroke-width="3"/>'
+    '<path d="M92 30v18h18" fill="none" stroke="#999" stroke-width="3"/></svg>'
+)
+
+_candado = concurrencia.candado_del_sistema()
+_pendientes = set()
+# hash -> instante (monotónico) desde el que se puede volver a intentar
+_reintentos = {}
+_estadisticas = {"generadas": 0, "fallidas": 0, "rechazadas": 0}
+_ejecutor = None
+
+
+def _contar(clave):
+    with _candado:
+        _estadisticas[clave] += 1
+
+
+def _camino(hash_contenido, extension):
+    return os.path.join(DIRECTORIO, hash_contenido[:2], f"{hash_contenido}.{extension}")
+
+
+def tipo_de(camino):
+    """"imagen", "pdf" o None según los primeros bytes del archivo."""
+    with open(camino, "rb") as archivo:
+        inicio = archivo.read(12)
+    if inicio.startswith(_FIRMAS_IMAGEN) or (inicio[:4] == b"RIFF" and inicio[8:12] == b"WEBP"):
+        return "imagen"
+    if inicio.startswith(_FIRMA_PDF):
+        return "pdf"
+    return None
+
+
+def admite_vista(tipo):
+    """True si hay con qué generar la vista previa de ese tipo."""
+    return (tipo == "imagen" and Image is not None) or (tipo == "pdf" and PDFTOPPM is not None)
+
+
+# ------------------- GENERACIÓN (en los hilos del pool) -------------------
+class _SinVista(Exception):
+    """El contenido no se puede convertir en miniatura: reintentar no cambia nada."""
+
+
+def _decodificar(imagen):
+    """
+    Decodifica la imagen. Los errores de decodificación de Pillow son
+    OSError sin errno; uno con errno viene del sistema (lectura del disco) y
+    puede ser pasajero.
+    """
+    try:
+        imagen.load()
+    except (OSError, SyntaxError, ValueError) as e:
+        if isinstance(e, OSError) and e.errno is not None:
+            raise
+        raise _SinVista(e) from e
+
+
+def _abrir(camino):
+    """Image.open(camino); _SinVista si el contenido no es una imagen que Pillow entienda."""
+    try:
+        return Image.open(camino)
+    except (UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise _SinVista(e) from e
+
+
+def _guardar_jpeg(imagen, destino):
+    """Reduce la imagen a TAMANO y la guarda como JPEG de forma atómica."""
+    imagen = ImageOps.exif_transpose(imagen)
+    imagen.thumbnail(TAMANO)
+    if imagen.mode in ("RGBA", "LA", "P"):
+        imagen = imagen.convert("RGBA")
+        fondo = Image.new("RGB", imagen.size, "white")
+        fondo.paste(imagen, mask=imagen.getchannel("A"))
+        imagen = fondo
+    elif imagen.mode != "RGB":
+        imagen = imagen.convert("RGB")
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as salida:
+            imagen.save(salida, "JPEG", quality=80, optimize=True)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+def _imagen_de_pdf(camino, carpeta):
+    """Primera página del PDF rasterizada por pdftoppm al tamaño de la miniatura."""
+    salida = os.path.join(carpeta, "pagina")
+    try:
+        subprocess.run(
+            [PDFTOPPM, "-f", "1", "-l", "1", "-singlefile", "-jpeg", "-scale-to", str(max(TAMANO)), camino, salida],
+            check=True, timeout=TIEMPO_PDF, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    except subprocess.CalledProcessError as e:
+        raise _SinVista(e) from e
+    return _abrir(salida + ".jpg")
+
+
+def _generar(hash_contenido, camino, tipo):
+    destino = _camino(hash_contenido, "jpg")
+    try:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        if tipo == "pdf":
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(destino)) as carpeta:
+                with _imagen_de_pdf(camino, carpeta) as imagen:
+                    _decodificar(imagen)
+                    _guardar_jpeg(imagen, destino)
+        else:
+            with _abrir(camino) as imagen:
+                # En los JPEG decodifica directamente a una escala cercana a la final
+                imagen.draft("RGB", TAMANO)
+                _decodificar(imagen)
+                _guardar_jpeg(imagen, destino)
+        _contar("generadas")
+    except _SinVista as e:
+        print("El archivo", hash_contenido, "no admite vista previa:", e)
+        try:
+            open(_camino(hash_contenido, "sin"), "wb").close()
+        except OSError as e:
+            print("No se pudo marcar la miniatura de", hash_contenido, ":", e)
+        _contar("fallidas")
+    except Exception as e:
+        print("No se pudo generar la miniatura de", hash_contenido, "(se reintentará):", e)
+        with _candado:
+            ahora = time.monotonic()
+            if len(_reintentos) >= MAX_PENDIENTES:
+                for clave, desde in list(_reintentos.items()):
+                    if desde <= ahora:
+                        del _reintentos[clave]
+            _reintentos[hash_contenido] = ahora + ESPERA_REINTENTO
+        _contar("fallidas")
+    finally:
+        with _candado:
+            _pendientes.discard(hash_contenido)
+
+
+# ------------------- CONSULTA (desde las peticiones) -------------------
+def miniatura(hash_contenido):
+    """
+    (estado, camino) de la miniatura: ("lista", camino del JPEG),
+    ("pendiente", None) si se está generando, ("reintentar", None) si la
+    última vez falló por algo pasajero y aún no toca reintentar, o
+    ("sin_vista", None) si no habrá vista previa. Encarga la generación si
+    hace falta.
+    """
+    global _ejecutor
+    lista = _camino(hash_contenido, "jpg")
+    if os.path.exists(lista):
+        return "lista", lista
+    if os.path.exists(_camino(hash_contenido, "sin")):
+        return "sin_vista", None
+    camino = almacen.ubicacion(almacen.ruta_de(hash_contenido))
+    if not os.path.isfile(camino):
+        return "sin_vista", None
+    tipo = tipo_de(camino)
+    if not admite_vista(tipo):
+        return "sin_vista", None
+
+    with _candado:
+        if hash_contenido in _pendientes:
+            return "pendiente", None
+        if _reintentos.get(hash_contenido, 0) > time.monotonic():
+            return "reintentar", None
+        _reintentos.pop(hash_contenido, None)
+        if len(_pendientes) >= MAX_PENDIENTES:
+            _estadisticas["rechazadas"] += 1
+            return "pendiente", None
+        _pendientes.add(hash_contenido)
+        if _ejecutor is None:
+            _ejecutor = concurrencia.ejecutor_de_cpu(HILOS, "miniaturas")
+    _ejecutor.submit(_generar, hash_contenido, camino, tipo)
+    return "pendiente", None
+
+
+def url_miniatura(ruta):
+    """URL de la miniatura de una ruta del almacén, o None (para las plantillas)."""
+    from flask import url_for
+
+    hash_contenido = almacen.hash_de(ruta)
+    if hash_contenido is None:
+        return None
+    return url_for("rutas_archivo.miniatura_archivo", hash_contenido=hash_contenido)
+
+
+def _metricas_miniaturas():
+    """Colector para /metrics con los contadores de las miniaturas."""
+    with _candado:
+        e = dict(_estadisticas, pendientes=len(_pendientes))
+    return [
+        ("miniaturas_generadas_total", "counter", "Miniaturas generadas.", [((), e["generadas"])]),
+        ("miniaturas_fallidas_total", "counter", "Miniaturas que no se pudieron generar.", [((), e["fallidas"])]),
+        ("miniaturas_rechazadas_total", "counter", "Encargos no aceptados por tener la cola llena.", [((), e["rechazadas"])]),
+        ("miniaturas_pendientes", "gauge", "Miniaturas en cola o generándose.", [((), e["pendientes"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_miniaturas)
+
+
+def instalar(aplicacion):
+    """Registra miniatura() como función global de las plantillas."""
+    aplicacion.jinja_env.globals["miniatura"] = url_miniatura
@@ -0,0 +1,186 @@
+# =================== servicios/orden.py ===================
+"""
+Orden de los listados por columna, hecho en el servidor.
+
+Los encabezados de las tablas son enlaces (?orden=campo&sentido=asc|desc)
+generados con orden_columna(), y las plantillas ordenan la lista que
+muestran con ordenar() antes de renderizar el <tbody>:
+
+    {% set proyectos = ordenar(proyectos) %}
+    {% call cache_fragmento("proyecto", proyectos) %} ... {% endcall %}
+
+Ordenar mil filas no es caro, pero cada visita con ?orden= lo repetiría.
+Para los listados que vienen de la caché (cliente_api.cache) el resultado
+se guarda por (listado, versión, campo, sentido): mientras los datos no
+cambian, volver a pedir el mismo orden devuelve la misma lista ya
+ordenada (referencias a las mismas filas, sin copiarlas) y el fragmento
+HTML cacheado de esa lista. Cuando una escritura cambia el listado cambia
+su versión y la lista ordenada vieja deja de usarse; las entradas se
+expulsan por LRU.
+
+Los valores se comparan según lo que son, no según su tipo en el JSON:
+números (incluidos los montos que llegan como texto), fechas en los
+formatos que usan las rutas ("2025-10-08", "2025-10-08T00:00:00",
+"08-10-2025"...) y texto sin distinguir mayúsculas ni tildes. Los vacíos
+van siempre al final.
+"""
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import request, url_for
+from markupsafe import Markup, escape
+from werkzeug.routing import BuildError
+
+from servicios import metricas
+
+# Listas ordenadas que se guardan como máximo por proceso
+MAX_ORDENES = 256
+
+_CAMPO = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_NUMERO = re.compile(r"^-?\d+(\.\d+)?$")
+_FECHA_ISO = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ](\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+_FECHA_DMA = re.compile(r"^(\d{1,2})[-/](\d{1,2})[-/](\d{4})$")
+
+# Rango de cada clase de valor: los números antes que las fechas y estas antes que el texto
+_NUMERO_, _FECHA_, _TEXTO_ = 0, 1, 2
+
+
+def clave_valor(valor):
+    """Clave de comparación de un valor ya sabiendo que no está vacío."""
+    if isinstance(valor, (int, float)):
+        return (_NUMERO_, valor)
+    texto = str(valor).strip()
+    if _NUMERO.match(texto):
+        return (_NUMERO_, float(texto))
+    fecha = _FECHA_ISO.match(texto)
+    if fecha:
+        return (_FECHA_, tuple(int(p or 0) for p in fecha.groups()))
+    fecha = _FECHA_DMA.match(texto)
+    if fecha:
+        dia, mes, anio = fecha.groups()
+        return (_FECHA_, (int(anio), int(mes), int(dia), 0, 0, 0))
+    texto = unicodedata.normalize("NFKD", texto.casefold())
+    return (_TEXTO_, "".join(c for c in texto if not unicodedata.combining(c)))
+
+
+def ordenar_filas(datos, campo, descendente=False):
+    """Nueva lista con las filas ordenadas por el campo; las que no lo tienen, al final."""
+    vacias = [f for f in datos if f.get(campo) in (None, "")]
+    llenas = [f for f in datos if f.get(campo) not in (None, "")]
+    llenas.sort(key=lambda f: clave_valor(f[campo]), reverse=descendente)
+    return llenas + vacias
+
+
+class CacheOrden:
+    """Listas ordenadas por (url, versión del listado, campo, sentido), con expulsión LRU."""
+
+    def __init__(self, max_entradas):
+        self.max_entradas = max_entradas
+        self._ordenes = OrderedDict()
+        self._candado = threading.Lock()
+
+        # Contadores expuestos por estadisticas()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, version, campo, descendente, datos):
+        clave = (version, campo, descendente)
+        with self._candado:
+            ordenada = self._ordenes.get(clave)
+            if ordenada is not None:
+                self._ordenes.move_to_end(clave)
+                self.aciertos += 1
+                return ordenada
+            self.fallos += 1
+        ordenada = ordenar_filas(datos, campo, descendente)
+        with self._candado:
+            ordenada = self._ordenes.setdefault(clave, ordenada)
+            while len(self._ordenes) > self.max_entradas:
+                self._ordenes.popitem(last=False)
+        return ordenada
+
+    def version_de(self, lista):
+        """
+        (url, versión) de una lista ordenada guardada, con el orden en la
+        URL para que cada orden tenga su propio fragmento HTML; o None.
+        """
+        with self._candado:
+            for ((url, version), campo, descendente), ordenada in self._ordenes.items():
+                if ordenada is lista:
+                    sentido = "desc" if descendente else "asc"
+                    return f"{url}?orden={campo}&sentido={sentido}", version
+        return None
+
+    def estadisticas(self):
+        with self._candado:
+            return {"ordenes": len(self._ordenes), "aciertos": self.aciertos, "fallos": self.fallos}
+
+
+cache = CacheOrden(MAX_ORDENES)
+
+
+def orden_pedido():
+    """(campo, descendente) de ?orden=&sentido= en la petición actual, o (None, False)."""
+    campo = request.args.get("orden", "")
+    if not _CAMPO.match(campo):
+        return None, False
+    return campo, request.args.get("sentido") == "desc"
+
+
+def ordenar(datos):
+    """
+    La lista ordenada según ?orden= de la petición, o la misma lista si no
+    se pidió orden o ninguna fila tiene ese campo.
+    """
+    from servicios import cliente_api
+
+    campo, descendente = orden_pedido()
+    if campo is None or not datos or campo not in datos[0]:
+        return datos
+    version = cliente_api.cache.version_de(datos)
+    if version is None:
+        return ordenar_filas(datos, campo, descendente)
+    return cache.obtener(version, campo, descendente, datos)
+
+
+def _url_listado():
+    """URL del listado de la sección actual: la propia si es un GET, si no la vista principal del Blueprint."""
+    if request.method == "GET" or not request.blueprint:
+        return request.path
+    try:
+        return url_for(f"{request.blueprint}.{request.blueprint[len('rutas_'):]}")
+    except BuildError:
+        return request.path
+
+
+def orden_columna(campo, etiqueta):
+    """Encabezado enlazado que ordena por el campo (y alterna el sentido si ya se ordena por él)."""
+    actual, descendente = orden_pedido()
+    argumentos = {k: v for k, v in request.args.items() if k not in ("orden", "sentido")}
+    sentido = "desc" if campo == actual and not descendente else "asc"
+    argumentos.update(orden=campo, sentido=sentido)
+    marca = (" ▼" if descendente else " ▲") if campo == actual else ""
+    href = f"{_url_listado()}?{urlencode(argumentos)}"
+    return Markup(f'<a class="orden" href="{escape(href)}">{escape(etiqueta)}{marca}</a>')
+
+
+def _metricas_orden():
+    """Colector para /metrics con los contadores de las listas ordenadas."""
+    e = cache.estadisticas()
+    return [
+        ("orden_listas_aciertos_total", "counter", "Órdenes servidos ya calculados.", [((), e["aciertos"])]),
+        ("orden_listas_fallos_total", "counter", "Órdenes que hubo que calcular.", [((), e["fallos"])]),
+        ("orden_listas_entradas", "gauge", "Listas ordenadas guardadas.", [((), e["ordenes"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_orden)
+
+
+def instalar(aplicacion):
+    """Registra ordenar() y orden_columna() como funciones globales de las plantillas."""
+    aplicacion.jinja_env.globals["ordenar"] = ordenar
+    aplicacion.jinja_env.globals["orden_columna"] = orden_columna
@@ -0,0 +1,129 @@
+# =================== servicios/parcial.py ===================
+"""
+Respuestas parciales para crear, actualizar y eliminar.
+
+Sin JavaScript, cada escritura redirige al listado y el navegador vuelve a
+cargar la página completa. static/parcial.js intercepta esos formularios,
+los envía con fetch y la cabecera "X-Parcial: 1", y aplica la respuesta sin
+recargar:
+- eliminar: {"accion": "eliminar"}; se quita la fila del formulario
+  enviado, sin volver a leer nada de la API.
+- actualizar: {"accion": "fila", "html": ...} con la fila modificada, que
+  reemplaza a la que tiene el mismo botón de eliminar.
+- crear (o actualizar si no se pudo aislar la fila): {"accion": "tabla",
+  "html": ...} con el contenido nuevo del <tbody>. La API no devuelve el
+  id del registro creado, así que no hay forma segura de elegir una fila.
+
+Las rutas no cambian: siguen redirigiendo al listado. Si la escritura
+redirige a una vista de su misma sección, esa vista se ejecuta aquí mismo
+y su plantilla se corta en cuanto cache_fragmento() genera el <tbody>
+(ver servicios/cache_fragmentos.py); los listados auxiliares de los
+formularios salen de la caché. Cualquier otra respuesta (un error, la
+redirección al login) se devuelve tal cual y parcial.js la muestra.
+
+Solo se responde en parcial si la API aceptó todas las escrituras de la
+petición (g.escrituras_ok, ver cliente_api._enviar). Si la API rechazó
+alguna (por ejemplo, un 404 al eliminar un registro que ya no existe), la
+vista igual redirige al listado; esa redirección se devuelve entera y el
+navegador carga la página, sin dar por hecha la escritura.
+"""
+import re
+from urllib.parse import urlsplit
+
+from flask import current_app, g, jsonify, request, url_for
+from werkzeug.exceptions import HTTPException
+
+ACCIONES = ("crear_", "actualizar_", "eliminar_")
+
+
+class TablaCapturada(Exception):
+    """Interrumpe el renderizado de la página una vez generado el <tbody>."""
+
+    def __init__(self, html):
+        super().__init__("tabla capturada")
+        self.html = html
+
+
+def solicitada():
+    """True si la petición actual pidió una respuesta parcial."""
+    return request.headers.get("X-Parcial") == "1"
+
+
+def capturar(html):
+    """Llamada por cache_fragmento(): en modo captura corta la página con el <tbody>."""
+    if g.get("capturar_tabla"):
+        raise TablaCapturada(html)
+
+
+# ------------------- RENDERIZADO DE LA TABLA -------------------
+def _vista_destino(respuesta):
+    """(endpoint, argumentos) de la redirección si apunta a la misma sección, o None."""
+    adaptador = current_app.url_map.bind_to_environ(request.environ)
+    try:
+        endpoint, argumentos = adaptador.match(urlsplit(respuesta.location).path, method="GET")
+    except HTTPException:
+        return None
+    if endpoint.split(".", 1)[0] != request.blueprint:
+        return None
+    return endpoint, argumentos
+
+
+def _tabla(endpoint, argumentos):
+    """Ejecuta la vista del listado y devuelve su <tbody>, o None si no usa cache_fragmento()."""
+    g.capturar_tabla = True
+    try:
+        current_app.view_functions[endpoint](**argumentos)
+    except TablaCapturada as captura:
+        return captura.html
+    finally:
+        g.capturar_tabla = False
+    return None
+
+
+def _fila(tabla, funcion):
+    """
+    Aísla en el <tbody> la fila del registro actualizado, buscando el botón
+    de eliminar con su id. Devuelve None si no hay exactamente una.
+    """
+    eliminar = f"{request.blueprint}.eliminar_{funcion[len('actualizar_'):]}"
+    reglas = current_app.url_map.iter_rules(eliminar) if eliminar in current_app.view_functions else []
+    for regla in reglas:
+        if len(regla.arguments) != 1:
+            return None
+        argumento = next(iter(regla.arguments))
+        valor = request.form.get("id") or request.form.get(argumento)
+        if not valor:
+            return None
+        accion = f'action="{url_for(eliminar, **{argumento: valor})}"'
+        filas = [f for f in re.findall(r"<tr[ >].*?</tr>", tabla, re.S) if accion in f]
+        return filas[0] if len(filas) == 1 else None
+    return None
+
+
+# ------------------- INTEGRACIÓN CON FLASK -------------------
+def _responder(respuesta):
+    """Convierte la redirección de una escritura exitosa en una respuesta parcial."""
+    if request.method != "POST" or not solicitada() or respuesta.status_code not in (302, 303):
+        return respuesta
+    funcion = (request.endpoint or "").split(".", 1)[-1]
+    if not funcion.startswith(ACCIONES) or not g.get("escrituras_ok"):
+        return respuesta
+    destino = _vista_destino(respuesta)
+    if destino is None:
+        return respuesta
+
+    if funcion.startswith("eliminar_"):
+        return jsonify(accion="eliminar")
+    tabla = _tabla(*destino)
+    if tabla is None:
+        return respuesta
+    if funcion.startswith("actualizar_"):
+        fila = _fila(tabla, funcion)
+        if fila is not None:
+            return jsonify(accion="fila", html=fila)
+    return jsonify(accion="tabla", html=tabla)
+
+
+def instalar(aplicacion):
+    """Registra la conversión de las redirecciones en respuestas parciales."""
+    aplicacion.after_request(_responder)
@@ -0,0 +1,376 @@
+# =================== servicios/trabajos.py ===================
+"""
+Cola de trabajos en segundo plano, persistida en SQLite.
+
+Las operaciones largas (exportaciones, informes...) no deben ocupar un
+hilo de petición durante minutos: la vista encola el trabajo y responde
+enseguida con su id; un pool de hilos del proceso lo ejecuta y va dejando
+su estado, progreso y resultado en la base, que se consultan en
+/trabajos/<id> (rutas/rutas_trabajos.py).
+
+- Cada tipo de trabajo es una función registrada con @tarea("nombre").
+  Recibe los argumentos (un dict serializable a JSON) y una función
+  avance(fraccion, mensaje) para informar el progreso, y devuelve el
+  resultado (también serializable).
+- La cola vive en TRABAJOS_DB, así que sobrevive a reinicios y la
+  comparten todos los workers de gunicorn: cada proceso toma trabajos con
+  un UPDATE atómico, de modo que nunca dos ejecutan el mismo.
+- Si una tarea lanza una excepción se reintenta hasta `reintentos` veces,
+  con esperas que se duplican (ESPERA_REINTENTO, 2x, 4x...); después queda
+  "fallido" con el error.
+- Mientras un trabajo corre, su proceso renueva `actualizado` cada LATIDO
+  segundos aunque la tarea no informe avances. Un trabajo "en_curso" sin
+  latidos durante ABANDONO segundos es de un proceso que murió: vuelve a
+  la cola (lo revisa cada proceso con hilos de trabajos, en cada latido).
+- Un error de la base o un resultado que no se puede guardar nunca
+  detienen un hilo: se registran y el hilo sigue con el próximo trabajo.
+
+Los hilos se inician con la primera petición que atiende el proceso (ver
+instalar()), no al importar: así gunicorn puede precargar la app y hacer
+fork sin hilos a medias.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from servicios import concurrencia, metricas
+
+# Base de la cola y carpeta de los archivos que generan los trabajos
+CARPETA_FRONT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_DB = os.environ.get("TRABAJOS_DB", os.path.join(CARPETA_FRONT, "trabajos.sqlite3"))
+DIRECTORIO_RESULTADOS = os.environ.get("TRABAJOS_DIR", os.path.join(CARPETA_FRONT, "resultados"))
+
+# Hilos que ejecutan trabajos en cada proceso
+HILOS = int(os.environ.get("TRABAJOS_HILOS", "2"))
+
+# Segundos entre consultas a la cola cuando no hay avisos de este proceso
+# (los trabajos encolados por otros workers se descubren así)
+ESPERA_SONDEO = 2.0
+
+# Reintentos por defecto y espera antes del primero (se duplica en cada uno)
+REINTENTOS = 3
+ESPERA_REINTENTO = 5.0
+
+# Segundos entre latidos de los trabajos en curso, y sin latidos tras los
+# que un trabajo "en_curso" se da por abandonado
+LATIDO = 30
+ABANDONO = 600
+
+# Trabajos terminados o fallidos que se conservan
+MAX_HISTORIAL = 1000
+
+ESTADOS = ("pendiente", "en_curso", "terminado", "fallido")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    argumentos TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    progreso REAL,
+    mensaje TEXT,
+    resultado TEXT,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    max_intentos INTEGER NOT NULL,
+    disponible_en REAL NOT NULL,
+    creado REAL NOT NULL,
+    actualizado REAL NOT NULL,
+    trabajador TEXT
+);
+CREATE INDEX IF NOT EXISTS trabajos_cola ON trabajos (estado, disponible_en, id);
+"""
+
+_tareas = {}
+# Una conexión por hilo del sistema (con gevent, la comparten los greenlets del hilo)
+_local = concurrencia.local_por_hilo()
+_aviso = threading.Event()
+_candado = threading.Lock()
+_hilos = []
+# Ids de los trabajos que ejecutan los hilos de este proceso (reciben latidos)
+_ejecutando = set()
+# (pid, identificador del proceso en la columna trabajador)
+_proceso = None
+_estadisticas = {"terminados": 0, "fallidos": 0, "reintentos": 0}
+
+
+class Tarea:
+    """Función registrada como tipo de trabajo."""
+
+    def __init__(self, nombre, funcion, reintentos):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.reintentos = reintentos
+
+
+def tarea(nombre, reintentos=REINTENTOS):
+    """Decorador que registra una función como tipo de trabajo."""
+    def registrar(funcion):
+        _tareas[nombre] = Tarea(nombre, funcion, reintentos)
+        return funcion
+    return registrar
+
+
+# ------------------- BASE DE DATOS -------------------
+def _conexion():
+    """Conexión propia del hilo (sqlite3 no comparte conexiones entre hilos)."""
+    conexion = getattr(_local, "conexion", None)
+    if conexion is None:
+        os.makedirs(os.path.dirname(os.path.abspath(RUTA_DB)), exist_ok=True)
+        conexion = sqlite3.connect(RUTA_DB, timeout=30, isolation_level=None)
+        conexion.row_factory = sqlite3.Row
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        conexion.executescript(_ESQUEMA)
+        _local.conexion = conexion
+    return conexion
+
+
+def _como_dict(fila):
+    if fila is None:
+        return None
+    trabajo = dict(fila)
+    trabajo["argumentos"] = json.loads(trabajo["argumentos"])
+    trabajo["resultado"] = json.loads(trabajo["resultado"]) if trabajo["resultado"] is not None else None
+    return trabajo
+
+
+def encolar(tipo, argumentos=None, unico=False):
+    """
+    Agrega un trabajo a la cola y devuelve su id. Con unico=True, si ya hay
+    uno igual (mismo tipo y argumentos) pendiente o en curso devuelve el id
+    de ese en lugar de encolar otro.
+    """
+    if tipo not in _tareas:
+        raise ValueError(f"No hay una tarea registrada con el nombre {tipo}")
+    ahora = time.time()
+    argumentos = json.dumps(argumentos or {}, sort_keys=True)
+    conexion = _conexion()
+    conexion.execute("BEGIN IMMEDIATE")
+    try:
+        if unico:
+            fila = conexion.execute(
+                "SELECT id FROM trabajos WHERE tipo = ? AND argumentos = ? AND estado IN ('pendiente', 'en_curso') "
+                "ORDER BY id LIMIT 1",
+                (tipo, argumentos),
+            ).fetchone()
+            if fila is not None:
+                conexion.execute("COMMIT")
+                return fila["id"]
+        cursor = conexion.execute(
+            "INSERT INTO trabajos (tipo, argumentos, max_intentos, disponible_en, creado, actualizado) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (tipo, argumentos, _tareas[tipo].reintentos + 1, ahora, ahora, ahora),
+        )
+        conexion.execute("COMMIT")
+    except BaseException:
+        conexion.execute("ROLLBACK")
+        raise
+    _aviso.set()
+    return cursor.lastrowid
+
+
+def obtener(id_trabajo):
+    """El trabajo como dict (argumentos y resultado ya decodificados), o None."""
+    fila = _conexion().execute("SELECT * FROM trabajos WHERE id = ?", (id_trabajo,)).fetchone()
+    return _como_dict(fila)
+
+
+def recientes(limite=50):
+    """Los últimos trabajos encolados, del más nuevo al más viejo."""
+    filas = _conexion().execute("SELECT * FROM trabajos ORDER BY id DESC LIMIT ?", (limite,)).fetchall()
+    return [_como_dict(f) for f in filas]
+
+
+def _trabajador():
+    """
+    Identificador de este proceso. Se genera tras el fork (con preload_app
+    los workers nacen del mismo proceso y uno fijado al importar sería igual
+    en todos).
+    """
+    global _proceso
+    pid = os.getpid()
+    actual = _proceso
+    if actual is None or actual[0] != pid:
+        actual = _proceso = (pid, uuid.uuid4().hex[:12])
+    return actual[1]
+
+
+def _tomar():
+    """Marca como en curso el siguiente trabajo disponible y lo devuelve, o None."""
+    ahora = time.time()
+    fila = _conexion().execute(
+        "UPDATE trabajos SET estado = 'en_curso', intentos = intentos + 1, trabajador = ?, actualizado = ? "
+        "WHERE id = (SELECT id FROM trabajos WHERE estado = 'pendiente' AND disponible_en <= ? "
+        "            ORDER BY id LIMIT 1) AND estado = 'pendiente' "
+        "RETURNING *",
+        (_trabajador(), ahora, ahora),
+    ).fetchone()
+    return _como_dict(fila)
+
+
+def _actualizar(id_trabajo, **campos):
+    campos["actualizado"] = time.time()
+    asignaciones = ", ".join(f"{campo} = ?" for campo in campos)
+    _conexion().execute(f"UPDATE trabajos SET {asignaciones} WHERE id = ?", (*campos.values(), id_trabajo))
+
+
+def _latir():
+    """Renueva `actualizado` de los trabajos que está ejecutando este proceso."""
+    with _candado:
+        ids = list(_ejecutando)
+    if ids:
+        _conexion().execute(
+            f"UPDATE trabajos SET actualizado = ? WHERE estado = 'en_curso' AND trabajador = ? "
+            f"AND id IN ({', '.join('?' * len(ids))})",
+            (time.time(), _trabajador(), *ids),
+        )
+
+
+def _recuperar_abandonados():
+    """Devuelve a la cola los trabajos en curso sin latidos desde hace ABANDONO segundos."""
+    _conexion().execute(
+        "UPDATE trabajos SET estado = 'pendiente', trabajador = NULL WHERE estado = 'en_curso' AND actualizado < ?",
+        (time.time() - ABANDONO,),
+    )
+
+
+def _podar():
+    """Borra los trabajos terminados o fallidos más viejos que los MAX_HISTORIAL últimos."""
+    _conexion().execute(
+        "DELETE FROM trabajos WHERE estado IN ('terminado', 'fallido') AND id NOT IN "
+        "(SELECT id FROM trabajos WHERE estado IN ('terminado', 'fallido') ORDER BY id DESC LIMIT ?)",
+        (MAX_HISTORIAL,),
+    )
+
+
+# ------------------- EJECUCIÓN -------------------
+def _contar(clave):
+    with _candado:
+        _estadisticas[clave] += 1
+
+
+def _ejecutar(trabajo):
+    id_trabajo = trabajo["id"]
+
+    def avance(fraccion=None, mensaje=None):
+        """Progreso de 0 a 1 (None si no se conoce) y un texto para mostrar."""
+        try:
+            _actualizar(id_trabajo, progreso=fraccion, mensaje=mensaje)
+        except sqlite3.Error as e:
+            # El progreso es informativo: la tarea sigue aunque no se pueda guardar
+            print(f"No se pudo guardar el avance del trabajo {id_trabajo}:", e)
+
+    tarea_registrada = _tareas.get(trabajo["tipo"])
+    try:
+        if tarea_registrada is None:
+            raise ValueError(f"Tarea desconocida: {trabajo['tipo']}")
+        resultado = tarea_registrada.funcion(trabajo["argumentos"], avance)
+    except Exception as e:
+        print(f"Error en el trabajo {id_trabajo} ({trabajo['tipo']}):", e)
+        if tarea_registrada is not None and trabajo["intentos"] < trabajo["max_intentos"]:
+            espera = ESPERA_REINTENTO * 2 ** (trabajo["intentos"] - 1)
+            _actualizar(id_trabajo, estado="pendiente", trabajador=None, disponible_en=time.time() + espera,
+                        mensaje=f"Reintento {trabajo['intentos']} tras error: {e}")
+            _contar("reintentos")
+        else:
+            _actualizar(id_trabajo, estado="fallido", mensaje=str(e))
+            _contar("fallidos")
+        return
+    try:
+        texto = json.dumps(resultado)
+    except (TypeError, ValueError) as e:
+        # Repetir la tarea daría el mismo resultado: no se reintenta
+        print(f"Resultado no serializable del trabajo {id_trabajo} ({trabajo['tipo']}):", e)
+        _actualizar(id_trabajo, estado="fallido", mensaje=f"El resultado no se puede guardar como JSON: {e}")
+        _contar("fallidos")
+        return
+    _actualizar(id_trabajo, estado="terminado", progreso=1.0, resultado=texto)
+    _contar("terminados")
+
+
+def _trabajar():
+    """Bucle de cada hilo: toma trabajos mientras haya y si no espera un aviso o el sondeo."""
+    while True:
+        try:
+            trabajo = _tomar()
+        except sqlite3.Error as e:
+            print("Error al leer la cola de trabajos:", e)
+            trabajo = None
+        if trabajo is None:
+            _aviso.wait(ESPERA_SONDEO)
+            _aviso.clear()
+            continue
+        with _candado:
+            _ejecutando.add(trabajo["id"])
+        try:
+            _ejecutar(trabajo)
+        except Exception as e:
+            # Sin latidos, el trabajo vuelve a la cola pasado ABANDONO
+            print(f"Error al guardar el estado del trabajo {trabajo['id']}:", e)
+        finally:
+            with _candado:
+                _ejecutando.discard(trabajo["id"])
+        if trabajo["id"] % 100 == 0:
+            try:
+                _podar()
+            except sqlite3.Error as e:
+                print("Error al podar el historial de trabajos:", e)
+
+
+def _vigilar():
+    """Bucle del hilo de latidos: mantiene vivos los trabajos propios y recupera los abandonados."""
+    while True:
+        time.sleep(LATIDO)
+        try:
+            _latir()
+            _recuperar_abandonados()
+        except sqlite3.Error as e:
+            print("Error en el latido de los trabajos:", e)
+
+
+def iniciar():
+    """Arranca los hilos de este proceso (una sola vez)."""
+    if _hilos:
+        return
+    with _candado:
+        if _hilos:
+            return
+        try:
+            _recuperar_abandonados()
+        except sqlite3.Error as e:
+            print("Error al recuperar trabajos abandonados:", e)
+        for numero in range(HILOS):
+            hilo = threading.Thread(target=_trabajar, name=f"trabajos-{numero}", daemon=True)
+            hilo.start()
+            _hilos.append(hilo)
+        hilo = threading.Thread(target=_vigilar, name="trabajos-latido", daemon=True)
+        hilo.start()
+        _hilos.append(hilo)
+
+
+def _metricas_trabajos():
+    """Colector para /metrics con los trabajos por estado y los contadores del proceso."""
+    with _candado:
+        e = dict(_estadisticas)
+    try:
+        por_estado = dict(_conexion().execute("SELECT estado, COUNT(*) FROM trabajos GROUP BY estado").fetchall())
+    except sqlite3.Error:
+        por_estado = {}
+    return [
+        ("trabajos", "gauge", "Trabajos en la cola por estado.",
+         [((("estado", estado),), por_estado.get(estado, 0)) for estado in ESTADOS]),
+        ("trabajos_terminados_total", "counter", "Trabajos terminados por este proceso.", [((), e["terminados"])]),
+        ("trabajos_fallidos_total", "counter", "Trabajos fallidos tras agotar los reintentos.", [((), e["fallidos"])]),
+        ("trabajos_reintentos_total", "counter", "Ejecuciones fallidas que se volvieron a encolar.", [((), e["reintentos"])]),
+    ]
+
+
+metricas.registro.agregar_colector(_metricas_trabajos)
+
+
+def instalar(aplicacion):
+    """Arranca los hilos de trabajos con la primera petición del proceso."""
+    aplicacion.before_request(iniciar)
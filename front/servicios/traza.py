@@ -0,0 +1,119 @@
+# =================== servicios/traza.py ===================
+"""
+Modo de diagnóstico: traza de las llamadas a la API hechas en cada petición.
+
+Con TRAZA_API activado (variable de entorno TRAZA_API=1 o
+aplicacion.config["TRAZA_API"] = True) se anota, por cada petición
+entrante, cada acceso a la API: URL, método, duración, bytes recibidos y
+origen del dato:
+- "api": la petición hizo la llamada HTTP.
+- "cache": el listado salió de la caché.
+- "compartida": se reutilizó una llamada idéntica de otro hilo.
+
+El resumen se devuelve en la cabecera X-Traza-Api y, en las páginas que
+extienden base.html, en un pie de depuración. Se señalan las URL pedidas
+más de una vez en la misma petición y las tablas consultadas registro a
+registro (patrón N+1).
+"""
+import os
+import time
+
+from flask import current_app, g, has_request_context, request
+
+# A partir de cuántas consultas por id a una misma tabla se avisa de un N+1
+UMBRAL_N_MAS_1 = 3
+
+
+def activa():
+    """True si hay una petición en curso y la traza está activada."""
+    return has_request_context() and current_app.config.get("TRAZA_API", False)
+
+
+class llamada:
+    """
+    Bloque with que anota un acceso a la API en la traza de la petición.
+    Fuera de una petición, o con la traza desactivada, no hace nada.
+    """
+
+    def __init__(self, metodo, url):
+        self.metodo = metodo
+        self.url = url
+        self.registro = None
+
+    def __enter__(self):
+        if activa():
+            self.registro = {"metodo": self.metodo, "url": self.url, "origen": "cache", "bytes": 0, "ms": 0.0}
+            self._inicio = time.perf_counter()
+            g.setdefault("_traza_pila", []).append(self.registro)
+        return self
+
+    def __exit__(self, *exc):
+        if self.registro is not None:
+            self.registro["ms"] = round((time.perf_counter() - self._inicio) * 1000, 2)
+            g._traza_pila.pop()
+            g.setdefault("traza_api", []).append(self.registro)
+        return False
+
+
+def anotar(**campos):
+    """Completa el acceso que se está trazando (origen, bytes...)."""
+    if activa():
+        pila = g.get("_traza_pila")
+        if pila:
+            pila[-1].update(campos)
+
+
+def resumen():
+    """Resumen de las llamadas de la petición actual, o None si no hay traza."""
+    if not activa():
+        return None
+    llamadas = g.get("traza_api", [])
+
+    conteo_urls = {}
+    por_id = {}
+    for ll in llamadas:
+        if ll["metodo"] != "GET":
+            continue
+        conteo_urls[ll["url"]] = conteo_urls.get(ll["url"], 0) + 1
+        partes = ll["url"].split("/api/", 1)[-1].split("?")[0].split("/")
+        if len(partes) >= 3:
+            por_id.setdefault(partes[0], set()).add(ll["url"])
+
+    return {
+        "llamadas": llamadas,
+        "total": len(llamadas),
+        "api": sum(1 for ll in llamadas if ll["origen"] == "api"),
+        "cache": sum(1 for ll in llamadas if ll["origen"] == "cache"),
+        "compartidas": sum(1 for ll in llamadas if ll["origen"] == "compartida"),
+        "ms": round(sum(ll["ms"] for ll in llamadas), 2),
+        "bytes": sum(ll["bytes"] for ll in llamadas),
+        "duplicadas": {url: n for url, n in conteo_urls.items() if n > 1},
+        "n_mas_1": {tabla: len(urls) for tabla, urls in por_id.items() if len(urls) >= UMBRAL_N_MAS_1},
+    }
+
+
+# ------------------- INTEGRACIÓN CON FLASK -------------------
+def _cabecera(respuesta):
+    datos = resumen()
+    if datos is None:
+        return respuesta
+    respuesta.headers["X-Traza-Api"] = (
+        f"llamadas={datos['total']}; api={datos['api']}; cache={datos['cache']}; "
+        f"compartidas={datos['compartidas']}; ms={datos['ms']}; bytes={datos['bytes']}; "
+        f"duplicadas={len(datos['duplicadas'])}; n_mas_1={len(datos['n_mas_1'])}"
+    )
+    for url, veces in datos["duplicadas"].items():
+        print(f"Traza API [{request.endpoint}]: {url} pedida {veces} veces en la misma petición")
+    for tabla, veces in datos["n_mas_1"].items():
+        print(f"Traza API [{request.endpoint}]: posible N+1, {veces} consultas por id a {tabla}")
+    return respuesta
+
+
+def instalar(aplicacion):
+    """
+    Registra la cabecera X-Traza-Api y la función traza_api() para las
+    plantillas. La traza solo se recoge si TRAZA_API está activado.
+    """
+    aplicacion.config.setdefault("TRAZA_API", os.environ.get("TRAZA_API") == "1")
+    aplicacion.after_request(_cabecera)
+    aplicacion.context_processor(lambda: {"traza_api": resumen})
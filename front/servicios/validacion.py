@@ -0,0 +1,142 @@
+# =================== servicios/validacion.py ===================
+"""
+Respuestas 304 (ETag / If-None-Match) para las páginas de listados.
+
+Mientras se atiende un GET, cliente_api anota aquí cada listado que sirve
+desde la caché junto con su versión (ver CacheListas.version_de). Si la
+página solo usó listados de la caché, su ETag se calcula con esas
+versiones y el usuario de la sesión, y se envía con
+"Cache-Control: private, no-cache": el navegador guarda la página, pero
+la vuelve a validar en cada visita.
+
+En la siguiente visita, antes de ejecutar la vista, se recalcula el ETag
+con las versiones actuales de los mismos listados; si coincide con el que
+trae If-None-Match se responde 304 sin pedir datos ni renderizar. Si algún
+listado no está en caché o pasó su TTL suave, la vista corre como siempre
+(y dispara el refresco).
+
+Las versiones son propias de cada proceso, así que el ETag incluye un
+identificador del proceso: con varios workers, una página validada por
+otro worker se sirve entera (nunca un 304 equivocado). El identificador
+se genera en el propio proceso, después del fork: con preload_app todos
+los workers importan este módulo en el proceso maestro y un valor fijado
+al importar sería el mismo en todos.
+
+Las páginas que consultan un registro por id, o que fallaron al leer de la
+API, no llevan ETag.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+from flask import current_app, g, has_request_context, request, session
+
+from servicios import traza
+
+# (pid, identificador de este proceso dentro del ETag)
+_proceso = None
+
+# Páginas recordadas (ruta con query string -> URL de los listados que usa)
+MAX_PAGINAS = 2048
+
+_dependencias = {}
+_candado = threading.Lock()
+
+
+# ------------------- ANOTACIONES DE cliente_api -------------------
+def _aplica():
+    return has_request_context() and request.method == "GET" and not traza.activa()
+
+
+def usar_listado(url, version):
+    """Anota un listado servido desde la caché (version None si no se pudo fijar)."""
+    if not _aplica():
+        return
+    if version is None:
+        g.sin_validador = True
+    else:
+        g.setdefault("listados_usados", {})[url] = version
+
+
+def sin_validador():
+    """La petición usó datos que no salen de la caché: la página no lleva ETag."""
+    if _aplica():
+        g.sin_validador = True
+
+
+# ------------------- CÁLCULO DEL ETAG -------------------
+def identificador_proceso():
+    """Identificador al azar de este proceso; se renueva si cambia el pid (fork)."""
+    global _proceso
+    pid = os.getpid()
+    actual = _proceso
+    if actual is None or actual[0] != pid:
+        actual = _proceso = (pid, uuid.uuid4().hex)
+    return actual[1]
+
+
+def _etag(versiones):
+    usuario = json.dumps(session.get("usuario"), sort_keys=True, default=str)
+    base = repr((identificador_proceso(), request.full_path, usuario, sorted(versiones.items())))
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+def _respuesta_304(etag):
+    respuesta = current_app.response_class(status=304)
+    _cabeceras(respuesta, etag)
+    return respuesta
+
+
+def _cabeceras(respuesta, etag):
+    respuesta.set_etag(etag)
+    respuesta.headers["Cache-Control"] = "private, no-cache"
+    respuesta.vary.add("Cookie")
+
+
+# ------------------- INTEGRACIÓN CON FLASK -------------------
+def _validar_antes():
+    """Responde 304 sin ejecutar la vista si los listados de la página no cambiaron."""
+    if not _aplica() or not request.if_none_match:
+        return None
+    with _candado:
+        urls = _dependencias.get(request.full_path)
+    if not urls:
+        return None
+    from servicios import cliente_api
+
+    versiones = {url: cliente_api.cache.version_fresca(url) for url in urls}
+    if None in versiones.values():
+        return None
+    etag = _etag(versiones)
+    if request.if_none_match.contains(etag):
+        return _respuesta_304(etag)
+    return None
+
+
+def _validar_despues(respuesta):
+    """Pone el ETag a las páginas hechas solo con listados de la caché."""
+    listados = g.get("listados_usados")
+    if (not _aplica() or not listados or g.get("sin_validador")
+            or respuesta.status_code != 200 or respuesta.mimetype != "text/html"):
+        return respuesta
+    with _candado:
+        if len(_dependencias) >= MAX_PAGINAS and request.full_path not in _dependencias:
+            _dependencias.clear()
+        _dependencias[request.full_path] = tuple(listados)
+    etag = _etag(listados)
+    if request.if_none_match.contains(etag):
+        # Los datos volvieron a la misma versión tras un refresco
+        return _respuesta_304(etag)
+    _cabeceras(respuesta, etag)
+    return respuesta
+
+
+def instalar(aplicacion):
+    """
+    Registra la validación. Debe instalarse después de la protección de
+    rutas para que una sesión vencida reciba la redirección al login.
+    """
+    aplicacion.before_request(_validar_antes)
+    aplicacion.after_request(_validar_despues)
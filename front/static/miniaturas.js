@@ -0,0 +1,41 @@
+// =================== static/miniaturas.js ===================
+// Las miniaturas que todavía se están generando llegan como una imagen de
+// espera (202, sin caché; ver servicios/miniaturas.py). Cada <img
+// class="miniatura"> se revisa una vez al cargar: mientras el servidor
+// responda 202 se vuelve a pedir con esperas crecientes, y cuando llega la
+// miniatura reemplaza a la imagen de espera. Las que ya estaban listas
+// salen de la caché del navegador sin ir al servidor.
+(function () {
+    var REINTENTOS = 6;
+    var ESPERA_MS = 1500;
+
+    function revisar(img, url, intento) {
+        fetch(url, { credentials: "same-origin" }).then(function (respuesta) {
+            if (respuesta.status === 202) {
+                if (intento < REINTENTOS) {
+                    setTimeout(function () { revisar(img, url, intento + 1); }, ESPERA_MS * (intento + 1));
+                }
+                return;
+            }
+            if (respuesta.ok) {
+                return respuesta.blob().then(function (datos) {
+                    img.src = URL.createObjectURL(datos);
+                });
+            }
+        }).catch(function () { /* se queda la imagen que haya */ });
+    }
+
+    function cargada(img) {
+        if (!img.classList || !img.classList.contains("miniatura") || img.dataset.revisada) return;
+        img.dataset.revisada = "1";
+        revisar(img, img.getAttribute("src"), 0);
+    }
+
+    // "load" no burbujea: se escucha en captura para incluir las filas que agrega parcial.js
+    document.addEventListener("load", function (evento) { cargada(evento.target); }, true);
+
+    // Las que terminaron de cargar antes de que corriera este script
+    Array.prototype.forEach.call(document.querySelectorAll("img.miniatura"), function (img) {
+        if (img.complete) cargada(img);
+    });
+})();
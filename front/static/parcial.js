@@ -0,0 +1,65 @@
+// =================== static/parcial.js ===================
+// Envía los formularios de crear, actualizar y eliminar sin recargar la
+// página: el servidor (servicios/parcial.py) devuelve solo la fila o la
+// tabla cambiada, o la orden de quitar la fila.
+(function () {
+    var ESCRITURA = /\/(crear|actualizar|eliminar)(\/|$)/;
+
+    function accionEliminar(fila) {
+        var formulario = fila.querySelector("form[action*='/eliminar/']");
+        return formulario ? formulario.getAttribute("action") : null;
+    }
+
+    function crearFila(html) {
+        var tabla = document.createElement("tbody");
+        tabla.innerHTML = html;
+        return tabla.firstElementChild;
+    }
+
+    function aplicar(formulario, respuesta) {
+        var cuerpo = document.querySelector("tbody");
+        if (respuesta.accion === "eliminar") {
+            var fila = formulario.closest("tr");
+            if (fila) fila.remove();
+        } else if (respuesta.accion === "fila") {
+            var nueva = crearFila(respuesta.html);
+            var clave = accionEliminar(nueva);
+            var vieja = Array.prototype.find.call(cuerpo.rows, function (f) {
+                return accionEliminar(f) === clave;
+            });
+            if (vieja) vieja.replaceWith(nueva);
+            else window.location.reload();
+        } else if (respuesta.accion === "tabla") {
+            cuerpo.innerHTML = respuesta.html;
+        }
+        if (/\/crear$/.test(formulario.getAttribute("action"))) formulario.reset();
+    }
+
+    document.addEventListener("submit", function (evento) {
+        var formulario = evento.target;
+        var accion = formulario.getAttribute("action") || "";
+        if (formulario.method.toLowerCase() !== "post" || !ESCRITURA.test(accion)) return;
+        evento.preventDefault();
+
+        // La tabla que devuelve el servidor respeta el orden y la búsqueda de la página (?orden=, ?texto=)
+        var url = accion.indexOf("?") === -1 ? accion + window.location.search : accion;
+        fetch(url, {
+            method: "POST",
+            body: new FormData(formulario),
+            headers: { "X-Parcial": "1" }
+        }).then(function (respuesta) {
+            var tipo = respuesta.headers.get("Content-Type") || "";
+            if (tipo.indexOf("application/json") === 0) {
+                return respuesta.json().then(function (datos) { aplicar(formulario, datos); });
+            }
+            // No hubo respuesta parcial: se muestra lo que haya devuelto el servidor
+            if (respuesta.redirected) {
+                window.location = respuesta.url;
+                return;
+            }
+            return respuesta.text().then(function (texto) { alert(texto); });
+        }).catch(function (error) {
+            alert("No se pudo completar la operación: " + error);
+        });
+    });
+})();
@@ -0,0 +1,71 @@
+# =================== tests/conftest.py ===================
+"""
+Fixtures comunes de las pruebas.
+
+Las rutas llevan fija la URL de la API (http://localhost:5031/api), así
+que la API simulada (benchmarks/api_simulada.py) se levanta en ese puerto
+durante toda la sesión. Las carpetas de datos de la aplicación (almacén,
+cola de trabajos, informes, marcas de escritura) van a un directorio
+temporal: se fijan antes de importar los servicios, que las leen al
+importarse.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+CARPETA_FRONT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CARPETA_FRONT)
+
+DATOS = tempfile.mkdtemp(prefix="front-pruebas-")
+os.environ["ARCHIVOS_DIR"] = os.path.join(DATOS, "almacen")
+os.environ["TRABAJOS_DB"] = os.path.join(DATOS, "trabajos.sqlite3")
+os.environ["TRABAJOS_DIR"] = os.path.join(DATOS, "resultados")
+os.environ["INFORMES_DIR"] = os.path.join(DATOS, "informes")
+os.environ["CACHE_ESCRITURAS_DIR"] = os.path.join(DATOS, "escrituras")
+os.environ.pop("LIMITES_DB", None)
+os.environ.pop("METRICAS_DIR", None)
+os.environ.pop("METRICAS_TOKEN", None)
+
+from benchmarks import api_simulada  # noqa: E402
+
+# Filas por tabla de la API simulada
+FILAS = 30
+API = "http://localhost:5031/api"
+
+
+@pytest.fixture(scope="session")
+def api():
+    """AlmacenMemoria de la API simulada (para leer o cambiar datos por fuera del front)."""
+    servidor, almacen = api_simulada.iniciar(filas=FILAS, puerto=5031)
+    yield almacen
+    servidor.shutdown()
+
+
+@pytest.fixture(scope="session")
+def aplicacion(api):
+    from app import crear_aplicacion
+
+    return crear_aplicacion(configuracion={"TESTING": True})
+
+
+@pytest.fixture(autouse=True)
+def estado_limpio(api):
+    """Cada prueba empieza con las cachés vacías y sin intentos de login gastados."""
+    from servicios import cliente_api, limites
+
+    cliente_api.cache.invalidar()
+    cliente_api.fragmentos.invalidar()
+    cliente_api._proyecciones_fallidas.clear()
+    limites.backend = limites.EnMemoria()
+    yield
+
+
+@pytest.fixture
+def cliente(aplicacion):
+    """Cliente de pruebas con una sesión iniciada."""
+    cliente = aplicacion.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion["usuario"] = {"email": "pruebas@ejemplo.com", "id": 1}
+    return cliente
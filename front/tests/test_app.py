@@ -0,0 +1,16 @@
+# =================== tests/test_app.py ===================
+"""Creación de la aplicación: la clave de las sesiones en producción."""
+import pytest
+
+from app import crear_aplicacion
+
+
+def test_produccion_sin_secret_key_no_arranca(monkeypatch):
+    monkeypatch.delenv("SECRET_KEY", raising=False)
+    with pytest.raises(RuntimeError):
+        crear_aplicacion(produccion=True)
+
+
+def test_produccion_usa_la_secret_key_del_entorno(monkeypatch):
+    monkeypatch.setenv("SECRET_KEY", "clave-de-prueba")
+    assert crear_aplicacion(produccion=True).secret_key == "clave-de-prueba"
@@ -0,0 +1,66 @@
+# =================== tests/test_cache_api.py ===================
+"""Caché de listados: escrituras de otros workers y login sin caché."""
+import os
+import time
+
+from werkzeug.security import generate_password_hash
+
+from servicios import cliente_api
+from servicios.cache_api import CacheListas
+
+from conftest import API
+
+
+def _escritura_de_otro_proceso(tabla):
+    """Deja las marcas que dejaría otro worker tras escribir en la tabla."""
+    ahora = time.time_ns()
+    os.makedirs(cliente_api.ESCRITURAS_DIR, exist_ok=True)
+    for nombre in (tabla, "_todas"):
+        camino = os.path.join(cliente_api.ESCRITURAS_DIR, nombre)
+        with open(camino, "a"):
+            os.utime(camino, ns=(ahora, ahora))
+
+
+def test_refresco_con_los_mismos_datos_conserva_la_version():
+    cache = CacheListas()
+    primero = cache.obtener("k", lambda: [{"id": 1}])
+    version = cache.version_de(primero)
+    cache._guardar("k", [{"id": 1}], cache._epoca)
+    assert cache.version_de(cache.obtener("k", list)) == version
+
+
+def test_escritura_de_otro_worker_invalida_el_listado(cliente, api):
+    url = f"{API}/estado"
+    antes = cliente_api.obtener_datos(url)
+    api.actualizar("estado", "id", str(antes[0]["id"]), {"nombre": "cambiado por otro worker"})
+
+    # Sin marca, este proceso sigue sirviendo su copia
+    cliente.get("/")
+    assert cliente_api.obtener_datos(url)[0]["nombre"] != "cambiado por otro worker"
+
+    _escritura_de_otro_proceso("estado")
+    cliente.get("/")
+    assert cliente_api.obtener_datos(url)[0]["nombre"] == "cambiado por otro worker"
+
+
+def test_escritura_propia_no_vuelve_a_invalidar(cliente):
+    url = f"{API}/estado"
+    datos = cliente_api.obtener_datos(url)
+    cliente_api.actualizar(f"{url}/id/{datos[0]['id']}", {"descripcion": "propia"})
+    aplicado = cliente_api.obtener_datos(url)
+    cliente.get("/")
+    # La escritura se aplicó al listado en caché y la marca propia no lo descarta
+    assert cliente_api.obtener_datos(url) is aplicado
+
+
+def test_login_lee_el_usuario_sin_pasar_por_la_cache(aplicacion, api):
+    email = api.buscar("usuario", "id", "2")[0]["email"]
+    api.actualizar("usuario", "id", "2", {"contrasena": generate_password_hash("vieja")})
+    cliente_api.obtener_datos(f"{API}/usuario")   # listado en caché con la contraseña vieja
+
+    # Otro worker cambia la contraseña
+    api.actualizar("usuario", "id", "2", {"contrasena": generate_password_hash("nueva")})
+    cliente = aplicacion.test_client()
+    assert cliente.post("/login", data={"email": email, "contrasena": "vieja"}).status_code == 200
+    respuesta = cliente.post("/login", data={"email": email, "contrasena": "nueva"})
+    assert respuesta.status_code == 302
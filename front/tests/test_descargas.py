@@ -0,0 +1,45 @@
+# =================== tests/test_descargas.py ===================
+"""Descargas del almacén: rangos condicionados con If-Range."""
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from werkzeug.http import http_date
+
+from servicios import descargas
+
+CONTENIDO = b"0123456789" * 10
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    camino = tmp_path / "adjunto.bin"
+    camino.write_bytes(CONTENIDO)
+    os.utime(camino, (1_700_000_000, 1_700_000_000))
+    return str(camino)
+
+
+def _pedir(aplicacion, archivo, if_range):
+    with aplicacion.test_request_context(headers={"Range": "bytes=10-19", "If-Range": if_range}):
+        respuesta = descargas.enviar(archivo, "etag-adjunto", "adjunto.bin")
+    respuesta.close()
+    return respuesta
+
+
+def test_if_range_con_la_fecha_exacta_responde_el_rango(aplicacion, archivo):
+    respuesta = _pedir(aplicacion, archivo, http_date(1_700_000_000))
+    assert respuesta.status_code == 206
+    assert respuesta.headers["Content-Range"] == "bytes 10-19/100"
+
+
+@pytest.mark.parametrize("desfase", [timedelta(days=1), timedelta(seconds=-1)])
+def test_if_range_con_otra_fecha_responde_el_archivo_completo(aplicacion, archivo, desfase):
+    fecha = datetime.fromtimestamp(1_700_000_000, tz=timezone.utc) + desfase
+    respuesta = _pedir(aplicacion, archivo, http_date(fecha))
+    assert respuesta.status_code == 200
+    assert respuesta.content_length == len(CONTENIDO)
+
+
+def test_if_range_con_etag(aplicacion, archivo):
+    assert _pedir(aplicacion, archivo, '"etag-adjunto"').status_code == 206
+    assert _pedir(aplicacion, archivo, '"otro"').status_code == 200
@@ -0,0 +1,71 @@
+# =================== tests/test_informes.py ===================
+"""Informes por proyecto: estado en la lista, lectura de las fuentes y marcas de cambio."""
+import os
+
+import pytest
+
+from servicios import cliente_api, informes
+
+
+def test_lista_de_informes_sin_etag(cliente):
+    respuesta = cliente.get("/informes")
+    assert respuesta.status_code == 200
+    assert "ETag" not in respuesta.headers
+
+
+def test_cambio_de_estado_se_ve_en_la_siguiente_visita(cliente):
+    antes = cliente.get("/informes")
+    assert "Al día" not in antes.get_data(as_text=True)
+
+    # Un informe recién generado pasa a "Al día"
+    os.makedirs(informes.DIRECTORIO, exist_ok=True)
+    with open(informes.camino(1, "json"), "w", encoding="utf-8") as archivo:
+        archivo.write("{}")
+    try:
+        despues = cliente.get("/informes", headers={"If-None-Match": antes.headers.get("ETag", "*")})
+        assert despues.status_code == 200
+        assert "Al día" in despues.get_data(as_text=True)
+    finally:
+        os.remove(informes.camino(1, "json"))
+
+
+def _id_con_datos(fuentes):
+    """Un proyecto con productos, entregables y presupuestos en la API simulada."""
+    for proyecto in fuentes.tablas["proyecto"]:
+        datos = informes.datos_proyecto(fuentes, proyecto["id"])
+        if datos["productos"] and datos["presupuestos"] and any(p["entregables"] for p in datos["productos"]):
+            return proyecto["id"]
+    pytest.skip("la API simulada no generó un proyecto con todas sus relaciones")
+
+
+def test_informe_de_un_proyecto_lee_solo_sus_filas(api, monkeypatch):
+    completas = informes.Fuentes.cargar()
+    id_proyecto = _id_con_datos(completas)
+
+    pedidas = []
+    original = cliente_api.iterar_datos
+
+    def anotar(url):
+        pedidas.append(url)
+        return original(url)
+
+    monkeypatch.setattr(cliente_api, "iterar_datos", anotar)
+    parciales = informes.Fuentes.cargar_proyectos([id_proyecto])
+
+    assert pedidas and not any("limite=" in url for url in pedidas)
+    assert informes.datos_proyecto(parciales, id_proyecto) == informes.datos_proyecto(completas, id_proyecto)
+
+
+def test_informe_de_un_proyecto_inexistente_no_se_genera(api):
+    assert informes.generar([99999]) == {"generados": 0, "sin_cambios": 0}
+
+
+def test_marcar_cambio_sin_disco_no_rompe_la_escritura(cliente, monkeypatch):
+    def sin_disco(*argumentos, **opciones):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(informes.os, "makedirs", sin_disco)
+    informes.marcar_cambio("estado")
+
+    respuesta = cliente.post("/estado/actualizar", data={"id": "4", "nombre": "Sin disco", "descripcion": "x"})
+    assert respuesta.status_code == 302
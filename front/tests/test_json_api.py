@@ -0,0 +1,36 @@
+# =================== tests/test_json_api.py ===================
+"""Lectura de la lista "datos" por trozos."""
+import json
+
+from servicios import json_api
+
+RESPUESTA = json.dumps({
+    "total": -3,
+    "datos": [
+        {"id": 1, "monto": -12.5e+3, "tasa": 1E-2, "parte": 0.25, "activo": True, "padre": None, "nombre": "ñandú"},
+        7, -0.0, 1.5e10, 123456789, "texto", [1, 2.5],
+    ],
+    "fin": 10.75,
+}, ensure_ascii=False).encode("utf-8")
+
+ESPERADO = json.loads(RESPUESTA)["datos"]
+
+
+def test_respuesta_en_un_solo_trozo():
+    assert list(json_api.iterar_datos([RESPUESTA])) == ESPERADO
+
+
+def test_cualquier_corte_en_dos_trozos():
+    for i in range(len(RESPUESTA) + 1):
+        assert list(json_api.iterar_datos([RESPUESTA[:i], RESPUESTA[i:]])) == ESPERADO, i
+
+
+def test_cualquier_corte_en_tres_trozos():
+    for i in range(len(RESPUESTA) + 1):
+        for j in range(i, len(RESPUESTA) + 1):
+            trozos = [RESPUESTA[:i], RESPUESTA[i:j], RESPUESTA[j:]]
+            assert list(json_api.iterar_datos(trozos)) == ESPERADO, (i, j)
+
+
+def test_byte_a_byte():
+    assert list(json_api.iterar_datos(RESPUESTA[i:i + 1] for i in range(len(RESPUESTA)))) == ESPERADO
@@ -0,0 +1,48 @@
+# =================== tests/test_limites.py ===================
+"""Límite de intentos de login: 429 con Retry-After."""
+import time
+
+import pytest
+
+from servicios import limites
+
+
+def _intentar(aplicacion, email, ip="10.0.0.1"):
+    return aplicacion.test_client().post(
+        "/login", data={"email": email, "contrasena": "incorrecta"}, environ_base={"REMOTE_ADDR": ip}
+    )
+
+
+def test_limite_por_email(aplicacion):
+    capacidad, periodo = limites.LOGIN_POR_EMAIL
+    for _ in range(capacidad):
+        assert _intentar(aplicacion, "limite@ejemplo.com").status_code == 200
+
+    respuesta = _intentar(aplicacion, "limite@ejemplo.com")
+    assert respuesta.status_code == 429
+    espera = int(respuesta.headers["Retry-After"])
+    assert 0 < espera <= periodo / capacidad + 1
+
+    # El mismo email desde otra IP también espera; otro email no
+    assert _intentar(aplicacion, "LIMITE@ejemplo.com ", ip="10.0.0.2").status_code == 429
+    assert _intentar(aplicacion, "otro@ejemplo.com").status_code == 200
+
+
+def test_limite_por_ip(aplicacion):
+    capacidad, _ = limites.LOGIN_POR_IP
+    for n in range(capacidad):
+        assert _intentar(aplicacion, f"usuario{n}@ejemplo.com", ip="10.0.0.3").status_code == 200
+
+    respuesta = _intentar(aplicacion, "nuevo@ejemplo.com", ip="10.0.0.3")
+    assert respuesta.status_code == 429
+    assert int(respuesta.headers["Retry-After"]) >= 1
+    assert _intentar(aplicacion, "nuevo@ejemplo.com", ip="10.0.0.4").status_code == 200
+
+
+@pytest.mark.parametrize("backend", ["memoria", "sqlite"])
+def test_las_fichas_se_recuperan(backend, tmp_path):
+    cubetas = limites.EnMemoria() if backend == "memoria" else limites.EnSqlite(str(tmp_path / "limites.sqlite3"))
+    assert cubetas.consumir("k", 1, 0.05) == 0
+    assert cubetas.consumir("k", 1, 0.05) > 0
+    time.sleep(0.06)
+    assert cubetas.consumir("k", 1, 0.05) == 0
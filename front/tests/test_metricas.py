@@ -0,0 +1,97 @@
+# =================== tests/test_metricas.py ===================
+"""/metrics: acceso con sesión o token y suma de las métricas de varios procesos."""
+import os
+import time
+
+import pytest
+
+from servicios import metricas
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    """METRICAS_DIR en una carpeta temporal (modo de varios procesos)."""
+    monkeypatch.setattr(metricas, "DIRECTORIO", str(tmp_path))
+    return tmp_path
+
+
+def _familia(familias, nombre):
+    return next(muestras for n, _, _, _, muestras in familias if n == nombre)
+
+
+def _otro_proceso(carpeta, nombre, pid, familias, edad=0):
+    """Deja el archivo que volcaría otro proceso hace `edad` segundos."""
+    camino = carpeta / f"{pid}-prueba{nombre}.json"
+    camino.write_text(metricas._serializar(familias), encoding="utf-8")
+    instante = time.time() - edad
+    os.utime(camino, (instante, instante))
+    return camino
+
+
+def test_sin_sesion_ni_token_no_responde(aplicacion):
+    respuesta = aplicacion.test_client().get("/metrics")
+    assert respuesta.status_code == 302
+
+
+def test_con_token_responde_sin_sesion(aplicacion, monkeypatch):
+    monkeypatch.setattr(metricas, "TOKEN", "secreto")
+    cliente = aplicacion.test_client()
+    assert cliente.get("/metrics", headers={"Authorization": "Bearer otro"}).status_code == 302
+    respuesta = cliente.get("/metrics", headers={"Authorization": "Bearer secreto"})
+    assert respuesta.status_code == 200
+    assert b"flask_respuestas_total" in respuesta.data
+
+
+def test_con_sesion_responde(cliente):
+    assert cliente.get("/metrics").status_code == 200
+
+
+def test_suma_contadores_e_histogramas_de_otros_procesos(carpeta):
+    contador = (("metodo", "GET"),)
+    otras = [
+        ("prueba_total", "counter", "Prueba.", None, {contador: 5}),
+        ("prueba_segundos", "histogram", "Prueba.", (0.1, 1.0), {(): [1, 2, 3.5, 3]}),
+        ("prueba_en_curso", "gauge", "Prueba.", None, {(): 7}),
+    ]
+    propias = [
+        ("prueba_total", "counter", "Prueba.", None, {contador: 2}),
+        ("prueba_segundos", "histogram", "Prueba.", (0.1, 1.0), {(): [0, 1, 0.5, 1]}),
+        ("prueba_en_curso", "gauge", "Prueba.", None, {(): 1}),
+    ]
+    _otro_proceso(carpeta, "a", 111, otras)
+    _otro_proceso(carpeta, "b", 222, otras, edad=3 * metricas.INTERVALO + 1)
+
+    familias = metricas._combinar(propias, metricas._leer_otros_procesos())
+
+    assert _familia(familias, "prueba_total") == {contador: 12}
+    assert _familia(familias, "prueba_segundos") == {(): [2, 5, 7.5, 7]}
+    # Los indicadores solo de los procesos vivos, cada uno con su pid
+    assert _familia(familias, "prueba_en_curso") == {
+        (("pid", str(os.getpid())),): 1,
+        (("pid", "111"),): 7,
+    }
+
+
+def test_procesos_terminados_se_retiran_sin_perder_contadores(carpeta):
+    contador = (("metodo", "GET"),)
+    terminado = _otro_proceso(carpeta, "a", 111, [
+        ("prueba_total", "counter", "Prueba.", None, {contador: 5}),
+        ("prueba_en_curso", "gauge", "Prueba.", None, {(): 7}),
+    ], edad=metricas.RETIRO + 1)
+
+    metricas._leer_otros_procesos()
+    assert not terminado.exists()
+    assert (carpeta / "_retirados.json").exists()
+
+    familias = metricas._combinar([], metricas._leer_otros_procesos())
+    assert _familia(familias, "prueba_total") == {contador: 5}
+    assert "prueba_en_curso" not in [nombre for nombre, *_ in familias]
+
+
+def test_volcar_y_exportar_incluye_los_demas_procesos(carpeta):
+    metricas.volcar()
+    assert (carpeta / metricas._archivo_propio()).exists()
+    _otro_proceso(carpeta, "a", 111, [
+        ("flask_peticiones_en_curso", "gauge", "Prueba.", None, {(): 3}),
+    ])
+    assert 'flask_peticiones_en_curso{pid="111"} 3' in metricas.registro.exportar()
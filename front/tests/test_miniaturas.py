@@ -0,0 +1,63 @@
+# =================== tests/test_miniaturas.py ===================
+"""Miniaturas: solo el contenido que no se puede decodificar queda sin vista para siempre."""
+import errno
+import io
+import os
+
+import pytest
+
+from servicios import miniaturas
+
+Image = pytest.importorskip("PIL.Image")
+
+HASH = "ab" + "0" * 62
+
+
+def _png():
+    salida = io.BytesIO()
+    Image.new("RGB", (400, 300), "red").save(salida, "PNG")
+    return salida.getvalue()
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    monkeypatch.setattr(miniaturas, "DIRECTORIO", str(tmp_path / "miniaturas"))
+    monkeypatch.setattr(miniaturas, "_reintentos", {})
+    return tmp_path
+
+
+def _archivo(carpeta, contenido):
+    camino = carpeta / "original"
+    camino.write_bytes(contenido)
+    return str(camino)
+
+
+def test_imagen_valida(carpeta):
+    miniaturas._generar(HASH, _archivo(carpeta, _png()), "imagen")
+    assert os.path.exists(miniaturas._camino(HASH, "jpg"))
+
+
+@pytest.mark.parametrize("contenido", [b"\x89PNG\r\n\x1a\nbasura" * 10, _png()[:200]])
+def test_contenido_invalido_queda_sin_vista(carpeta, contenido):
+    miniaturas._generar(HASH, _archivo(carpeta, contenido), "imagen")
+    assert os.path.exists(miniaturas._camino(HASH, "sin"))
+    assert not os.path.exists(miniaturas._camino(HASH, "jpg"))
+
+
+def test_fallo_pasajero_no_deja_marca(carpeta, monkeypatch):
+    camino = _archivo(carpeta, _png())
+
+    def disco_lleno(imagen, destino):
+        raise OSError(errno.ENOSPC, "No queda espacio en el dispositivo")
+
+    monkeypatch.setattr(miniaturas, "_guardar_jpeg", disco_lleno)
+    miniaturas._generar(HASH, camino, "imagen")
+    assert not os.path.exists(miniaturas._camino(HASH, "sin"))
+    assert HASH in miniaturas._reintentos
+
+    # Pasada la espera se vuelve a intentar y, con disco, se genera
+    monkeypatch.undo()
+    monkeypatch.setattr(miniaturas, "DIRECTORIO", str(carpeta / "miniaturas"))
+    miniaturas._reintentos.clear()
+    miniaturas._generar(HASH, camino, "imagen")
+    assert os.path.exists(miniaturas._camino(HASH, "jpg"))
@@ -0,0 +1,33 @@
+# =================== tests/test_parcial.py ===================
+"""Respuestas parciales de crear, actualizar y eliminar."""
+PARCIAL = {"X-Parcial": "1"}
+
+
+def test_eliminar_con_error_de_la_api_redirige(cliente):
+    # La API responde 404: la fila no debe desaparecer de la página
+    respuesta = cliente.post("/proyecto/eliminar/99999", headers=PARCIAL)
+    assert respuesta.status_code == 302
+    assert not respuesta.is_json
+
+
+def test_eliminar_exitoso_quita_la_fila(cliente, api):
+    nuevo = api.crear("estado", {"nombre": "Temporal", "descripcion": "para eliminar"})
+    respuesta = cliente.post(f"/estado/eliminar/{nuevo['id']}", headers=PARCIAL)
+    assert respuesta.get_json() == {"accion": "eliminar"}
+    assert not api.buscar("estado", "id", str(nuevo["id"]))
+
+
+def test_actualizar_exitoso_devuelve_la_fila(cliente):
+    cliente.get("/estado")
+    respuesta = cliente.post("/estado/actualizar", headers=PARCIAL,
+                             data={"id": "5", "nombre": "Parcial", "descripcion": "fila"})
+    datos = respuesta.get_json()
+    assert datos["accion"] == "fila"
+    assert "Parcial" in datos["html"]
+
+
+def test_actualizar_con_error_de_la_api_redirige(cliente):
+    respuesta = cliente.post("/estado/actualizar", headers=PARCIAL,
+                             data={"id": "99999", "nombre": "No existe", "descripcion": ""})
+    assert respuesta.status_code == 302
+    assert not respuesta.is_json
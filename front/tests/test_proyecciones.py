@@ -0,0 +1,44 @@
+# =================== tests/test_proyecciones.py ===================
+"""Las proyecciones de los desplegables piden columnas que las tablas tienen."""
+import pytest
+
+from benchmarks.api_simulada import TABLAS
+from servicios import cliente_api
+
+
+def _paginas(aplicacion):
+    """Rutas GET sin argumentos de los blueprints (listados y páginas sueltas)."""
+    return sorted(
+        regla.rule for regla in aplicacion.url_map.iter_rules()
+        if "GET" in regla.methods and not regla.arguments and "." in regla.endpoint
+        and regla.endpoint.split(".", 1)[0] != "rutas_login" and not regla.rule.endswith((".csv", "/exportar"))
+    )
+
+
+@pytest.fixture
+def proyecciones(monkeypatch):
+    """Anota (tabla, columnas) de cada llamada a obtener_columnas()."""
+    anotadas = []
+    original = cliente_api.obtener_columnas
+
+    def anotar(url, columnas, *argumentos, **opciones):
+        anotadas.append((cliente_api.tabla_de(url), tuple(columnas)))
+        return original(url, columnas, *argumentos, **opciones)
+
+    monkeypatch.setattr(cliente_api, "obtener_columnas", anotar)
+    return anotadas
+
+
+def test_ninguna_pagina_usa_una_proyeccion_rechazada(aplicacion, cliente, proyecciones):
+    paginas = _paginas(aplicacion)
+    assert "/archivo" in paginas and "/estado_proyecto" in paginas
+
+    for pagina in paginas:
+        respuesta = cliente.get(pagina)
+        assert respuesta.status_code < 500, pagina
+
+    assert proyecciones
+    assert cliente_api._proyecciones_fallidas == {}
+    for tabla, columnas in proyecciones:
+        desconocidas = set(columnas) - {"id", *TABLAS[tabla]}
+        assert not desconocidas, f"{tabla}: {sorted(desconocidas)}"
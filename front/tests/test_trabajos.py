@@ -0,0 +1,90 @@
+# =================== tests/test_trabajos.py ===================
+"""Cola de trabajos: los hilos sobreviven a los errores y los trabajos largos no se duplican."""
+import sqlite3
+import time
+
+import pytest
+
+from servicios import trabajos
+
+
+@trabajos.tarea("prueba_no_serializable", reintentos=0)
+def _no_serializable(argumentos, avance):
+    return object()
+
+
+@trabajos.tarea("prueba_eco", reintentos=0)
+def _eco(argumentos, avance):
+    return argumentos
+
+
+def _esperar(id_trabajo, estados=("terminado", "fallido"), segundos=10):
+    limite = time.time() + segundos
+    while time.time() < limite:
+        trabajo = trabajos.obtener(id_trabajo)
+        if trabajo["estado"] in estados:
+            return trabajo
+        time.sleep(0.02)
+    pytest.fail(f"El trabajo {id_trabajo} quedó {trabajos.obtener(id_trabajo)['estado']}")
+
+
+@pytest.fixture(autouse=True)
+def hilos():
+    trabajos.iniciar()
+
+
+def test_resultado_no_serializable_queda_fallido():
+    trabajo = _esperar(trabajos.encolar("prueba_no_serializable"))
+    assert trabajo["estado"] == "fallido"
+    assert "JSON" in trabajo["mensaje"]
+
+
+def test_los_hilos_sobreviven_a_un_error_de_la_base(monkeypatch):
+    original = trabajos._actualizar
+    fallidos = []
+
+    def actualizar(id_trabajo, **campos):
+        if campos.get("estado") == "terminado" and trabajos.obtener(id_trabajo)["argumentos"].get("romper"):
+            fallidos.append(id_trabajo)
+            raise sqlite3.OperationalError("database is locked")
+        return original(id_trabajo, **campos)
+
+    monkeypatch.setattr(trabajos, "_actualizar", actualizar)
+    for n in range(trabajos.HILOS):
+        trabajos.encolar("prueba_eco", {"romper": True, "n": n})
+    limite = time.time() + 10
+    while len(fallidos) < trabajos.HILOS and time.time() < limite:
+        time.sleep(0.02)
+    assert len(fallidos) == trabajos.HILOS
+
+    # Todos los hilos fallaron una vez y siguen tomando trabajos
+    assert _esperar(trabajos.encolar("prueba_eco", {"n": "despues"}))["estado"] == "terminado"
+
+
+def _en_curso(conexion, trabajador, hace):
+    ahora = time.time()
+    cursor = conexion.execute(
+        "INSERT INTO trabajos (tipo, argumentos, estado, intentos, max_intentos, disponible_en, creado, "
+        "actualizado, trabajador) VALUES ('prueba_eco', '{}', 'en_curso', 1, 1, ?, ?, ?, ?)",
+        # disponible_en en el futuro: si vuelve a la cola, ningún hilo la toma durante la prueba
+        (ahora + 3600, ahora - hace, ahora - hace, trabajador),
+    )
+    return cursor.lastrowid
+
+
+def test_trabajo_largo_con_latidos_no_se_recupera():
+    conexion = trabajos._conexion()
+    propio = _en_curso(conexion, trabajos._trabajador(), trabajos.ABANDONO + 60)
+    abandonado = _en_curso(conexion, "proceso-muerto", trabajos.ABANDONO + 60)
+    with trabajos._candado:
+        trabajos._ejecutando.add(propio)
+    try:
+        trabajos._latir()
+        trabajos._recuperar_abandonados()
+    finally:
+        with trabajos._candado:
+            trabajos._ejecutando.discard(propio)
+
+    assert trabajos.obtener(propio)["estado"] == "en_curso"
+    assert trabajos.obtener(abandonado)["estado"] == "pendiente"
+    conexion.execute("DELETE FROM trabajos WHERE id IN (?, ?)", (propio, abandonado))
@@ -0,0 +1,27 @@
+# =================== tests/test_usuarios.py ===================
+"""Actualización de usuarios: la contraseña nueva siempre se cifra."""
+from servicios import contrasenas
+
+
+def test_contrasena_nueva_con_signos_de_peso(cliente, aplicacion, api):
+    usuario = api.buscar("usuario", "id", "3")[0]
+    nueva = "pa$$wo$rd"
+    respuesta = cliente.post("/usuario/actualizar", data={
+        "id": "3", "email": usuario["email"], "activo": usuario["activo"], "contrasena": nueva,
+    })
+    assert respuesta.status_code == 302
+
+    guardada = api.buscar("usuario", "id", "3")[0]["contrasena"]
+    assert guardada != nueva
+    assert contrasenas.verificar(guardada, nueva)
+
+    login = aplicacion.test_client().post("/login", data={"email": usuario["email"], "contrasena": nueva})
+    assert login.status_code == 302
+
+
+def test_sin_contrasena_se_conserva_la_guardada(cliente, api):
+    usuario = api.buscar("usuario", "id", "4")[0]
+    cliente.post("/usuario/actualizar", data={
+        "id": "4", "email": usuario["email"], "activo": usuario["activo"], "contrasena": "",
+    })
+    assert api.buscar("usuario", "id", "4")[0]["contrasena"] == usuario["contrasena"]
@@ -0,0 +1,53 @@
+# =================== tests/test_validacion.py ===================
+"""ETag y 304 de los listados."""
+import os
+
+import pytest
+
+from servicios import validacion
+
+
+def test_listado_sin_cambios_responde_304(cliente):
+    primera = cliente.get("/estado")
+    assert primera.status_code == 200
+    assert primera.headers["ETag"]
+
+    segunda = cliente.get("/estado", headers={"If-None-Match": primera.headers["ETag"]})
+    assert segunda.status_code == 304
+    assert segunda.headers["ETag"] == primera.headers["ETag"]
+
+
+def test_escritura_cambia_el_etag(cliente):
+    etag = cliente.get("/estado").headers["ETag"]
+    cliente.post("/estado/actualizar", data={"id": "3", "nombre": "Renombrado", "descripcion": "x"})
+
+    respuesta = cliente.get("/estado", headers={"If-None-Match": etag})
+    assert respuesta.status_code == 200
+    assert respuesta.headers["ETag"] != etag
+    assert "Renombrado" in respuesta.get_data(as_text=True)
+
+
+def test_otro_usuario_no_recibe_304(cliente, aplicacion):
+    etag = cliente.get("/estado").headers["ETag"]
+    otro = aplicacion.test_client()
+    with otro.session_transaction() as sesion:
+        sesion["usuario"] = {"email": "otro@ejemplo.com", "id": 2}
+    assert otro.get("/estado", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork")
+def test_identificador_del_proceso_cambia_tras_fork():
+    """Con preload_app los workers nacen de un fork: no deben compartir identificador."""
+    padre = validacion.identificador_proceso()
+    lectura, escritura = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(lectura)
+        os.write(escritura, validacion.identificador_proceso().encode("ascii"))
+        os._exit(0)
+    os.close(escritura)
+    with os.fdopen(lectura, "rb") as entrada:
+        hijo = entrada.read().decode("ascii")
+    os.waitpid(pid, 0)
+    assert hijo and hijo != padre
+    assert validacion.identificador_proceso() == padre
@@ -0,0 +1,68 @@
+# =================== wsgi.py ===================
+"""
+Punto de entrada para producción.
+
+Crea la aplicación con la configuración de producción (sin depuración ni
+recarga de plantillas) para servirla con un servidor WSGI:
+
+- Linux (gunicorn, varios procesos con varios hilos cada uno):
+    gunicorn -c gunicorn.conf.py wsgi:aplicacion
+- Windows o Linux (waitress, un proceso con varios hilos):
+    python wsgi.py
+- Modo cooperativo con gevent (un proceso, cientos de peticiones a la vez
+  mientras esperan a la API):
+    WEB_MODO=gevent python wsgi.py
+    WEB_MODO=gevent gunicorn -c gunicorn.conf.py wsgi:aplicacion
+
+Los dos leen las mismas variables de entorno:
+- SECRET_KEY: clave con la que se firman las sesiones (obligatoria).
+- WEB_HOST, WEB_PUERTO: dirección donde se escucha (0.0.0.0:8000).
+- WEB_PROCESOS: procesos de gunicorn (por defecto 2 × núcleos + 1).
+- WEB_HILOS: hilos por proceso (8).
+- WEB_KEEPALIVE: segundos que se mantiene abierta una conexión inactiva (5).
+- WEB_MODO: "hilos" (por defecto) o "gevent".
+- WEB_CONEXIONES: con gevent, peticiones simultáneas por proceso (1000).
+- WEB_CARGA_PEREZOSA: "1" para importar las secciones poco usadas en su
+  primera petición (arranque más rápido; ver servicios/blueprints.py).
+"""
+import os
+
+MODO = os.environ.get("WEB_MODO", "hilos")
+
+if MODO == "gevent":
+    # Debe aplicarse antes de importar la aplicación: así requests usa
+    # sockets cooperativos y los candados de servicios/ son de gevent.
+    from gevent import monkey
+
+    monkey.patch_all()
+
+from app import crear_aplicacion
+from servicios import concurrencia
+
+HOST = os.environ.get("WEB_HOST", "0.0.0.0")
+PUERTO = int(os.environ.get("WEB_PUERTO", "8000"))
+HILOS = int(os.environ.get("WEB_HILOS", "8"))
+KEEPALIVE = int(os.environ.get("WEB_KEEPALIVE", "5"))
+CONEXIONES = int(os.environ.get("WEB_CONEXIONES", "1000"))
+CARGA_PEREZOSA = os.environ.get("WEB_CARGA_PEREZOSA") == "1"
+
+aplicacion = crear_aplicacion(produccion=True, carga_perezosa=CARGA_PEREZOSA)
+
+if MODO == "gevent":
+    problemas = concurrencia.verificar()
+    if problemas:
+        raise RuntimeError("Modo gevent mal aplicado: " + "; ".join(problemas))
+
+if __name__ == "__main__" and MODO == "gevent":
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer
+
+    print(f"Sirviendo en http://{HOST}:{PUERTO} con gevent ({CONEXIONES} conexiones)")
+    WSGIServer((HOST, PUERTO), aplicacion, spawn=Pool(CONEXIONES), log=None).serve_forever()
+
+elif __name__ == "__main__":
+    from waitress import serve
+
+    print(f"Sirviendo en http://{HOST}:{PUERTO} con waitress ({HILOS} hilos)")
+    serve(aplicacion, host=HOST, port=PUERTO, threads=HILOS,
+          channel_timeout=KEEPALIVE, connection_limit=max(100, HILOS * 25), ident=None)
@@ -1,3 +1,5 @@
+import os
+
 # Importar la clase principal de Flask y la función para renderizar plantillas
 from flask import Flask, render_template
 
@@ -10,66 +12,106 @@ from rutas.rutas_estado import rutas_estado
 from rutas.rutas_tipo_producto import rutas_tipo_producto
 from rutas.rutas_entregable import rutas_entregable
 from rutas.rutas_variable_estrategica import rutas_variable_estrategica
+from servicios import metricas
 
-# Crear la instancia de la aplicación Flask
-aplicacion = Flask(__name__)
-# Clave secreta utilizada por Flask para firmar las sesiones y permitir el uso de mensajes flash.
-# Es obligatoria cuando se usan sesiones o funciones como flash() y debe mantenerse privada.
-aplicacion.secret_key = "clave-secreta-12345"
-
-
-# ------------------- Registro de Blueprints -------------------
-# Registrar el Blueprint de productos en la aplicación principal
-
-aplicacion.register_blueprint(rutas_usuarios)
-aplicacion.register_blueprint(rutas_tipo_responsable)
-aplicacion.register_blueprint(rutas_tipo_proyecto)
-aplicacion.register_blueprint(rutas_estado)
-aplicacion.register_blueprint(rutas_tipo_producto)
-aplicacion.register_blueprint(rutas_entregable)
-aplicacion.register_blueprint(rutas_variable_estrategica)
-
+# Ajustes para producción: sin depuración (el depurador de Werkzeug permite
+# ejecutar código desde el navegador) y sin revisar en cada petición si las
+# plantillas cambiaron en disco.
+CONFIG_PRODUCCION = {
+    "DEBUG": False,
+    "TEMPLATES_AUTO_RELOAD": False,
+}
 
 
-
-# ------------------- Rutas principales -------------------
-
-@aplicacion.route("/")
-def inicio():
+def _clave_secreta(produccion, configuracion, desarrollo):
     """
-    Función asociada a la ruta principal (/).
-    Retorna la plantilla index.html.
+    SECRET_KEY de configuracion o del entorno. La clave fija del código solo
+    vale en desarrollo: en producción cualquiera que la lea podría falsificar
+    la cookie de sesión, así que sin SECRET_KEY no se arranca.
     """
-    return render_template("index.html")
+    clave = (configuracion or {}).get("SECRET_KEY") or os.environ.get("SECRET_KEY")
+    if clave:
+        return clave
+    if produccion:
+        raise RuntimeError("Falta la variable de entorno SECRET_KEY (obligatoria en producción)")
+    return desarrollo
 
 
-@aplicacion.route("/acerca")
-def acerca():
+def crear_aplicacion(produccion=False, configuracion=None):
     """
-    Función asociada a la ruta /acerca.
-    Retorna la plantilla acerca.html con información sobre el proyecto.
+    Crea y configura la aplicación Flask.
+
+    produccion=True aplica CONFIG_PRODUCCION; lo usa wsgi.py, el punto de
+    entrada para servidores WSGI (gunicorn, waitress). configuracion permite
+    sobrescribir cualquier valor de aplicacion.config.
     """
-    return render_template("acerca.html")
+    # Crear la instancia de la aplicación Flask
+    aplicacion = Flask(__name__)
+    # Clave secreta utilizada por Flask para firmar las sesiones y permitir el uso de mensajes flash.
+    # Es obligatoria cuando se usan sesiones o funciones como flash() y debe mantenerse privada.
+    aplicacion.secret_key = _clave_secreta(produccion, configuracion, "clave-secreta-12345")
+    if produccion:
+        aplicacion.config.update(CONFIG_PRODUCCION)
+        aplicacion.jinja_env.auto_reload = False
+    aplicacion.config.update(configuracion or {})
+
+    # ------------------- Registro de Blueprints -------------------
+    # Registrar el Blueprint de productos en la aplicación principal
+
+    aplicacion.register_blueprint(rutas_usuarios)
+    aplicacion.register_blueprint(rutas_tipo_responsable)
+    aplicacion.register_blueprint(rutas_tipo_proyecto)
+    aplicacion.register_blueprint(rutas_estado)
+    aplicacion.register_blueprint(rutas_tipo_producto)
+    aplicacion.register_blueprint(rutas_entregable)
+    aplicacion.register_blueprint(rutas_variable_estrategica)
+
+    # ------------------- Métricas (/metrics) -------------------
+    metricas.instalar(aplicacion)
+
+    # ------------------- Rutas principales -------------------
+
+    @aplicacion.route("/")
+    def inicio():
+        """
+        Función asociada a la ruta principal (/).
+        Retorna la plantilla index.html.
+        """
+        return render_template("index.html")
+
+    @aplicacion.route("/acerca")
+    def acerca():
+        """
+        Función asociada a la ruta /acerca.
+        Retorna la plantilla acerca.html con información sobre el proyecto.
+        """
+        return render_template("acerca.html")
+
+    # ===============================================================
+    # MANEJO DE ERRORES
+    # ===============================================================
+
+    # Error 404 - Página no encontrada
+    @aplicacion.errorhandler(404)
+    def pagina_no_encontrada(e):
+        return render_template("error.html", codigo=404, mensaje="Página no encontrada."), 404
+
+    # Error 500 - Error interno del servidor
+    @aplicacion.errorhandler(500)
+    def error_interno(e):
+        return render_template("error.html", codigo=500, mensaje="Error interno del servidor."), 500
+
+    return aplicacion
 
 # ---------------------------------------------------------
-# ===============================================================
-# MANEJO DE ERRORES
-# ===============================================================
-from flask import render_template
-
-# Error 404 - Página no encontrada
-@aplicacion.errorhandler(404)
-def pagina_no_encontrada(e):
-    return render_template("error.html", codigo=404, mensaje="Página no encontrada."), 404
 
-# Error 500 - Error interno del servidor
-@aplicacion.errorhandler(500)
-def error_interno(e):
-    return render_template("error.html", codigo=500, mensaje="Error interno del servidor."), 500
+# Aplicación para el servidor de desarrollo (python app.py)
+aplicacion = crear_aplicacion()
 
 # Punto de entrada de la aplicación
 if __name__ == "__main__":
     # Ejecutar la aplicación en modo depuración, en el puerto 5000
     # host="0.0.0.0" permite que la app sea accesible desde la red local
     # debug=True permite reinicio automático ante cambios
+    # Para producción usar wsgi.py (ver README)
     aplicacion.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,46 @@
+# =================== gunicorn.conf.py ===================
+# Configuración de gunicorn para producción (Linux):
+#     gunicorn -c gunicorn.conf.py wsgi:aplicacion
+# Los valores se pueden cambiar con las variables de entorno descritas en wsgi.py.
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('WEB_HOST', '0.0.0.0')}:{os.environ.get('WEB_PUERTO', '8000')}"
+
+# Procesos: la regla habitual de 2 × núcleos + 1. Las métricas de todos se
+# suman en METRICAS_DIR (ver abajo).
+workers = int(os.environ.get("WEB_PROCESOS", multiprocessing.cpu_count() * 2 + 1))
+
+# Hilos por proceso: las páginas pasan casi todo el tiempo esperando a la
+# API, así que varios hilos por proceso aprovechan esa espera.
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_HILOS", "8"))
+
+# Conexiones keep-alive: el navegador reutiliza la conexión para los estáticos
+keepalive = int(os.environ.get("WEB_KEEPALIVE", "5"))
+
+timeout = 60
+graceful_timeout = 30
+
+# Reciclar procesos de vez en cuando limita el crecimiento de memoria
+max_requests = 5000
+max_requests_jitter = 500
+
+# Cargar la aplicación una sola vez antes de crear los procesos (arranque más rápido)
+preload_app = True
+
+accesslog = None
+errorlog = "-"
+
+# Cada proceso deja sus métricas en esta carpeta y /metrics devuelve la suma
+# de todos (servicios/metricas.py). Se define antes de cargar la aplicación.
+os.environ.setdefault("METRICAS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "metricas"))
+
+
+def on_starting(servidor):
+    """Al arrancar el servidor se descartan las métricas de la ejecución anterior."""
+    carpeta = os.environ["METRICAS_DIR"]
+    if os.path.isdir(carpeta):
+        for nombre in os.listdir(carpeta):
+            if nombre.endswith((".json", ".tmp")):
+                os.remove(os.path.join(carpeta, nombre))
@@ -5,7 +5,7 @@
 # ===============================================================
 
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios.cliente_api import sesion
 
 rutas_entregable = Blueprint("rutas_entregable", __name__)
 API_URL = "http://localhost:5031/api/entregable"  # Endpoint base de la API
@@ -16,7 +16,7 @@ API_URL = "http://localhost:5031/api/entregable"  # Endpoint base de la API
 @rutas_entregable.route("/entregable", methods=["GET"])
 def listar_entregable():
     try:
-        respuesta = requests.get(API_URL)
+        respuesta = sesion.get(API_URL)
         entregables = respuesta.json().get("datos", [])
     except Exception as e:
         print("Error al conectar con la API:", e)
@@ -33,17 +33,17 @@ def buscar_entregable():
     codigo = request.form.get("id_buscar")
 
     try:
-        respuesta = requests.get(f"{API_URL}/id/{codigo}")
+        respuesta = sesion.get(f"{API_URL}/id/{codigo}")
         if respuesta.status_code == 200:
             datos = respuesta.json().get("datos", [])
             if datos:
                 entregable = datos[0]
-                entregables = requests.get(API_URL).json().get("datos", [])
+                entregables = sesion.get(API_URL).json().get("datos", [])
                 return render_template("entregable.html", entregables=entregables, entregable=entregable, modo="actualizar")
     except Exception as e:
         print("Error al buscar entregable:", e)
 
-    entregables = requests.get(API_URL).json().get("datos", [])
+    entregables = sesion.get(API_URL).json().get("datos", [])
     return render_template("entregable.html", entregables=entregables, entregable=None, mensaje="Entregable no encontrado", modo="crear")
 
 
@@ -63,7 +63,7 @@ def crear_entregable():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        sesion.post(API_URL, json=datos)
     except Exception as e:
         return f"Error al crear entregable: {e}"
 
@@ -86,7 +86,7 @@ def actualizar_entregable(id):
     }
 
     try:
-        requests.put(f"{API_URL}/id/{id}", json=datos)
+        sesion.put(f"{API_URL}/id/{id}", json=datos)
     except Exception as e:
         return f"Error al actualizar entregable: {e}"
 
@@ -99,7 +99,7 @@ def actualizar_entregable(id):
 @rutas_entregable.route("/entregable/eliminar/<int:id>", methods=["POST"])
 def eliminar_entregable(id):
     try:
-        requests.delete(f"{API_URL}/id/{id}")
+        sesion.delete(f"{API_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar entregable: {e}"
 
@@ -5,7 +5,7 @@
 # ===============================================================
 
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios.cliente_api import sesion
 
 rutas_estado = Blueprint("rutas_estado", __name__)
 API_URL = "http://localhost:5031/api/estado"  # Endpoint base de la API
@@ -16,7 +16,7 @@ API_URL = "http://localhost:5031/api/estado"  # Endpoint base de la API
 @rutas_estado.route("/estado", methods=["GET"])
 def listar_estado():
     try:
-        respuesta = requests.get(API_URL)
+        respuesta = sesion.get(API_URL)
         estados = respuesta.json().get("datos", [])
     except Exception as e:
         print("Error al conectar con la API:", e)
@@ -33,17 +33,17 @@ def buscar_estado():
     codigo = request.form.get("id_buscar")
 
     try:
-        respuesta = requests.get(f"{API_URL}/id/{codigo}")
+        respuesta = sesion.get(f"{API_URL}/id/{codigo}")
         if respuesta.status_code == 200:
             datos = respuesta.json().get("datos", [])
             if datos:
                 estado = datos[0]
-                estados = requests.get(API_URL).json().get("datos", [])
+                estados = sesion.get(API_URL).json().get("datos", [])
                 return render_template("estado.html", estados=estados, estado=estado, modo="actualizar")
     except Exception as e:
         print("Error al buscar estado:", e)
 
-    estados = requests.get(API_URL).json().get("datos", [])
+    estados = sesion.get(API_URL).json().get("datos", [])
     return render_template("estado.html", estados=estados, estado=None, mensaje="Estado no encontrado", modo="crear")
 
 
@@ -58,7 +58,7 @@ def crear_estado():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        sesion.post(API_URL, json=datos)
     except Exception as e:
         return f"Error al crear estado: {e}"
 
@@ -76,7 +76,7 @@ def actualizar_estado(id):
     }
 
     try:
-        requests.put(f"{API_URL}/id/{id}", json=datos)
+        sesion.put(f"{API_URL}/id/{id}", json=datos)
     except Exception as e:
         return f"Error al actualizar estado: {e}"
 
@@ -89,7 +89,7 @@ def actualizar_estado(id):
 @rutas_estado.route("/estado/eliminar/<int:id>", methods=["POST"])
 def eliminar_estado(id):
     try:
-        requests.delete(f"{API_URL}/id/{id}")
+        sesion.delete(f"{API_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar estado: {e}"
 
@@ -5,7 +5,7 @@
 # ===============================================================
 
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios.cliente_api import sesion
 
 rutas_tipo_producto = Blueprint("rutas_tipo_producto", __name__)
 API_URL = "http://localhost:5031/api/tipo_producto"  # Endpoint base de la API
@@ -16,7 +16,7 @@ API_URL = "http://localhost:5031/api/tipo_producto"  # Endpoint base de la API
 @rutas_tipo_producto.route("/tipo_producto", methods=["GET"])
 def listar_tipo_producto():
     try:
-        respuesta = requests.get(API_URL)
+        respuesta = sesion.get(API_URL)
         tipo_productos = respuesta.json().get("datos", [])
     except Exception as e:
         print("Error al conectar con la API:", e)
@@ -33,17 +33,17 @@ def buscar_tipo_producto():
     codigo = request.form.get("id_buscar")
 
     try:
-        respuesta = requests.get(f"{API_URL}/id/{codigo}")
+        respuesta = sesion.get(f"{API_URL}/id/{codigo}")
         if respuesta.status_code == 200:
             datos = respuesta.json().get("datos", [])
             if datos:
                 tipo_producto = datos[0]
-                tipo_productos = requests.get(API_URL).json().get("datos", [])
+                tipo_productos = sesion.get(API_URL).json().get("datos", [])
                 return render_template("tipo_producto.html", tipo_productos=tipo_productos, tipo_producto=tipo_producto, modo="actualizar")
     except Exception as e:
         print("Error al buscar tipo de producto:", e)
 
-    tipo_productos = requests.get(API_URL).json().get("datos", [])
+    tipo_productos = sesion.get(API_URL).json().get("datos", [])
     return render_template("tipo_producto.html", tipo_productos=tipo_productos, tipo_producto=None, mensaje="Tipo de producto no encontrado", modo="crear")
 
 
@@ -58,7 +58,7 @@ def crear_tipo_producto():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        sesion.post(API_URL, json=datos)
     except Exception as e:
         return f"Error al crear tipo de producto: {e}"
 
@@ -76,7 +76,7 @@ def actualizar_tipo_producto(id):
     }
 
     try:
-        requests.put(f"{API_URL}/id/{id}", json=datos)
+        sesion.put(f"{API_URL}/id/{id}", json=datos)
     except Exception as e:
         return f"Error al actualizar tipo de producto: {e}"
 
@@ -89,7 +89,7 @@ def actualizar_tipo_producto(id):
 @rutas_tipo_producto.route("/tipo_producto/eliminar/<int:id>", methods=["POST"])
 def eliminar_tipo_producto(id):
     try:
-        requests.delete(f"{API_URL}/id/{id}")
+        sesion.delete(f"{API_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar tipo de producto: {e}"
 
@@ -5,7 +5,7 @@
 # ===============================================================
 
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios.cliente_api import sesion
 
 rutas_tipo_responsable = Blueprint("rutas_tipo_responsable", __name__)
 API_URL = "http://localhost:5031/api/tipo_responsable"  # Endpoint base de la API
@@ -16,7 +16,7 @@ API_URL = "http://localhost:5031/api/tipo_responsable"  # Endpoint base de la AP
 @rutas_tipo_responsable.route("/tipo_responsable", methods=["GET"])
 def listar_tipo_responsable():
     try:
-        respuesta = requests.get(API_URL)
+        respuesta = sesion.get(API_URL)
         tipos = respuesta.json().get("datos", [])
     except Exception as e:
         print("Error al conectar con la API:", e)
@@ -33,17 +33,17 @@ def buscar_tipo_responsable():
     codigo = request.form.get("id_buscar")
 
     try:
-        respuesta = requests.get(f"{API_URL}/id/{codigo}")
+        respuesta = sesion.get(f"{API_URL}/id/{codigo}")
         if respuesta.status_code == 200:
             datos = respuesta.json().get("datos", [])
             if datos:
                 tipo = datos[0]
-                tipos = requests.get(API_URL).json().get("datos", [])
+                tipos = sesion.get(API_URL).json().get("datos", [])
                 return render_template("tipo_responsable.html", tipos=tipos, tipo=tipo, modo="actualizar")
     except Exception as e:
         print("Error al buscar tipo de responsable:", e)
 
-    tipos = requests.get(API_URL).json().get("datos", [])
+    tipos = sesion.get(API_URL).json().get("datos", [])
     return render_template("tipo_responsable.html", tipos=tipos, tipo=None, mensaje="Tipo de responsable no encontrado", modo="crear")
 
 
@@ -58,7 +58,7 @@ def crear_tipo_responsable():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        sesion.post(API_URL, json=datos)
     except Exception as e:
         return f"Error al crear tipo de responsable: {e}"
 
@@ -76,7 +76,7 @@ def actualizar_tipo_responsable(id):
     }
 
     try:
-        requests.put(f"{API_URL}/id/{id}", json=datos)
+        sesion.put(f"{API_URL}/id/{id}", json=datos)
     except Exception as e:
         return f"Error al actualizar tipo de responsable: {e}"
 
@@ -89,7 +89,7 @@ def actualizar_tipo_responsable(id):
 @rutas_tipo_responsable.route("/tipo_responsable/eliminar/<int:id>", methods=["POST"])
 def eliminar_tipo_responsable(id):
     try:
-        requests.delete(f"{API_URL}/id/{id}")
+        sesion.delete(f"{API_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar tipo de responsable: {e}"
 
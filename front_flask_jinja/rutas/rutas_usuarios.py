@@ -5,7 +5,7 @@
 # ===============================================================
 
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios.cliente_api import sesion
 
 rutas_usuarios = Blueprint("rutas_usuarios", __name__)
 API_URL = "http://localhost:5031/api/usuario"  # Endpoint base de la API
@@ -16,7 +16,7 @@ API_URL = "http://localhost:5031/api/usuario"  # Endpoint base de la API
 @rutas_usuarios.route("/usuarios", methods=["GET"])
 def listar_usuarios():
     try:
-        respuesta = requests.get(API_URL)
+        respuesta = sesion.get(API_URL)
         usuarios = respuesta.json().get("datos", [])
     except Exception as e:
         print("Error al conectar con la API:", e)
@@ -33,17 +33,17 @@ def buscar_usuario():
     codigo = request.form.get("id_buscar")
 
     try:
-        respuesta = requests.get(f"{API_URL}/id/{codigo}")
+        respuesta = sesion.get(f"{API_URL}/id/{codigo}")
         if respuesta.status_code == 200:
             datos = respuesta.json().get("datos", [])
             if datos:
                 usuario = datos[0]
-                usuarios = requests.get(API_URL).json().get("datos", [])
+                usuarios = sesion.get(API_URL).json().get("datos", [])
                 return render_template("usuarios.html", usuarios=usuarios, usuario=usuario, modo="actualizar")
     except Exception as e:
         print("Error al buscar usuario:", e)
 
-    usuarios = requests.get(API_URL).json().get("datos", [])
+    usuarios = sesion.get(API_URL).json().get("datos", [])
     return render_template("usuarios.html", usuarios=usuarios, usuario=None, mensaje="Usuario no encontrado", modo="crear")
 
 
@@ -58,7 +58,7 @@ def crear_usuario():
     }
 
     try:
-        requests.post(f"{API_URL}?camposEncriptar=contrasena", json=datos)
+        sesion.post(f"{API_URL}?camposEncriptar=contrasena", json=datos)
     except Exception as e:
         return f"Error al crear usuario: {e}"
 
@@ -75,7 +75,7 @@ def actualizar_usuario(id):
     }
 
     try:
-        requests.put(f"{API_URL}/id/{id}?camposEncriptar=contrasena", json=datos)
+        sesion.put(f"{API_URL}/id/{id}?camposEncriptar=contrasena", json=datos)
     except Exception as e:
         return f"Error al actualizar usuario: {e}"
 
@@ -88,7 +88,7 @@ def actualizar_usuario(id):
 @rutas_usuarios.route("/usuarios/eliminar/<int:id>", methods=["POST"])
 def eliminar_usuario(id):
     try:
-        requests.delete(f"{API_URL}/id/{id}")
+        sesion.delete(f"{API_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar usuario: {e}"
 
@@ -5,7 +5,7 @@
 # ===============================================================
 
 from flask import Blueprint, render_template, request, redirect, url_for
-import requests
+from servicios.cliente_api import sesion
 
 rutas_variable_estrategica = Blueprint("rutas_variable_estrategica", __name__)
 API_URL = "http://localhost:5031/api/variable_estrategica"  # Endpoint base de la API
@@ -16,7 +16,7 @@ API_URL = "http://localhost:5031/api/variable_estrategica"  # Endpoint base de l
 @rutas_variable_estrategica.route("/variable_estrategica", methods=["GET"])
 def listar_variable_estrategica():
     try:
-        respuesta = requests.get(API_URL)
+        respuesta = sesion.get(API_URL)
         variables = respuesta.json().get("datos", [])
     except Exception as e:
         print("Error al conectar con la API:", e)
@@ -33,17 +33,17 @@ def buscar_variable_estrategica():
     codigo = request.form.get("id_buscar")
 
     try:
-        respuesta = requests.get(f"{API_URL}/id/{codigo}")
+        respuesta = sesion.get(f"{API_URL}/id/{codigo}")
         if respuesta.status_code == 200:
             datos = respuesta.json().get("datos", [])
             if datos:
                 variable = datos[0]
-                variables = requests.get(API_URL).json().get("datos", [])
+                variables = sesion.get(API_URL).json().get("datos", [])
                 return render_template("variable_estrategica.html", variables=variables, variable=variable, modo="actualizar")
     except Exception as e:
         print("Error al buscar variable estratégica:", e)
 
-    variables = requests.get(API_URL).json().get("datos", [])
+    variables = sesion.get(API_URL).json().get("datos", [])
     return render_template("variable_estrategica.html", variables=variables, variable=None, mensaje="Variable estratégica no encontrada", modo="crear")
 
 
@@ -58,7 +58,7 @@ def crear_variable_estrategica():
     }
 
     try:
-        requests.post(API_URL, json=datos)
+        sesion.post(API_URL, json=datos)
     except Exception as e:
         return f"Error al crear variable estratégica: {e}"
 
@@ -76,7 +76,7 @@ def actualizar_variable_estrategica(id):
     }
 
     try:
-        requests.put(f"{API_URL}/id/{id}", json=datos)
+        sesion.put(f"{API_URL}/id/{id}", json=datos)
     except Exception as e:
         return f"Error al actualizar variable estratégica: {e}"
 
@@ -89,7 +89,7 @@ def actualizar_variable_estrategica(id):
 @rutas_variable_estrategica.route("/variable_estrategica/eliminar/<int:id>", methods=["POST"])
 def eliminar_variable_estrategica(id):
     try:
-        requests.delete(f"{API_URL}/id/{id}")
+        sesion.delete(f"{API_URL}/id/{id}")
     except Exception as e:
         return f"Error al eliminar variable estratégica: {e}"
 
@@ -0,0 +1,10 @@
+# =================== servicios/__init__.py ===================
+"""
+Servicios de esta aplicación. Los que no están en esta carpeta se buscan en
+front/servicios: así las métricas (servicios/metricas.py) son el mismo
+módulo en las dos aplicaciones en lugar de una copia.
+"""
+import os
+
+__path__.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             "front", "servicios"))
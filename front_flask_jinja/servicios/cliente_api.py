@@ -0,0 +1,36 @@
+# =================== servicios/cliente_api.py ===================
+"""
+Sesión HTTP compartida para consumir la API en C#.
+
+Las rutas usan esta sesión en lugar de las funciones sueltas de requests:
+reutiliza las conexiones con la API (keep-alive) y anota cada respuesta
+en las métricas de /metrics por tabla y método HTTP.
+"""
+from urllib.parse import urlsplit
+
+import requests
+
+from servicios import metricas
+
+
+def tabla_de(url):
+    """Nombre de la tabla a la que apunta una URL de la API (/api/{tabla}/...)."""
+    segmentos = [s for s in urlsplit(url).path.split("/") if s]
+    if segmentos and segmentos[0] == "api":
+        segmentos = segmentos[1:]
+    return segmentos[0] if segmentos else ""
+
+
+def _registrar_respuesta(respuesta, *args, **kwargs):
+    """Gancho de requests: anota la llamada (tiempo hasta recibir la respuesta)."""
+    metricas.registrar_llamada_api(
+        tabla_de(respuesta.url),
+        respuesta.request.method,
+        respuesta.status_code,
+        respuesta.elapsed.total_seconds(),
+    )
+    return respuesta
+
+
+sesion = requests.Session()
+sesion.hooks["response"].append(_registrar_respuesta)
@@ -0,0 +1,36 @@
+# =================== wsgi.py ===================
+"""
+Punto de entrada para producción.
+
+Crea la aplicación con la configuración de producción (sin depuración ni
+recarga de plantillas) para servirla con un servidor WSGI:
+
+- Linux (gunicorn, varios procesos con varios hilos cada uno):
+    gunicorn -c gunicorn.conf.py wsgi:aplicacion
+- Windows o Linux (waitress, un proceso con varios hilos):
+    python wsgi.py
+
+Los dos leen las mismas variables de entorno:
+- SECRET_KEY: clave con la que se firman las sesiones (obligatoria).
+- WEB_HOST, WEB_PUERTO: dirección donde se escucha (0.0.0.0:8000).
+- WEB_PROCESOS: procesos de gunicorn (por defecto 2 × núcleos + 1).
+- WEB_HILOS: hilos por proceso (8).
+- WEB_KEEPALIVE: segundos que se mantiene abierta una conexión inactiva (5).
+"""
+import os
+
+from app import crear_aplicacion
+
+HOST = os.environ.get("WEB_HOST", "0.0.0.0")
+PUERTO = int(os.environ.get("WEB_PUERTO", "8000"))
+HILOS = int(os.environ.get("WEB_HILOS", "8"))
+KEEPALIVE = int(os.environ.get("WEB_KEEPALIVE", "5"))
+
+aplicacion = crear_aplicacion(produccion=True)
+
+if __name__ == "__main__":
+    from waitress import serve
+
+    print(f"Sirviendo en http://{HOST}:{PUERTO} con waitress ({HILOS} hilos)")
+    serve(aplicacion, host=HOST, port=PUERTO, threads=HILOS,
+          channel_timeout=KEEPALIVE, connection_limit=max(100, HILOS * 25), ident=None)